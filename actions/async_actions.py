@@ -0,0 +1,295 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from playwright.async_api import expect
+from .base_actions import BaseActions
+from .registry import ActionCall, async_action, get_async_action
+from utils.ai_evaluator import calculate_cosine_similarity
+from utils.api_batch import origin
+from utils.api_client import browser_cookies, get_api_client
+from utils.object_map import ObjectRecord
+from utils.tracing import get_tracer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class AsyncBaseActions(BaseActions):
+    """BaseActions for playwright.async_api pages; selector helpers are shared, actions are coroutines."""
+
+    async def element_not_visible(self, selector):
+        """Check if the element is hidden or does not exist on the page."""
+        try:
+            return await self.get_locator(selector.strip()).is_hidden()
+        except Exception as e:
+            return True  # Assume the element is not visible if an error occurs
+
+    async def launch_application(self, step):
+        """Navigate to the URL resolved for a compiled LaunchApplication step."""
+        logger.info(f"Navigating to URL: {step.selector}")
+        await self.page.goto(step.selector)
+        return 0, f"Navigated to '{step.selector}'", f"Should navigate to '{step.selector}'"
+
+    async def run_step(self, step):
+        """Run a compiled step through perform_action."""
+        expected_result = self.get_expected_result(step.action, step.selector, step.input_value)
+        isOK, actual_result = await self.perform_action(step.step_no, step.step_desc, expected_result, step.action, step.selector,
+                                                        step.input_value, step.optional_data, step.property_name)
+        return isOK, actual_result, expected_result
+
+    def get_expected_result(self, action, selector, input_value):
+        """Expected result from the async registration (which defaults to the sync template)."""
+        spec = get_async_action(action)
+        if spec is None or spec.expected is None:
+            return f"For action '{action.lower()}' please validate objectMap"
+        child_locator1 = selector.get("child_locator1") if hasattr(selector, "get") else None
+        return spec.expected.format(selector=self.final_selector(selector), input_value=input_value, child_locator1=child_locator1)
+
+    async def capture_screenshot(self, step_no, isOK):
+        """Take the one screenshot of a step (if the policy wants it) from the main page; returns its manifest key."""
+        self.captured_step = step_no
+        self.step_screenshot = await self.screenshotter.capture_async(self.main_page, step_no, isOK)
+        return self.step_screenshot
+
+    async def perform_action(self, step_no, step_desc, expected_result, action, selector, input_value=None, optional_data=None, propertyname=None):
+        """Perform action based on test script and log failures if element not found"""
+        start_time = time.time()
+        isOK = 0  # 0 = Success, 1 = Failure
+        actual_result = ""
+        action = action.lower()  # Convert action to lower case for case-insensitive comparison
+        tracer = get_tracer()
+        with tracer.span("action.lookup"):
+            spec = get_async_action(action)
+
+        try:
+            if spec is None:
+                raise ValueError(f"Unsupported action for the async engine: {action}")
+            with tracer.span("selector.resolve"):
+                final_selector = self.final_selector(selector)
+                target = selector if isinstance(selector, ObjectRecord) else final_selector  # Records carry their XPath/CSS kind
+            call = ActionCall(step_no, step_desc, action, selector, final_selector, target, input_value, optional_data, propertyname)
+            with tracer.span("action", **{"action.name": action}):
+                result = await spec.handler(self, call)
+            if isinstance(result, tuple):
+                isOK, actual_result = result
+            else:
+                actual_result = result
+            if isOK == 0:
+                self.waits.record(action, time.time() - start_time)  # Feeds the adaptive timeouts
+            if not spec.report:
+                return isOK, actual_result
+
+        except Exception as e:
+            isOK = 1  # Mark step as failed
+            actual_result = f"Error: {str(e)}"
+
+        with tracer.span("screenshot"):
+            screenshot_key = await self.capture_screenshot(step_no, isOK)  # Written in the background
+            screenshot_path = self.screenshotter.store.resolve(screenshot_key) if screenshot_key else None
+
+        duration = round(time.time() - start_time, 2)
+        # Add step result to report
+        with tracer.span("report.write"):
+            self.report_steps.append([step_no, step_desc, expected_result, actual_result, f"{duration}s", "Pass" if isOK == 0 else "Fail", screenshot_path])
+
+        return isOK, actual_result  # Return the status of the step and the actual result
+
+    async def switch_to_frame_by_selector(self, selector):
+        """Switch to the iframe specified by the selector"""
+        element = await self.page.query_selector(selector)
+        frame = await element.content_frame() if element is not None else None
+        if frame is None:
+            raise Exception(f"Frame with selector '{selector}' not found")
+        self.page = frame
+        print(f"Switched to frame with selector '{selector}'")
+
+    async def switch_to_frame_in_shadow_root(self, shadow_host_selector, iframe_selector):
+        """Switch to the iframe inside a shadow root"""
+        shadow_host = await self.page.query_selector(shadow_host_selector)
+        if shadow_host is None:
+            raise Exception(f"Shadow host '{shadow_host_selector}' not found")
+        shadow_root = await shadow_host.evaluate_handle("el => el.shadowRoot")
+        iframe = await shadow_root.query_selector(iframe_selector)
+        if iframe is None:
+            raise Exception(f"Iframe '{iframe_selector}' not found in shadow root")
+        self.page = await iframe.content_frame()
+        print(f"Switched to iframe '{iframe_selector}' inside shadow root '{shadow_host_selector}'")
+
+    async def perform_accessibility_check(self):
+        """Perform accessibility check using axe-core"""
+        await self.page.add_script_tag(url="https://cdnjs.cloudflare.com/ajax/libs/axe-core/4.10.2/axe.min.js")
+        result = await self.page.evaluate("""
+            async () => {
+                return await axe.run({
+                    runOnly: {
+                        type: 'tag',
+                        values: ['wcag2a', 'wcag2aa','wcag412', 'section508']
+                    }
+                });
+            }
+        """)
+        os.makedirs("reports/accessibility", exist_ok=True)
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        report_path = f"reports/accessibility/accessibility_report_{timestamp}.json"
+        with open(report_path, "w") as report_file:
+            json.dump(result, report_file, indent=4)
+        html_report_path = self.generate_accessibility_html_report(result, timestamp)
+        return html_report_path, 1 if result["violations"] else 0
+
+    # Action handlers for the async engine: same StepNames and results as the BaseActions handlers
+
+    @async_action("setinputintextfield")
+    async def set_input_in_text_field(self, call):
+        locator = await self.waits.wait_for_actionable_async(self.get_locator(call.target), self.waits.timeout(call.action, 5000))
+        await locator.fill(str(call.input_value))
+        return f"Typed '{call.input_value}' in {call.final_selector}"
+
+    @async_action("checkelementexistence")
+    async def check_element_existence(self, call):
+        await self.get_locator(call.target).wait_for(state="visible", timeout=self.waits.timeout(call.action, 5000))  # Wait for visibility
+        return f"Element {call.final_selector} exists"
+
+    @async_action("checkelementnotvisible")
+    async def check_element_not_visible(self, call):
+        if await self.element_not_visible(call.final_selector):
+            return 0, f"Element {call.final_selector} does not exist"
+        return 1, f"Element {call.final_selector} exists"
+
+    @async_action("clickelement")
+    async def click_element(self, call):
+        locator = await self.waits.wait_for_actionable_async(self.get_locator(call.target), self.waits.timeout(call.action, 5000))
+        await locator.click()
+        return f"Clicked on {call.final_selector}"
+
+    @async_action("checkelementcontaintext")
+    async def check_element_contain_text(self, call):
+        if call.final_selector == "title":
+            title = await self.page.title()
+            assert str(call.input_value) in title, f"Expected '{call.input_value}', got '{title}'"
+            return f"Page title matched: {call.input_value}"
+        await expect(self.get_locator(call.target)).to_contain_text(call.input_value, timeout=self.waits.timeout(call.action, 5000))
+        return f"Verified text '{call.input_value}' in {call.final_selector}"
+
+    @async_action("timedelay")
+    async def time_delay(self, call):
+        if self.waits.time_delay_mode == "condition":
+            waited = await self.waits.wait_for_page_quiet_async(self.page, int(float(call.input_value) * 1000))
+            return f"Waited {waited:.1f}s for network idle and a stable page (TimeDelay {call.input_value}s)"
+        await asyncio.sleep(float(call.input_value))  # Lets the other test cases run meanwhile
+        return f"Waited for {call.input_value}s"
+
+    @async_action("clickelementcontaintextoption")
+    async def click_element_contain_text_option(self, call):
+        locator = self.get_locator(call.target).filter(has_text=call.input_value)
+        await locator.wait_for(state="visible", timeout=self.waits.timeout(call.action, 50000))  # Wait for visibility
+        await locator.click(force=True)  # Click the element with force
+        return f"Clicked on element {call.final_selector} containing text '{call.input_value}'"
+
+    @async_action("cosine_similarity", report=False)
+    async def cosine_similarity(self, call):
+        SIMILARITY_THRESHOLD = 0.3
+        extracted_response_text = "AI stands for Artificial Intelligence"
+        similarity_score = await asyncio.to_thread(calculate_cosine_similarity, extracted_response_text, call.input_value)
+        if similarity_score >= SIMILARITY_THRESHOLD:
+            return 0, f"Extracted responses and passed to cosine_similarity. Result: {similarity_score}"
+        return 1, f"Error in evaluation: {similarity_score}"  # Mark step as failed
+
+    @async_action("clickelementxpath")
+    async def click_element_xpath(self, call):
+        await self.page.locator(f"xpath={call.final_selector}").click(force=True)  # Click the element with force
+        return f"Clicked on element {call.final_selector}"
+
+    @async_action("switchtoframe")
+    async def switch_to_frame(self, call):
+        if call.final_selector.isdigit():
+            self.switch_to_frame_by_index(int(call.final_selector))
+        else:
+            await self.switch_to_frame_by_selector(call.final_selector)
+        return f"Switched to frame with selector '{call.final_selector}'"
+
+    @async_action("switchtoframebyshadowselector")
+    async def switch_to_frame_by_shadow_selector(self, call):
+        shadow_host_selector, iframe_selector = call.final_selector.split(">>")
+        await self.switch_to_frame_in_shadow_root(shadow_host_selector.strip(), iframe_selector.strip())
+        return f"switched to frame Successfully"
+
+    @async_action("switchtomainframe")
+    async def switch_to_main_frame_action(self, call):
+        self.switch_to_main_frame()
+        return f"Switched back to main frame"
+
+    @async_action("clickshadow")
+    async def click_shadow(self, call):
+        selectors = call.final_selector.split(">>")
+        shadow_root = await self.page.query_selector(selectors[0])
+        if shadow_root is None:
+            raise Exception(f"Element '{selectors[0]}' not found")
+        shadow_root = await shadow_root.evaluate_handle("el => el.shadowRoot")
+        for sel in selectors[1:-1]:
+            shadow_root = await shadow_root.evaluate_handle(f"el => el.querySelector('{sel}').shadowRoot")
+            if shadow_root is None:
+                raise Exception(f"Element '{sel}' not found in shadow DOM")
+        shadow_element = await shadow_root.evaluate_handle(f"el => el.querySelector('{selectors[-1]}')")
+        if shadow_element is None:
+            raise Exception(f"Element '{selectors[-1]}' not found in shadow DOM")
+        await shadow_element.click()
+        return f"Clicked on nested shadow DOM element {selectors[-1]} inside {call.final_selector}"
+
+    @async_action("waitforelementexist")
+    async def wait_for_element_exist(self, call):
+        await self.get_locator(call.target).wait_for(state="attached", timeout=int(call.input_value))
+        return f"Element {call.final_selector} exists within {call.input_value}s"
+
+    @async_action("checkelementenabled")
+    async def check_element_enabled(self, call):
+        await expect(self.get_locator(call.target)).to_be_enabled(timeout=self.waits.timeout(call.action, 90000))  # Check if the element is enabled
+        return f"Element {call.final_selector} is enabled"
+
+    @async_action("checkelementnotvisiblexpath")
+    async def check_element_not_visible_xpath(self, call):
+        await expect(self.page.locator(f"xpath={call.final_selector}")).not_to_be_visible(timeout=self.waits.timeout(call.action, 90000))  # Check if the element is not visible
+        return f"Element {call.final_selector} is not visible"
+
+    @async_action("checkelementcontainstextexistence")
+    async def check_element_contains_text_existence(self, call):
+        child_locator = self.get_locator(call.selector.get("parent_locator")).locator(call.selector.get("child_locator1"))
+        await expect(child_locator).to_contain_text(call.input_value, timeout=self.waits.timeout(call.action, 90000))  # Check if the element contains the text
+        return f"Element {call.selector.get('child_locator1')} contains text '{call.input_value}'"
+
+    @async_action("checkelementcontainstoredtext")
+    async def check_element_contain_stored_text(self, call):
+        with open('runTimeData/dataStore.json', 'r') as file:
+            json_data = json.load(file)
+        assert call.input_value in json_data, f"Expected key '{call.input_value}' not found in data store"
+        stored_text = json_data[call.input_value]
+        child_locator = self.get_locator(call.selector.get("parent_locator")).locator(call.selector.get("child_locator1"))
+        await expect(child_locator).to_contain_text(stored_text, timeout=self.waits.timeout(call.action, 90000))  # Check if the element contains the stored text
+        return f"Element {call.selector.get('child_locator1')} contains stored text '{stored_text}'"
+
+    @async_action("accessibilitycheck")
+    async def accessibility_check(self, call):
+        report_path, isOK = await self.perform_accessibility_check()
+        return isOK, f"Performed accessibility check. <a href='{report_path}' target='_blank'>Accessibility Report</a>"
+
+    @async_action("validateapibatch")
+    async def validate_api_batch_action(self, call):
+        batch, specs = await asyncio.to_thread(self.api_batch_specs, call)
+        cookies = {}
+        if get_api_client().settings.share_browser_cookies:
+            for host in {origin(spec.get("url")) for spec in specs}:
+                cookies[host] = browser_cookies(await self.main_page.context.cookies(host))
+        return await asyncio.to_thread(self.run_api_batch, batch, specs, cookies)
+
+    @async_action("validateapiresponse")
+    async def validate_api_response_action(self, call):
+        input_data = self.api_step_input(call)
+        cookies = None
+        if get_api_client().settings.share_browser_cookies:
+            cookies = browser_cookies(await self.main_page.context.cookies(input_data.get("url")))
+        # The blocking requests call runs on a worker thread so other test cases keep going
+        isOK, actual_result, profile = await asyncio.to_thread(self.measure_api_response, *self.api_step_args(input_data), cookies=cookies,
+                                                               **self.api_step_options(input_data))
+        if profile is not None:
+            self.step_extras["latency"] = profile  # Histogram in the report
+        return isOK, actual_result
@@ -3,20 +3,42 @@ import time
 import os
 from datetime import datetime
 import json
+import logging
 import pandas as pd
-import requests
-from .custom_transact_action import CustomTransactActions
+from . import custom  # Registers the Transact toolbar actions
+from .registry import ActionCall, action, get_action
 from utils.ai_evaluator import calculate_cosine_similarity
+from utils.api_batch import DEFAULT_BATCH_CONCURRENCY, batch_summary, load_api_specs, origin, parse_batch_input, run_api_batch
+from utils.api_client import API_METHODS, browser_cookies, get_api_client
+from utils.api_load import latency_profile, load_options, profile_summary, run_load
+from utils.json_assertions import compile_assertions
+from utils.json_stream import BodyOptions, body_options, read_body
+from utils.object_map import ObjectRecord
+from utils.screenshots import Screenshotter
+from utils.tracing import get_tracer
+from utils.waits import WaitStrategy
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 class BaseActions:
-    def __init__(self, page: Page, report_steps):
+    def __init__(self, page: Page, report_steps, screenshotter=None, waits=None):
         self.page = page
         self.main_page = page  # Initialize main_page attribute
         self.report_steps = report_steps  # Store test steps
-        self.custom_actions = CustomTransactActions(page, report_steps)  # Initialize custom actions
+        self.screenshotter = screenshotter or Screenshotter.from_config()  # Screenshot policy from config.ini
+        self.waits = waits or WaitStrategy.from_config()  # Per-action timeouts and condition waits from config.ini
+        self.captured_step = None  # Step number of the last capture_screenshot call
+        self.step_screenshot = None  # Its screenshot manifest key (None if the policy skipped it)
+        self.step_extras = {}  # Extra step result fields set by an action (batch sub-steps, latency profile) for the report
 
     def get_locator(self, selector):
         """Detect whether the selector is XPath or CSS"""
+        if isinstance(selector, ObjectRecord):
+            # Kind was resolved once when the ObjectMap was loaded
+            if selector.kind == "xpath":
+                return self.page.locator(f"xpath={selector.selector}")
+            return self.page.locator(selector.selector)
         if not isinstance(selector, str):
             raise ValueError(f"Invalid selector: {selector}")
         selector = selector.strip()
@@ -39,40 +61,32 @@ class BaseActions:
         
                 
     def get_expected_result(self, action, selector, input_value):
-        """Dynamically generate the expected result based on action type."""
-        final_selector = self.final_selector(selector)
+        """Dynamically generate the expected result from the template registered with the action."""
         action = action.lower()  # Convert action to lower case for case-insensitive comparison
-
-        if action == "setinputintextfield":
-            return f"Text '{input_value}' should be entered in {final_selector}"
-        elif action == "clickelement":
-            return f"Element {final_selector} should be clicked"
-        elif action == "checkelementexistence":
-            return f"Element {final_selector} should exist"
-        elif action == "checkelementnotvisible":
-            return f"Element {final_selector} should not exist"
-        elif action == "checkelementcontaintext":
-            return f"Element {final_selector} should contain text '{input_value}'"
-        elif action == "title":
-            return f"Page title should be '{final_selector}'"
-        elif action == "timedelay":
-            return f"Wait for {input_value}s"
-        elif action == "waitforelementexist":
-            return f"Element {final_selector} should exist within {input_value}s"
-        elif action == "checkelementenabled":
-            return f"Element {final_selector} should be enabled"
-        elif action == "clickelementcontaintextoption":
-            return f"Element {final_selector} should be clicked which is having text '{input_value}'"
-        elif action == "clickfindbutton":
-            return f"Find button should be clicked"
-        elif action == "checkelementnotvisiblexpath":
-            return f"Element {final_selector} should not be visible"
-        elif action == "checkelementcontainstextexistence":
-            return f"Element {selector.get('child_locator1')} should contain text '{input_value}'"
-        elif action == "checkelementcontainstoredtext":
-            return f"Element {selector.get('child_locator1')} should contain stored text from data store"
-        else:
+        spec = get_action(action)
+        if spec is None or spec.expected is None:
             return f"For action '{action}' please validate objectMap"
+        child_locator1 = selector.get("child_locator1") if hasattr(selector, "get") else None
+        return spec.expected.format(selector=self.final_selector(selector), input_value=input_value, child_locator1=child_locator1)
+
+    def launch_application(self, step):
+        """Navigate to the URL resolved for a compiled LaunchApplication step."""
+        logger.info(f"Navigating to URL: {step.selector}")
+        self.page.goto(step.selector)
+        return 0, f"Navigated to '{step.selector}'", f"Should navigate to '{step.selector}'"
+
+    def run_step(self, step):
+        """Run a compiled step through perform_action."""
+        expected_result = self.get_expected_result(step.action, step.selector, step.input_value)
+        isOK, actual_result = self.perform_action(step.step_no, step.step_desc, expected_result, step.action, step.selector,
+                                                  step.input_value, step.optional_data, step.property_name)
+        return isOK, actual_result, expected_result
+
+    def capture_screenshot(self, step_no, isOK):
+        """Take the one screenshot of a step (if the policy wants it) from the main page; returns its manifest key."""
+        self.captured_step = step_no
+        self.step_screenshot = self.screenshotter.capture(self.main_page, step_no, isOK)
+        return self.step_screenshot
 
     def switch_to_frame_by_index(self, index):
         """Switch to the iframe specified by the index"""
@@ -83,71 +97,70 @@ class BaseActions:
         self.page = frame
         print(f"Switched to frame at index {index}")
 
-    def validate_api_response(self, url, method="GET", headers=None, payload=None, expected_status=200, expected_responses=None):
+    def api_cookies(self, url):
+        """Cookies of the browser context for url, when shareBrowserCookies is on in config.ini."""
+        if not get_api_client().settings.share_browser_cookies:
+            return None
+        return browser_cookies(self.main_page.context.cookies(url))
+
+    def validate_api_response(self, url, method="GET", headers=None, payload=None, expected_status=200, expected_responses=None, cookies=None,
+                              latency=None, repeat=1, concurrency=1, body=None):
         """Validate API response based on the provided parameters."""
+        isOK, actual_result, profile = self.measure_api_response(url, method, headers, payload, expected_status, expected_responses, cookies,
+                                                                 latency, repeat, concurrency, body)
+        return isOK, actual_result
+
+    def measure_api_response(self, url, method="GET", headers=None, payload=None, expected_status=200, expected_responses=None, cookies=None,
+                             latency=None, repeat=1, concurrency=1, body=None):
+        """Validate the response repeat times, concurrency at a time, against the latency budget; returns (isOK, actual_result, latency profile or None)."""
+        def check():
+            return self.check_api_response(url, method, headers, payload, expected_status, expected_responses, cookies, body)
+        if not latency and repeat == 1:
+            return (*check(), None)
+        samples, wall_seconds = run_load(check, repeat, concurrency)
+        profile = latency_profile(samples, wall_seconds, latency or {})
+        failures = [actual_result for _, isOK, actual_result in samples if isOK != 0]
+        isOK = 1 if failures or profile["violations"] else 0
+        actual_result = f"API load check {'passed' if isOK == 0 else 'failed'} for {url}: {profile_summary(profile)}"
+        if failures:
+            actual_result += f". First failure: {failures[0]}"
+        return isOK, actual_result, profile
+
+    def check_api_response(self, url, method="GET", headers=None, payload=None, expected_status=200, expected_responses=None, cookies=None, body=None):
+        """Send the request once and check its status, expected responses and body options (streaming, size limit, hash)."""
         try:
             headers = headers or {}
             payload = payload or {}
+            body = body or BodyOptions()
+            client = get_api_client()  # Pooled keep-alive session per host, with timeouts and retries
 
             # For API requests
-            if method.upper() == "GET":
-                response = requests.get(url, headers=headers)
-            elif method.upper() == "POST":
-                response = requests.post(url, headers=headers, json=payload)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-
-            # Validate the response code
-            assert response.status_code == expected_status, f"Expected status {expected_status}, got {response.status_code}"
-
-            # Validate the response
-            validation_results = []
-            if expected_responses:
-                for expected_response in expected_responses:
-                    key = expected_response.get("key")
-                    value = expected_response.get("value")
-                    operand = expected_response.get("operand", "equals")
-
-                    if operand == "equals":
-                        if self._find_key_value(response.json(), key, value):
-                            validation_results.append(f"""Validation passed: {key} equals {value}""")
-                        else:
-                            validation_results.append(f"\nValidation failed: {key} does not equal {value}")
-                    elif operand == "contains":
-                        if self._find_key_value(response.json(), key, value, contains=True):
-                            validation_results.append(f"\nValidation passed: {key} contains {value}")
-                        else:
-                            validation_results.append(f"\nValidation failed: {key} does not contain {value}")
-                    else:
-                        raise ValueError(
-                            f"Unsupported response validation operator in expected_response: {operand}."
-                            "Expected format: "
-                            '{"url": "<URL>", "method": "<GET|POST|PUT>", '
-                            '"headers": {<optional>}, "payload": {<optional>}, '
-                            '"expected_status": "<code>", '
-                            '"expected_responses": [{"key": "<key>", "value": "<value>", "operand": "<equals|contains>"}]}'
-                        )
-
+            method = method.upper()
+            if method not in API_METHODS:
+                raise ValueError(f"Unsupported HTTP method: {method}. Supported: {', '.join(API_METHODS)}")
+            request_args = {"headers": headers, "cookies": cookies, "stream": body.stream}
+            if method in ("POST", "PUT", "PATCH") or (method == "DELETE" and payload):
+                request_args["json"] = payload
+
+            with client.request(method, url, **request_args) as response:
+                # Validate the response code
+                assert response.status_code == expected_status, f"Expected status {expected_status}, got {response.status_code}"
+
+                # Validate the response: parsed once (or streamed), every assertion checked in one traversal
+                assertions = compile_assertions(expected_responses) if expected_responses else []
+                results, size, digest = read_body(response, assertions, body)
+            validation_results = [message for passed, message in results]
+            if body.expected_hash:
+                assert digest == body.expected_hash, f"Body {body.hash} {digest} does not match expected_hash {body.expected_hash}"
+            if digest is not None:
+                validation_results.append(f"Body: {size} bytes, {body.hash} {digest}")
+
+            if not all(passed for passed, message in results):
+                return 1, f"API validation failed for {url}. Validation results: {', '.join(validation_results)}"
             return 0, f"API validation successful for {url}. Validation results: {', '.join(validation_results)}"
         except Exception as e:
             return 1, f"API validation failed for {url}: {str(e)}"
 
-    def _find_key_value(self, data, key, value, contains=False):
-        """Recursively find the key-value pair in the nested JSON data."""
-        if isinstance(data, dict):
-            if key in data:
-                if contains:
-                    return value in str(data[key])  # Check if value is contained in the data[key]
-                return data[key] == value  # Check if value matches exactly
-            for k, v in data.items():
-                if self._find_key_value(v, key, value, contains):
-                    return True
-        elif isinstance(data, list):
-            for item in data:
-                if self._find_key_value(item, key, value, contains):
-                    return True
-        return False
-    
     def switch_to_frame_by_selector(self, selector):
         """Switch to the iframe specified by the selector"""
         frame_locator = self.page.frame_locator(selector)
@@ -189,6 +202,8 @@ class BaseActions:
         return element
     def final_selector(self, selector):
         """Construct the final selector based on the provided locators"""
+        if isinstance(selector, ObjectRecord):
+            return selector.selector  # Precomputed when the ObjectMap was loaded
         if isinstance(selector, dict):
             final_selector = selector.get("locator", "")
             if "parent_locator" in selector and pd.notna(selector["parent_locator"]):
@@ -204,6 +219,8 @@ class BaseActions:
         return final_selector
     def final_xpath_selector(self, selector):
         """Construct the final selector based on the provided locators"""
+        if isinstance(selector, ObjectRecord):
+            return selector.parent_locator or ""
         if isinstance(selector, dict):
             final_selector = selector.get("locator", "")
             if "parent_locator" in selector and pd.notna(selector["parent_locator"]):
@@ -217,193 +234,257 @@ class BaseActions:
         start_time = time.time()
         isOK = 0  # 0 = Success, 1 = Failure
         actual_result = ""
-        screenshot_path = None  # Store screenshot if failure occurs
-        final_selector = self.final_selector(selector)   
+        action = action.lower()  # Convert action to lower case for case-insensitive comparison
+        tracer = get_tracer()
+        with tracer.span("action.lookup"):
+            spec = get_action(action)
 
         try:
-            action = action.lower()  # Convert action to lower case for case-insensitive comparison
-
-            if action == "setinputintextfield":
-                locator = self.get_locator(final_selector)
-                locator.wait_for(state="visible", timeout=5000)  # Wait for visibility
-                locator.fill(str(input_value))
-                actual_result = f"Typed '{input_value}' in {final_selector}"
-            
-            elif action == "checkelementexistence":
-                locator = self.get_locator(final_selector)
-                locator.wait_for(state="visible", timeout=5000)  # Wait for visibility
-                actual_result = f"Element {final_selector} exists"
-
-            elif action == "checkelementnotvisible":
-                locator = self.element_not_visible(final_selector)
-                if locator:
-                    actual_result = f"Element {final_selector} does not exist"
-                    isOK = 0
-                else:
-                    actual_result = f"Element {final_selector} exists"
-                    isOK = 1
-            
-            elif action == "clickelement":
-                locator = self.get_locator(final_selector)
-                locator.wait_for(state="visible", timeout=5000)  # Wait for visibility
-                locator.click()
-                actual_result = f"Clicked on {final_selector}"
-
-            elif action == "checkelementcontaintext":
-                if final_selector == "title":
-                    assert self.page.title().to_contain_text(input_value) , f"Expected '{input_value}', got '{self.page.title()}'"
-                    actual_result = f"Page title matched: {input_value}"
-                else:
-                    locator = self.get_locator(final_selector)
-                    expect(locator).to_contain_text(input_value, timeout=5000)
-                    actual_result = f"Verified text '{input_value}' in {final_selector}"
-                    
-            elif action == "timedelay":
-                delay = float(input_value * 1000)  # Convert to milliseconds
-                self.page.wait_for_timeout(int(delay))  # Playwright expects milliseconds
-                actual_result = f"Waited for {input_value}s"
-            
-            elif action == "clickelementcontaintextoption":
-                print("final_selector", final_selector)
-                locator = self.get_locator(final_selector).filter(has_text=input_value)
-                locator.wait_for(state="visible", timeout=50000)  # Wait for visibility
-                locator.click(force=True)  # Click the element with force
-                actual_result = f"Clicked on element {final_selector} containing text '{input_value}'"
-
-            elif action == "cosine_similarity":
-                #locator = self.get_locator(final_selector)
-                #locator.wait_for(state="visible", timeout=50000) 
-                #extracted_response_text = locator.inner_text()
-                SIMILARITY_THRESHOLD = 0.3
-                extracted_response_text = "AI stands for Artificial Intelligence"
-                print("\nsimilarity starts",extracted_response_text,"\nexpected", input_value)
-                similarity_score  =  calculate_cosine_similarity(extracted_response_text,input_value)
-                stepIsOK = similarity_score >= SIMILARITY_THRESHOLD
-
-                if stepIsOK:
-                    isOK=0
-                    actual_result = f"Extracted responses and passed to cosine_similarity. Result: {similarity_score}"
-                else:
-                    isOK = 1  # Mark step as failed
-                    actual_result = f"Error in evaluation: {similarity_score}"
-                
-                return isOK, actual_result
-            
-            elif action == "clickelementxpath":
-                locator = self.page.locator(f"xpath={final_selector}")
-                locator.click(force=True)  # Click the element with force
-                actual_result = f"Clicked on element {final_selector}"
-                
-            elif action == "switchtoframe":
-                if final_selector.isdigit():
-                    self.switch_to_frame_by_index(int(final_selector))
-                else:
-                    self.switch_to_frame_by_selector(final_selector)
-                actual_result = f"Switched to frame with selector '{final_selector}'"
-
-            elif action == "switchtoframebyshadowselector":
-                shadow_host_selector, iframe_selector = final_selector.split(">>")
-                self.switch_to_frame_in_shadow_root(shadow_host_selector.strip(), iframe_selector.strip())
-                actual_result = f"switched to frame Successfully"
-
-            elif action == "switchtomainframe":
-                self.switch_to_main_frame()
-                actual_result = f"Switched back to main frame"
-
-            elif action == "clickshadow":
-                selectors = final_selector.split(">>")
-                shadow_root = self.page.query_selector(selectors[0])
-                if shadow_root is None:
-                    raise Exception(f"Element '{selectors[0]}' not found")
-                shadow_root = shadow_root.evaluate_handle("el => el.shadowRoot")
-                for sel in selectors[1:-1]:
-                    shadow_root = shadow_root.evaluate_handle(f"el => el.querySelector('{sel}').shadowRoot")
-                    if shadow_root is None:
-                        raise Exception(f"Element '{sel}' not found in shadow DOM")
-                shadow_element = shadow_root.evaluate_handle(f"el => el.querySelector('{selectors[-1]}')")
-                if shadow_element is None:
-                    raise Exception(f"Element '{selectors[-1]}' not found in shadow DOM")
-                shadow_element.click()
-                actual_result = f"Clicked on nested shadow DOM element {selectors[-1]} inside {final_selector}"
-
-            elif action == "waitforelementexist":
-                locator = self.get_locator(final_selector)
-                locator.wait_for(state="attached", timeout=int(input_value))
-                actual_result = f"Element {final_selector} exists within {input_value}s"
-
-            elif action == "checkelementenabled":
-                locator = self.get_locator(final_selector)
-                expect(locator).to_be_enabled(timeout=90000)  # Check if the element is enabled
-                actual_result = f"Element {final_selector} is enabled"
-
-            elif action == "checkelementnotvisiblexpath":
-                locator = self.page.locator(f"xpath={final_selector}")
-                expect(locator).not_to_be_visible(timeout=90000)  # Check if the element is not visible
-                actual_result = f"Element {final_selector} is not visible"
-
-            elif action == "checkelementcontainstextexistence":
-                parent_locator = self.get_locator(selector.get("parent_locator"))
-                child_locator = parent_locator.locator(selector.get("child_locator1"))
-                expect(child_locator).to_contain_text(input_value, timeout=90000)  # Check if the element contains the text
-                actual_result = f"Element {selector.get('child_locator1')} contains text '{input_value}'"
-
-            elif action == "checkelementcontainstoredtext":
-                with open('runTimeData/dataStore.json', 'r') as file:
-                    json_data = json.load(file)
-                    assert input_value in json_data, f"Expected key '{input_value}' not found in data store"
-                    stored_text = json_data[input_value]
-                    parent_locator = self.get_locator(selector.get("parent_locator"))
-                    child_locator = parent_locator.locator(selector.get("child_locator1"))
-                    expect(child_locator).to_contain_text(stored_text, timeout=90000)  # Check if the element contains the stored text
-                    actual_result = f"Element {selector.get('child_locator1')} contains stored text '{stored_text}'"
-
-            elif action == "accessibilitycheck":
-                report_path, isOK = self.perform_accessibility_check()
-                print(f"reportPath{report_path} and isOK is {isOK}")
-                actual_result = f"Performed accessibility check. <a href='{report_path}' target='_blank'>Accessibility Report</a>"
-            
-            elif action == "validateapiresponse":
-                try:
-                    input_data = json.loads(input_value)
-                except ValueError as e:
-                    isOK = 1  # Mark step as failed
-                    actual_result = (
-                        f"Invalid JSON input for API validation: {input_value}. "
-                        "Expected format: "
-                        '{"url": "<URL>", "method": "<GET|POST|PUT>", '
-                        '"headers": {<optional>}, "payload": {<optional>}, '
-                        '"expected_status": "<code>", '
-                        '"expected_responses": [{"key": "<key>", "value": "<value>", "operand": "<equals|contains>"}]}'
-                    )
-                    raise Exception(actual_result)
-                
-                url = input_data.get("url")
-                method = input_data.get("method", "GET")
-                headers = input_data.get("headers", None)
-                payload = input_data.get("payload", None)
-                expected_status = input_data.get("expected_status")
-                expected_responses = input_data.get("expected_response")
-                isOK, actual_result = self.validate_api_response(url, method, headers, payload, expected_status, expected_responses)
+            if spec is None:
+                raise ValueError(f"Unsupported action: {action}")
+            with tracer.span("selector.resolve"):
+                final_selector = self.final_selector(selector)
+                target = selector if isinstance(selector, ObjectRecord) else final_selector  # Records carry their XPath/CSS kind
+            call = ActionCall(step_no, step_desc, action, selector, final_selector, target, input_value, optional_data, propertyname)
+            with tracer.span("action", **{"action.name": action}):
+                result = spec.handler(self, call)
+            if isinstance(result, tuple):
+                isOK, actual_result = result
             else:
-                # Delegate to CustomTransactActions if action is not found in BaseActions
-                return self.custom_actions.perform_action(step_no, step_desc, expected_result, action, selector, input_value)
+                actual_result = result
+            if isOK == 0:
+                self.waits.record(action, time.time() - start_time)  # Feeds the adaptive timeouts
+            if not spec.report:
+                return isOK, actual_result
 
         except Exception as e:
             isOK = 1  # Mark step as failed
             actual_result = f"Error: {str(e)}"
 
-        # Ensure the screenshots directory exists
-        os.makedirs("reports/screenshots", exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        screenshot_path = f"reports/screenshots/{step_no}_{timestamp}.png"
-        self.page.screenshot(path=screenshot_path)  # Take screenshot from the main page
+        with tracer.span("screenshot"):
+            screenshot_key = self.capture_screenshot(step_no, isOK)  # Written in the background
+            screenshot_path = self.screenshotter.store.resolve(screenshot_key) if screenshot_key else None
         
         duration = round(time.time() - start_time, 2) 
         # Add step result to report
-        self.report_steps.append([step_no, step_desc, expected_result, actual_result, f"{duration}s", "Pass" if isOK == 0 else "Fail", screenshot_path])
+        with tracer.span("report.write"):
+            self.report_steps.append([step_no, step_desc, expected_result, actual_result, f"{duration}s", "Pass" if isOK == 0 else "Fail", screenshot_path])
         
         return isOK, actual_result  # Return the status of the step and the actual result
 
+    # Action handlers: registered by StepName (see actions/registry.py), called as handler(self, call)
+
+    @action("setinputintextfield", expected="Text '{input_value}' should be entered in {selector}")
+    def set_input_in_text_field(self, call):
+        locator = self.waits.wait_for_actionable(self.get_locator(call.target), self.waits.timeout(call.action, 5000))
+        locator.fill(str(call.input_value))
+        return f"Typed '{call.input_value}' in {call.final_selector}"
+
+    @action("checkelementexistence", expected="Element {selector} should exist")
+    def check_element_existence(self, call):
+        locator = self.get_locator(call.target)
+        locator.wait_for(state="visible", timeout=self.waits.timeout(call.action, 5000))  # Wait for visibility
+        return f"Element {call.final_selector} exists"
+
+    @action("checkelementnotvisible", expected="Element {selector} should not exist")
+    def check_element_not_visible(self, call):
+        if self.element_not_visible(call.final_selector):
+            return 0, f"Element {call.final_selector} does not exist"
+        return 1, f"Element {call.final_selector} exists"
+
+    @action("clickelement", expected="Element {selector} should be clicked")
+    def click_element(self, call):
+        locator = self.waits.wait_for_actionable(self.get_locator(call.target), self.waits.timeout(call.action, 5000))
+        locator.click()
+        return f"Clicked on {call.final_selector}"
+
+    @action("checkelementcontaintext", expected="Element {selector} should contain text '{input_value}'")
+    def check_element_contain_text(self, call):
+        if call.final_selector == "title":
+            assert self.page.title().to_contain_text(call.input_value) , f"Expected '{call.input_value}', got '{self.page.title()}'"
+            return f"Page title matched: {call.input_value}"
+        locator = self.get_locator(call.target)
+        expect(locator).to_contain_text(call.input_value, timeout=self.waits.timeout(call.action, 5000))
+        return f"Verified text '{call.input_value}' in {call.final_selector}"
+
+    @action("timedelay", expected="Wait for {input_value}s")
+    def time_delay(self, call):
+        delay = float(call.input_value) * 1000  # Convert to milliseconds (text-based plans give strings)
+        if self.waits.time_delay_mode == "condition":
+            # Wait for the page to settle instead of sleeping; the TimeDelay is only the upper bound
+            waited = self.waits.wait_for_page_quiet(self.page, int(delay))
+            return f"Waited {waited:.1f}s for network idle and a stable page (TimeDelay {call.input_value}s)"
+        self.page.wait_for_timeout(int(delay))  # Playwright expects milliseconds
+        return f"Waited for {call.input_value}s"
+
+    @action("clickelementcontaintextoption", expected="Element {selector} should be clicked which is having text '{input_value}'")
+    def click_element_contain_text_option(self, call):
+        print("final_selector", call.final_selector)
+        locator = self.get_locator(call.target).filter(has_text=call.input_value)
+        locator.wait_for(state="visible", timeout=self.waits.timeout(call.action, 50000))  # Wait for visibility
+        locator.click(force=True)  # Click the element with force
+        return f"Clicked on element {call.final_selector} containing text '{call.input_value}'"
+
+    @action("cosine_similarity", report=False)
+    def cosine_similarity(self, call):
+        #locator = self.get_locator(call.target)
+        #locator.wait_for(state="visible", timeout=50000) 
+        #extracted_response_text = locator.inner_text()
+        SIMILARITY_THRESHOLD = 0.3
+        extracted_response_text = "AI stands for Artificial Intelligence"
+        print("\nsimilarity starts",extracted_response_text,"\nexpected", call.input_value)
+        similarity_score  =  calculate_cosine_similarity(extracted_response_text,call.input_value)
+        if similarity_score >= SIMILARITY_THRESHOLD:
+            return 0, f"Extracted responses and passed to cosine_similarity. Result: {similarity_score}"
+        return 1, f"Error in evaluation: {similarity_score}"  # Mark step as failed
+
+    @action("clickelementxpath")
+    def click_element_xpath(self, call):
+        locator = self.page.locator(f"xpath={call.final_selector}")
+        locator.click(force=True)  # Click the element with force
+        return f"Clicked on element {call.final_selector}"
+
+    @action("switchtoframe")
+    def switch_to_frame(self, call):
+        if call.final_selector.isdigit():
+            self.switch_to_frame_by_index(int(call.final_selector))
+        else:
+            self.switch_to_frame_by_selector(call.final_selector)
+        return f"Switched to frame with selector '{call.final_selector}'"
+
+    @action("switchtoframebyshadowselector")
+    def switch_to_frame_by_shadow_selector(self, call):
+        shadow_host_selector, iframe_selector = call.final_selector.split(">>")
+        self.switch_to_frame_in_shadow_root(shadow_host_selector.strip(), iframe_selector.strip())
+        return f"switched to frame Successfully"
+
+    @action("switchtomainframe")
+    def switch_to_main_frame_action(self, call):
+        self.switch_to_main_frame()
+        return f"Switched back to main frame"
+
+    @action("clickshadow")
+    def click_shadow(self, call):
+        selectors = call.final_selector.split(">>")
+        shadow_root = self.page.query_selector(selectors[0])
+        if shadow_root is None:
+            raise Exception(f"Element '{selectors[0]}' not found")
+        shadow_root = shadow_root.evaluate_handle("el => el.shadowRoot")
+        for sel in selectors[1:-1]:
+            shadow_root = shadow_root.evaluate_handle(f"el => el.querySelector('{sel}').shadowRoot")
+            if shadow_root is None:
+                raise Exception(f"Element '{sel}' not found in shadow DOM")
+        shadow_element = shadow_root.evaluate_handle(f"el => el.querySelector('{selectors[-1]}')")
+        if shadow_element is None:
+            raise Exception(f"Element '{selectors[-1]}' not found in shadow DOM")
+        shadow_element.click()
+        return f"Clicked on nested shadow DOM element {selectors[-1]} inside {call.final_selector}"
+
+    @action("waitforelementexist", expected="Element {selector} should exist within {input_value}s")
+    def wait_for_element_exist(self, call):
+        locator = self.get_locator(call.target)
+        locator.wait_for(state="attached", timeout=int(call.input_value))  # The step sets its own timeout
+        return f"Element {call.final_selector} exists within {call.input_value}s"
+
+    @action("checkelementenabled", expected="Element {selector} should be enabled")
+    def check_element_enabled(self, call):
+        locator = self.get_locator(call.target)
+        expect(locator).to_be_enabled(timeout=self.waits.timeout(call.action, 90000))  # Check if the element is enabled
+        return f"Element {call.final_selector} is enabled"
+
+    @action("checkelementnotvisiblexpath", expected="Element {selector} should not be visible")
+    def check_element_not_visible_xpath(self, call):
+        locator = self.page.locator(f"xpath={call.final_selector}")
+        expect(locator).not_to_be_visible(timeout=self.waits.timeout(call.action, 90000))  # Check if the element is not visible
+        return f"Element {call.final_selector} is not visible"
+
+    @action("checkelementcontainstextexistence", expected="Element {child_locator1} should contain text '{input_value}'")
+    def check_element_contains_text_existence(self, call):
+        parent_locator = self.get_locator(call.selector.get("parent_locator"))
+        child_locator = parent_locator.locator(call.selector.get("child_locator1"))
+        expect(child_locator).to_contain_text(call.input_value, timeout=self.waits.timeout(call.action, 90000))  # Check if the element contains the text
+        return f"Element {call.selector.get('child_locator1')} contains text '{call.input_value}'"
+
+    @action("checkelementcontainstoredtext", expected="Element {child_locator1} should contain stored text from data store")
+    def check_element_contain_stored_text(self, call):
+        with open('runTimeData/dataStore.json', 'r') as file:
+            json_data = json.load(file)
+        assert call.input_value in json_data, f"Expected key '{call.input_value}' not found in data store"
+        stored_text = json_data[call.input_value]
+        parent_locator = self.get_locator(call.selector.get("parent_locator"))
+        child_locator = parent_locator.locator(call.selector.get("child_locator1"))
+        expect(child_locator).to_contain_text(stored_text, timeout=self.waits.timeout(call.action, 90000))  # Check if the element contains the stored text
+        return f"Element {call.selector.get('child_locator1')} contains stored text '{stored_text}'"
+
+    @action("accessibilitycheck")
+    def accessibility_check(self, call):
+        report_path, isOK = self.perform_accessibility_check()
+        print(f"reportPath{report_path} and isOK is {isOK}")
+        return isOK, f"Performed accessibility check. <a href='{report_path}' target='_blank'>Accessibility Report</a>"
+
+    @action("validateapiresponse")
+    def validate_api_response_action(self, call):
+        input_data = self.api_step_input(call)
+        isOK, actual_result, profile = self.measure_api_response(*self.api_step_args(input_data), cookies=self.api_cookies(input_data.get("url")),
+                                                                 **self.api_step_options(input_data))
+        if profile is not None:
+            self.step_extras["latency"] = profile  # Histogram in the report
+        return isOK, actual_result
+
+    @action("validateapibatch", expected="Every API call of the batch should pass")
+    def validate_api_batch_action(self, call):
+        batch, specs = self.api_batch_specs(call)
+        cookies = {host: self.api_cookies(host) for host in {origin(spec.get("url")) for spec in specs}}
+        return self.run_api_batch(batch, specs, cookies)
+
+    def api_batch_specs(self, call):
+        """(batch options, request specs) of a validateapibatch step."""
+        batch = call.input_value if isinstance(call.input_value, dict) else parse_batch_input(call.input_value)
+        return batch, load_api_specs(batch["file"], batch.get("sheet"))
+
+    def run_api_batch(self, batch, specs, cookies_by_origin):
+        """Run the specs concurrently through validate_api_response; each call becomes a sub-step of the step."""
+        start_time = time.time()
+        sub_steps = run_api_batch(
+            lambda spec, cookies: self.validate_api_response(*self.api_step_args(spec), cookies=cookies, **self.api_step_options(spec)),
+            specs,
+            concurrency=int(batch.get("concurrency", DEFAULT_BATCH_CONCURRENCY)),
+            per_host=int(batch.get("perHost", get_api_client().settings.pool_size)),  # More would wait for a pooled connection
+            cookies_by_origin=cookies_by_origin,
+        )
+        self.step_extras["sub_steps"] = sub_steps
+        return batch_summary(sub_steps, time.time() - start_time)
+
+    def api_step_input(self, call):
+        """Parsed JSON input of a validateapiresponse step."""
+        try:
+            input_data = call.input_value if isinstance(call.input_value, dict) else json.loads(call.input_value)  # Compiled steps are pre-parsed
+        except ValueError as e:
+            raise Exception(
+                f"Invalid JSON input for API validation: {call.input_value}. "
+                "Expected format: "
+                '{"url": "<URL>", "method": "<GET|POST|PUT|PATCH|DELETE>", '
+                '"headers": {<optional>}, "payload": {<optional>}, '
+                '"expected_status": "<code>", '
+                '"expected_responses": [{"key": "<key>", "value": "<value>", "operand": "<equals|contains>"}]}'
+            )
+
+        return input_data
+
+    def api_step_options(self, input_data):
+        """Keyword arguments of validate_api_response for the latency budget, load spec and body handling."""
+        return {**load_options(input_data), "body": body_options(input_data)}
+
+    def api_step_args(self, input_data):
+        """(url, method, headers, payload, expected_status, expected_responses) of validate_api_response."""
+        url = input_data.get("url")
+        method = input_data.get("method", "GET")
+        headers = input_data.get("headers", None)
+        payload = input_data.get("payload", None)
+        expected_status = input_data.get("expected_status")
+        expected_responses = input_data.get("expected_response")
+        return url, method, headers, payload, expected_status, expected_responses
+
     def perform_accessibility_check(self):
         """Perform accessibility check using axe-core"""
         # Inject axe-core script
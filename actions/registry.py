@@ -0,0 +1,89 @@
+import importlib
+import logging
+from importlib.metadata import entry_points
+from typing import Any, NamedTuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Entry point group third-party action packs can use to register themselves when installed
+PLUGIN_ENTRY_POINT_GROUP = "playwright_e2e.actions"
+
+class ActionCall(NamedTuple):
+    """Everything a handler needs to perform one step."""
+    step_no: int
+    step_desc: Any
+    action: str
+    selector: Any  # ObjectRecord, {"locator": ...} dict or plain string, as given by the step
+    final_selector: str  # '>>' chained selector string
+    target: Any  # What to pass to BaseActions.get_locator (keeps the ObjectRecord's XPath/CSS kind)
+    input_value: Any
+    optional_data: Any = None
+    property_name: Any = None
+
+class ActionSpec(NamedTuple):
+    name: str
+    handler: Any  # handler(base_actions, call) -> actual_result or (isOK, actual_result)
+    expected: Any  # str.format template with {selector}, {input_value}, {child_locator1}; None for the generic text
+    report: bool  # False if the handler records nothing (no screenshot or report row)
+
+# Action name (lower case) -> ActionSpec
+ACTIONS = {}
+
+def register_action(name, handler, expected=None, report=True):
+    """Register a handler for a StepName; later registrations (e.g. plugins) override earlier ones."""
+    name = name.lower()
+    if name in ACTIONS and ACTIONS[name].handler is not handler:
+        logger.warning(f"Action '{name}' is registered more than once; using {getattr(handler, '__qualname__', handler)}")
+    ACTIONS[name] = ActionSpec(name, handler, expected, report)
+    return handler
+
+def action(name, expected=None, report=True):
+    """Decorator form of register_action, with the expected-result template next to the handler."""
+    def decorator(handler):
+        return register_action(name, handler, expected, report)
+    return decorator
+
+def get_action(name):
+    """Return the ActionSpec for a StepName (case-insensitive), or None."""
+    return ACTIONS.get(str(name).lower())
+
+# Action name (lower case) -> ActionSpec whose handler is a coroutine function (async engine)
+ASYNC_ACTIONS = {}
+
+def register_async_action(name, handler, expected=None, report=True):
+    """Register the playwright.async_api version of an action; the expected template defaults to the sync one."""
+    name = name.lower()
+    if expected is None and name in ACTIONS:
+        expected = ACTIONS[name].expected
+    ASYNC_ACTIONS[name] = ActionSpec(name, handler, expected, report)
+    return handler
+
+def async_action(name, expected=None, report=True):
+    """Decorator form of register_async_action."""
+    def decorator(handler):
+        return register_async_action(name, handler, expected, report)
+    return decorator
+
+def get_async_action(name):
+    """Return the async ActionSpec for a StepName (case-insensitive), or None."""
+    return ASYNC_ACTIONS.get(str(name).lower())
+
+def load_action_plugins(module_names=()):
+    """Import action pack modules (they register on import) plus any installed entry-point plugins."""
+    for module_name in module_names:
+        importlib.import_module(module_name)
+        logger.info(f"Loaded action plugin module {module_name}")
+    installed = entry_points()
+    if hasattr(installed, "select"):
+        installed = installed.select(group=PLUGIN_ENTRY_POINT_GROUP)
+    else:
+        installed = installed.get(PLUGIN_ENTRY_POINT_GROUP, [])  # Python < 3.10
+    for entry_point in installed:
+        entry_point.load()
+        logger.info(f"Loaded action plugin {entry_point.name} ({entry_point.value})")
+
+def load_configured_action_plugins(config):
+    """Load the comma-separated modules in the actionPlugins key of config.ini."""
+    module_names = [name.strip() for name in config.get("playwright", "actionPlugins", fallback="").split(",") if name.strip()]
+    load_action_plugins(module_names)
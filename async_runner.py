@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import logging
+import sys
+from playwright.async_api import async_playwright
+from actions.async_actions import AsyncBaseActions
+from actions.registry import get_async_action, load_configured_action_plugins
+from report_generator import generate_html_report
+from utils.api_stub import open_stub_server
+from utils.har import load_har_settings, open_har_context_async
+from utils.plan_compiler import EVALUATION_PACKS, PlanError, blank_to_none, validate_plan
+from utils.plan_discovery import load_test_data, read_config
+from utils.screenshots import Screenshotter, flush_screenshots, load_screenshot_policy
+from utils.test_executor import run_test_case_async, test_case_status
+from utils.tracing import finish_trace_run
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def async_concurrency(config):
+    """Return how many test cases run at the same time, from the [async] section of config.ini."""
+    return max(1, config.getint("async", "concurrency", fallback=4))
+
+def collect_test_cases(test_data, test_packs):
+    """Return [(pack, AutomationTestID, steps)] in plan order, and PlanErrors for actions with no async handler."""
+    test_cases = []
+    errors = []
+    for test_pack_name in test_packs:
+        test_case_ids = test_data.get_test_cases(test_pack_name)["AutomationTestID"]
+        for automation_test_id, test_steps in test_data.iter_test_steps(test_pack_name, test_case_ids):
+            test_cases.append((test_pack_name, automation_test_id, test_steps))
+            if test_pack_name in EVALUATION_PACKS:
+                continue
+            for step_no, step in enumerate(test_steps, start=1):
+                step_name = blank_to_none(step.get("StepName"))
+                action = str(step_name).strip().lower()
+                if step_name is not None and action != "launchapplication" and get_async_action(action) is None:
+                    errors.append(PlanError(test_pack_name, automation_test_id, step_no, f"No async handler for action: {step_name}"))
+    return test_cases, errors
+
+async def run_test_cases(test_data, test_cases, config, concurrency):
+    """Run the test cases concurrently, each in its own context of one shared browser; results keep plan order."""
+    browser_name = config["playwright"]["browser"].strip()
+    headless_mode = config.getboolean("playwright", "headless")
+    base_url = config["playwright"]["base_URL"].strip()
+    policy = load_screenshot_policy(config)
+    semaphore = asyncio.Semaphore(concurrency)
+    har = load_har_settings(config)
+
+    async with async_playwright() as playwright:
+        browser = await getattr(playwright, browser_name).launch(headless=headless_mode)
+
+        async def run_one(test_pack_name, automation_test_id, test_steps):
+            async with semaphore:
+                logger.info(f"Running test case: {automation_test_id}")
+                if har.mode == "off":
+                    context = await browser.new_context()
+                else:
+                    context = await open_har_context_async(browser, har, test_pack_name, automation_test_id)
+                try:
+                    page = await context.new_page()
+                    page.set_default_timeout(60000)  # 60 seconds
+                    base = AsyncBaseActions(page, [], Screenshotter(policy))  # One Screenshotter per concurrent test case
+                    test_case_result, isOK = await run_test_case_async(base, test_data, test_pack_name, automation_test_id, test_steps, base_url)
+                except Exception as e:
+                    logger.error(f"Test case {automation_test_id} could not run: {str(e)}")
+                    test_case_result = {"test_case_id": automation_test_id, "status": test_case_status(1), "steps": [], "elapsed_time": 0}
+                finally:
+                    await context.close()
+                logger.info(f"Test case {automation_test_id} completed with status: {test_case_result['status']}")
+                return test_case_result
+
+        try:
+            return await asyncio.gather(*(run_one(*test_case) for test_case in test_cases))
+        finally:
+            await browser.close()
+
+def run_async(test_packs=None, concurrency=None):
+    """Validate the plan, run it on the async engine and write the HTML report; returns the test results."""
+    config = read_config()
+    load_configured_action_plugins(config)
+    concurrency = concurrency or async_concurrency(config)
+    base_url = config["playwright"]["base_URL"].strip()
+
+    test_data = load_test_data()
+    test_packs = test_packs or list(test_data.get_test_packs()["TestPackName"])
+    errors = validate_plan(test_data, test_packs, base_url)
+    test_cases, async_errors = collect_test_cases(test_data, test_packs)
+    errors.extend(async_errors)
+    if errors:
+        for error in errors:
+            logger.error(f"Plan error: {error}")
+        raise ValueError(f"Test plan has {len(errors)} errors; nothing was run")
+
+    logger.info(f"Running {len(test_cases)} test cases, {concurrency} at a time")
+    with open_stub_server(config):  # API steps against the local stub server in [api_stub] replay mode
+        test_results = asyncio.run(run_test_cases(test_data, test_cases, config, concurrency))
+    flush_screenshots()
+    if test_results:
+        generate_html_report(test_results)
+    finish_trace_run()
+    return test_results
+
+def main():
+    parser = argparse.ArgumentParser(description="Run test cases concurrently on playwright.async_api, one context per test case in one browser.")
+    parser.add_argument("--concurrency", type=int, help="Test cases running at the same time (default: [async] concurrency)")
+    parser.add_argument("--pack", dest="packs", action="append", help="Test pack to run (repeatable; default: all with RunMode Yes)")
+    args = parser.parse_args()
+
+    test_results = run_async(args.packs, args.concurrency)
+    passed = sum(1 for result in test_results if result["status"] == "Pass")
+    logger.info(f"Async run finished: {passed} passed, {len(test_results) - passed} failed")
+    if not test_results or passed != len(test_results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
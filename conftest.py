@@ -3,6 +3,11 @@ import configparser
 from playwright.sync_api import sync_playwright
 import logging
 
+# Lazy test-pack discovery: parametrizes test_pack_name and provides the test_data fixture
+pytest_plugins = ["utils.plan_discovery"]
+# The runner's unit tests have their own pytest.ini: python -m pytest tests
+collect_ignore = ["tests"]
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,9 +24,24 @@ except Exception as e:
     logger.error(f"Error reading config.ini: {str(e)}")
     pytest.fail(f"Configuration error: {str(e)}")
 
+def pytest_addoption(parser):
+    """Register command line options for the test plan."""
+    parser.addoption(
+        "--rebuild-plan-cache",
+        action="store_true",
+        default=False,
+        help="Discard the compiled test plan cache and re-parse the workbook.",
+    )
+
+def pytest_configure(config):
+    """Clear the compiled plan cache before collection when a rebuild is requested."""
+    if config.getoption("--rebuild-plan-cache"):
+        from utils.plan_cache import clear_plan_cache
+        clear_plan_cache()
+
 @pytest.fixture(scope="session")
-def playwright():
-    """Fixture to manage Playwright instance."""
+def playwright(validated_plan):
+    """Fixture to manage Playwright instance; starts only after the test plan validated."""
     with sync_playwright() as p:
         yield p
 
@@ -51,10 +71,39 @@ def browser_context(browser, playwright):
         logger.info("No browser context created for the session (force_new_browser_session=True).")
         yield None
 
+@pytest.fixture(scope="session")
+def context_pool(browser, test_data):
+    """Fixture to manage the logged-in context pool (contextPool in config.ini); None when disabled."""
+    from utils.context_pool import open_context_pool
+    from utils.plan_discovery import read_config
+    if browser is None:
+        yield None
+        return
+    pool_config = read_config()  # The module-level config uses a Windows-only path
+    pool = open_context_pool(browser, pool_config, test_data, pool_config["playwright"]["base_url"].strip())
+    yield pool
+    if pool is not None:
+        pool.close()
+
+@pytest.fixture(scope="session", autouse=True)
+def api_stub():
+    """Fixture to serve API steps from a local stub server ([api_stub] mode = replay) or record their responses (mode = record)."""
+    from utils.api_stub import open_stub_server
+    from utils.plan_discovery import read_config
+    with open_stub_server(read_config()) as stub:  # The module-level config uses a Windows-only path
+        yield stub
+
 @pytest.fixture
-def page(browser_context, playwright):
+def page(browser_context, playwright, context_pool):
     """Fixture to manage page instance."""
-    if force_new_browser_session:
+    if context_pool is not None:
+        logger.info("Taking an isolated browser context from the context pool for this test case...")
+        context = context_pool.acquire()
+        page = context.new_page()
+        yield page
+        logger.info("Returning the browser context to the context pool...")
+        context_pool.release(context)
+    elif force_new_browser_session:
         logger.info("Launching new browser and context for this test case...")
         browser = getattr(playwright, browser_name).launch(headless=headless_mode)
         context = browser.new_context()
@@ -75,5 +124,9 @@ def pytest_sessionfinish(session, exitstatus):
     """Generate HTML report after all tests have run."""
     from test_init import test_results
     from report_generator import generate_html_report
+    from utils.screenshots import flush_screenshots
+    from utils.tracing import finish_trace_run
+    flush_screenshots()  # Screenshots are written in the background
     if test_results:
         generate_html_report(test_results)
+    finish_trace_run()  # Timing profile of the run, when [tracing] is enabled
@@ -0,0 +1,160 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+from playwright.sync_api import sync_playwright
+from actions.registry import load_configured_action_plugins
+from report_generator import generate_html_report
+from utils.api_stub import open_stub_server
+from utils.context_pool import open_context_pool
+from utils.plan_compiler import validate_plan
+from utils.plan_discovery import load_test_data, read_config
+from utils.screenshots import Screenshotter, flush_screenshots, get_screenshot_store, get_screenshot_writer, load_screenshot_policy
+from utils.test_executor import run_test_pack
+from utils.tracing import finish_trace_run, get_tracer, share_run_id
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seconds the controller waits for a result before checking that the workers are alive
+RESULT_POLL_INTERVAL = 5
+
+def parallel_settings(config):
+    """Return (workers, split) from the [parallel] section of config.ini; 0 workers means one per CPU."""
+    workers = config.getint("parallel", "workers", fallback=0) or os.cpu_count() or 1
+    split = config.get("parallel", "split", fallback="pack").strip().lower() or "pack"
+    return workers, split
+
+def plan_tasks(test_data, test_packs, split):
+    """Split the run into tasks: (pack, None) for a whole pack or (pack, [AutomationTestID]) for one test case."""
+    if split == "pack":
+        return [(test_pack_name, None) for test_pack_name in test_packs]
+    if split == "case":
+        return [
+            (test_pack_name, [test_case_id])
+            for test_pack_name in test_packs
+            for test_case_id in test_data.get_test_cases(test_pack_name)["AutomationTestID"]
+        ]
+    raise ValueError(f"Unsupported split '{split}'. Supported: pack, case")
+
+def worker_main(worker_no, tasks, results):
+    """Worker process: launch its own browser, run tasks until the queue is drained and stream each result back."""
+    try:
+        config = read_config()
+        load_configured_action_plugins(config)
+        browser_name = config["playwright"]["browser"].strip()
+        headless_mode = config.getboolean("playwright", "headless")
+        base_url = config["playwright"]["base_URL"].strip()
+        test_data = load_test_data()
+        screenshotter = Screenshotter(load_screenshot_policy(config))
+        store = get_screenshot_store()
+        with open_stub_server(config), sync_playwright() as playwright:  # Each worker has its own API stub in replay mode
+            browser = getattr(playwright, browser_name).launch(headless=headless_mode)
+            context_pool = open_context_pool(browser, config, test_data, base_url)
+            try:
+                while True:
+                    task = tasks.get()
+                    if task is None:
+                        break
+                    test_pack_name, test_case_ids = task
+                    for test_case_result in run_test_pack(browser, test_data, test_pack_name, base_url, screenshotter, test_case_ids, context_pool):
+                        get_screenshot_writer().flush()  # The controller links the files as soon as it gets the result
+                        keys = [step["screenshot_key"] for step in test_case_result["steps"] if step.get("screenshot_key")]
+                        results.put(("result", worker_no, test_case_result, store.entries(keys)))
+            finally:
+                if context_pool is not None:
+                    context_pool.close()
+                browser.close()
+                get_tracer().flush()  # Write this worker's spans before it reports done, not only at interpreter exit
+    except BaseException as e:
+        results.put(("error", worker_no, f"{type(e).__name__}: {str(e)}", None))
+    finally:
+        results.put(("done", worker_no, None, None))
+
+def run_parallel(test_packs=None, workers=None, split=None):
+    """Run packs across worker processes and merge their results into one report; returns the test results."""
+    config = read_config()
+    load_configured_action_plugins(config)
+    default_workers, default_split = parallel_settings(config)
+    workers = workers or default_workers
+    split = split or default_split
+    base_url = config["playwright"]["base_URL"].strip()
+
+    # Parse and validate once in the controller; workers then load the plan from the compiled plan cache
+    test_data = load_test_data()
+    test_packs = test_packs or list(test_data.get_test_packs()["TestPackName"])
+    errors = validate_plan(test_data, test_packs, base_url)
+    if errors:
+        for error in errors:
+            logger.error(f"Plan error: {error}")
+        raise ValueError(f"Test plan has {len(errors)} errors; nothing was run")
+
+    task_list = plan_tasks(test_data, test_packs, split)
+    workers = max(1, min(workers, len(task_list)))
+    logger.info(f"Running {len(task_list)} tasks ({split} split) on {workers} worker processes")
+
+    context = multiprocessing.get_context("spawn")  # Each worker starts its own Playwright
+    share_run_id()  # Workers trace under the controller's run
+    tasks = context.Queue()
+    results = context.Queue()
+    for task in task_list:
+        tasks.put(task)
+    for _ in range(workers):
+        tasks.put(None)  # One stop marker per worker
+    processes = [context.Process(target=worker_main, args=(worker_no, tasks, results), name=f"e2e-worker-{worker_no}")
+                 for worker_no in range(workers)]
+    for process in processes:
+        process.start()
+
+    test_results = []
+    store = get_screenshot_store()
+    running = set(range(workers))
+    failed_workers = set()  # Their remaining tasks never ran, so the run cannot pass
+    while running:
+        try:
+            kind, worker_no, payload, manifest_entries = results.get(timeout=RESULT_POLL_INTERVAL)
+        except queue.Empty:
+            for worker_no in list(running):
+                if not processes[worker_no].is_alive():
+                    logger.error(f"Worker {worker_no} exited with code {processes[worker_no].exitcode}")
+                    running.discard(worker_no)
+                    failed_workers.add(worker_no)
+            continue
+        if kind == "result":
+            store.manifest.update(manifest_entries)
+            test_results.append(payload)
+            logger.info(f"Worker {worker_no}: test case {payload['test_case_id']} {payload['status']}")
+        elif kind == "error":
+            logger.error(f"Worker {worker_no} failed: {payload}")
+            failed_workers.add(worker_no)
+        else:
+            running.discard(worker_no)
+    for process in processes:
+        process.join()
+
+    flush_screenshots()
+    if test_results:
+        generate_html_report(test_results)
+    finish_trace_run()  # Includes the spans the workers appended
+    if failed_workers:
+        raise RuntimeError(f"{len(failed_workers)} of {workers} workers failed; the run is incomplete (see the worker errors above)")
+    return test_results
+
+def main():
+    parser = argparse.ArgumentParser(description="Run test packs in parallel worker processes, each with its own browser.")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: [parallel] workers, 0 = one per CPU)")
+    parser.add_argument("--split", choices=["pack", "case"], help="Distribute whole packs or single test cases to the workers")
+    parser.add_argument("--pack", dest="packs", action="append", help="Test pack to run (repeatable; default: all with RunMode Yes)")
+    args = parser.parse_args()
+
+    test_results = run_parallel(args.packs, args.workers, args.split)
+    passed = sum(1 for result in test_results if result["status"] == "Pass")
+    logger.info(f"Parallel run finished: {passed} passed, {len(test_results) - passed} failed")
+    if not test_results or passed != len(test_results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
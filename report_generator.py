@@ -1,10 +1,68 @@
+import html
 import os
 from datetime import datetime
+from utils.screenshots import load_manifest
 
-def generate_html_report(test_results):
+def screenshot_link(step, manifest):
+    """Resolve a step's screenshot through the manifest to a path relative to the report directory."""
+    screenshot_key = step.get("screenshot_key")
+    if screenshot_key and screenshot_key in manifest:
+        return f"screenshots/{manifest[screenshot_key]}"
+    return step.get("screenshot_path")  # Results recorded before the content-addressed store
+
+def network_summary(result):
+    """One line with the requests the network policy blocked, stubbed or served from cache."""
+    network = result.get("network")
+    if not network:
+        return ""
+    return (f"<p>Network: {network['blocked']} blocked (~{network['blocked_bytes_estimate'] // 1024} KB), "
+            f"{network['stubbed']} stubbed, {network['cache_hits']} from cache ({network['bytes_from_cache'] // 1024} KB)</p>")
+
+def sub_step_rows(step):
+    """Report rows for the calls of a batch action, under their step."""
+    rows = ""
+    for sub_step in step.get("sub_steps") or []:
+        status_class = "pass" if sub_step["status"] == "Pass" else "fail"
+        rows += f"""
+                <tr class="sub-step">
+                    <td>{step['step_no']}.{sub_step['sub_step_no']}</td>
+                    <td>{sub_step['name']}</td>
+                    <td>Should pass</td>
+                    <td>{sub_step['actual_result']} ({sub_step['elapsed_time']}s)</td>
+                    <td class="{status_class}">{sub_step['status']}</td>
+                    <td>NA</td>
+                </tr>
+            """
+    return rows
+
+def latency_rows(step):
+    """Report row with the latency statistics and histogram of an API load check."""
+    profile = step.get("latency")
+    if not profile:
+        return ""
+    largest = max((count for _, count in profile["histogram"]), default=1)
+    bars = "".join(
+        f"<div class='bar'><span class='label'>{html.escape(label)}</span><span class='fill' style='width: {int(300 * count / largest)}px'></span> {count}</div>"
+        for label, count in profile["histogram"]
+    )
+    budget = ", ".join(f"{key} {value:g}" for key, value in profile["budget"].items()) or "none"
+    return f"""
+                <tr class="sub-step">
+                    <td></td>
+                    <td colspan="5">
+                        <p>Latency (ms): min {profile['min_ms']}, p50 {profile['p50_ms']}, p95 {profile['p95_ms']}, p99 {profile['p99_ms']}, max {profile['max_ms']}
+                        | {profile['requests']} requests, {profile['failed']} failed, {profile['throughput_rps']} req/s | Budget: {budget}</p>
+                        {bars}
+                    </td>
+                </tr>
+            """
+
+def generate_html_report(test_results, manifest=None):
     """Generate HTML reports for test results."""
     report_dir = "reports"
     os.makedirs(report_dir, exist_ok=True)
+    if manifest is None:
+        manifest = load_manifest(report_dir)
 
     # Calculate summary statistics
     total_tests = len(test_results)
@@ -83,11 +141,16 @@ def generate_html_report(test_results):
                 .pass {{ color: green; }}
                 .fail {{ color: red; }}
                 img {{ max-width: 100%; height: auto; }}
+                .sub-step td {{ font-size: 90%; background-color: #fafafa; }}
+                .bar {{ font-size: 85%; white-space: nowrap; }}
+                .bar .label {{ display: inline-block; width: 90px; }}
+                .bar .fill {{ display: inline-block; height: 10px; background-color: #5b8def; }}
             </style>
         </head>
         <body>
             <h1>Test Case {result['test_case_id']}</h1>
             <p>Status: <span class="{'pass' if result['status'] == 'Pass' else 'fail'}">{result['status']}</span></p>
+            {network_summary(result)}
             <table>
                 <tr>
                     <th>Step No</th>
@@ -101,7 +164,8 @@ def generate_html_report(test_results):
 
         for step in result["steps"]:
             status_class = "pass" if step["status"] == "Pass" else "fail"
-            screenshot = f"<a target='_blank' href={step.get('screenshot_path', '')}><img style='height: 30px;width: 35px;' src='../assets/image_upload_icons.png' alt='Screenshot'> </a>" if step.get("screenshot_path") else "No screenshot"
+            screenshot_path = screenshot_link(step, manifest)
+            screenshot = f"<a target='_blank' href={screenshot_path}><img style='height: 30px;width: 35px;' src='../assets/image_upload_icons.png' alt='Screenshot'> </a>" if screenshot_path else "No screenshot"
             detailed_html += f"""
                 <tr>
                     <td>{step['step_no']}</td>
@@ -112,6 +176,7 @@ def generate_html_report(test_results):
                     {'<td>'+screenshot+'</td>' if not 'validateapiresponse' in step['expected_result'] else '<td>NA</td>'}
                 </tr>
             """
+            detailed_html += sub_step_rows(step) + latency_rows(step)
 
         detailed_html += """
             </table>
@@ -0,0 +1,210 @@
+import argparse
+import json
+import logging
+import os
+import socket
+import sys
+from playwright.sync_api import sync_playwright
+from actions.registry import load_configured_action_plugins
+from report_generator import generate_html_report
+from utils.api_stub import open_stub_server
+from utils.context_pool import open_context_pool
+from utils.plan_compiler import validate_plan
+from utils.plan_discovery import load_test_data, read_config
+from utils.screenshots import Screenshotter, begin_screenshot_run, flush_screenshots, load_screenshot_policy
+from utils.tracing import begin_trace_run, finish_trace_run
+from utils.test_executor import run_test_pack
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def daemon_address(config):
+    """Return (host, port) of the runner daemon from the [daemon] section of config.ini."""
+    host = config.get("daemon", "host", fallback="127.0.0.1").strip()
+    port = config.getint("daemon", "port", fallback=8765)
+    return host, port
+
+def watched_mtime(path):
+    """Return the latest modification time of the test plan file (or of any file in a plan directory)."""
+    if os.path.isdir(path):
+        return max((os.stat(os.path.join(path, name)).st_mtime_ns for name in os.listdir(path)), default=0)
+    return os.stat(path).st_mtime_ns
+
+class RunnerDaemon:
+    """Long-lived runner that keeps the parsed plan and a warm browser between runs."""
+
+    def __init__(self, config):
+        self.config = config
+        self.host, self.port = daemon_address(config)
+        self.poll_interval = config.getfloat("daemon", "poll_interval", fallback=1.0)
+        self.browser_name = config["playwright"]["browser"].strip()
+        self.headless_mode = config.getboolean("playwright", "headless")
+        self.base_url = config["playwright"]["base_URL"].strip()
+        load_configured_action_plugins(config)
+        self.test_data = load_test_data()
+        self.test_data.load_workbook()  # Keep the whole plan warm
+        self.test_data.track_changes()
+        self.plan_mtime = watched_mtime(self.test_data.file_path)
+        self.playwright = None
+        self.browser = None
+        self.context_pool = None
+        self.running = False
+
+    def launch_browser(self):
+        """Start Playwright once and (re)launch the browser if it is not connected."""
+        if self.playwright is None:
+            self.playwright = sync_playwright().start()
+        if self.browser is None or not self.browser.is_connected():
+            logger.info(f"Launching {self.browser_name} for the runner daemon...")
+            self.browser = getattr(self.playwright, self.browser_name).launch(headless=self.headless_mode)
+            self.context_pool = open_context_pool(self.browser, self.config, self.test_data, self.base_url)
+        return self.browser
+
+    def check_for_changes(self):
+        """Re-parse the sheets that changed since the last check; cheap when the file is untouched."""
+        mtime = watched_mtime(self.test_data.file_path)
+        if mtime == self.plan_mtime:
+            return []
+        self.plan_mtime = mtime
+        try:
+            return self.test_data.reload_changed_sheets()
+        except Exception as e:
+            # The file may be mid-save; keep the old plan and retry on the next poll
+            logger.warning(f"Could not reload {self.test_data.file_path}: {str(e)}")
+            self.plan_mtime = None
+            return []
+
+    def run(self, test_packs=None, test_cases=None):
+        """Run the given packs (default: all with RunMode Yes), optionally limited to some AutomationTestIDs."""
+        self.check_for_changes()
+        begin_trace_run()
+        begin_screenshot_run()
+        test_packs = test_packs or list(self.test_data.get_test_packs()["TestPackName"])
+
+        errors = validate_plan(self.test_data, test_packs, self.base_url)
+        if errors:
+            return {"status": "plan_error", "errors": [str(error) for error in errors]}
+
+        browser = self.launch_browser()
+        screenshotter = Screenshotter(load_screenshot_policy(self.config))
+        test_results = []
+        with open_stub_server(self.config):  # API steps against the local stub server in [api_stub] replay mode
+            for test_pack_name in test_packs:
+                test_results.extend(run_test_pack(browser, self.test_data, test_pack_name, self.base_url, screenshotter, test_cases,
+                                                  self.context_pool))
+
+        flush_screenshots()
+        if test_results:
+            generate_html_report(test_results)
+        finish_trace_run()
+        passed = sum(1 for result in test_results if result["status"] == "Pass")
+        return {
+            "status": "ok",
+            "passed": passed,
+            "failed": len(test_results) - passed,
+            "results": [
+                {"test_case_id": str(result["test_case_id"]), "status": result["status"], "elapsed_time": result["elapsed_time"]}
+                for result in test_results
+            ],
+        }
+
+    def handle_request(self, request):
+        """Dispatch one client request."""
+        command = request.get("command")
+        if command == "run":
+            return self.run(request.get("packs"), request.get("test_cases"))
+        if command == "reload":
+            self.plan_mtime = None  # Force a fingerprint check even if the mtime did not move
+            return {"status": "ok", "reloaded": self.check_for_changes()}
+        if command == "status":
+            return {
+                "status": "ok",
+                "plan": self.test_data.file_path,
+                "loaded_parts": sorted(self.test_data.loaded_parts),
+                "parse_count": self.test_data.parse_count,
+                "browser_connected": self.browser is not None and self.browser.is_connected(),
+            }
+        if command == "shutdown":
+            self.running = False
+            return {"status": "ok"}
+        return {"status": "error", "error": f"Unknown command: {command}"}
+
+    def serve_forever(self):
+        """Accept one JSON request per connection; Playwright calls stay on this thread."""
+        self.launch_browser()
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind((self.host, self.port))
+        server.listen()
+        server.settimeout(self.poll_interval)
+        self.running = True
+        logger.info(f"Runner daemon listening on {self.host}:{self.port}, watching {self.test_data.file_path}")
+        try:
+            while self.running:
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    self.check_for_changes()
+                    continue
+                with connection:
+                    connection.settimeout(None)
+                    stream = connection.makefile("rw", encoding="utf-8")
+                    try:
+                        response = self.handle_request(json.loads(stream.readline()))
+                    except Exception as e:
+                        logger.error(f"Runner daemon request failed: {str(e)}")
+                        response = {"status": "error", "error": str(e)}
+                    stream.write(json.dumps(response) + "\n")
+                    stream.flush()
+        finally:
+            server.close()
+            self.close()
+
+    def close(self):
+        if self.context_pool is not None:
+            self.context_pool.close()
+        if self.browser is not None:
+            self.browser.close()
+        if self.playwright is not None:
+            self.playwright.stop()
+
+def send_request(request, host, port):
+    """Send one request to a running daemon and return its JSON response."""
+    with socket.create_connection((host, port)) as connection:
+        stream = connection.makefile("rw", encoding="utf-8")
+        stream.write(json.dumps(request) + "\n")
+        stream.flush()
+        return json.loads(stream.readline())
+
+def main():
+    parser = argparse.ArgumentParser(description="Runner daemon with a warm browser and incremental workbook reload.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("serve", help="Start the daemon")
+    run_parser = subparsers.add_parser("run", help="Run test packs or test cases on the daemon")
+    run_parser.add_argument("--pack", dest="packs", action="append", help="Test pack to run (repeatable)")
+    run_parser.add_argument("--case", dest="test_cases", action="append", help="AutomationTestID to run (repeatable)")
+    subparsers.add_parser("reload", help="Reload changed sheets now")
+    subparsers.add_parser("status", help="Show the daemon status")
+    subparsers.add_parser("stop", help="Stop the daemon")
+    args = parser.parse_args()
+
+    config = read_config()
+    if args.command == "serve":
+        RunnerDaemon(config).serve_forever()
+        return
+
+    host, port = daemon_address(config)
+    if args.command == "run":
+        request = {"command": "run", "packs": args.packs, "test_cases": args.test_cases}
+    elif args.command == "stop":
+        request = {"command": "shutdown"}
+    else:
+        request = {"command": args.command}
+    response = send_request(request, host, port)
+    print(json.dumps(response, indent=2))
+    if response.get("status") != "ok" or response.get("failed"):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
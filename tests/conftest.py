@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+PLAN_FILE_NAME = "plan.xlsx"
+
+# A small test plan: the Login pack has a merged ScriptId cell, a test case without steps (TC2),
+# a test case with RunMode No (TC3), orphan steps (TC9) and a duplicate ObjectName
+PLAN_SHEETS = {
+    "TestPacks": [
+        {"TestPackName": "Login", "RunMode": "Yes"},
+    ],
+    "ObjectMap": [
+        {"ObjectName": "UserName", "Application": "App", "ObjectType": "input", "ParentObjectLocator": "//input[@id='user']"},
+        {"ObjectName": "LoginButton", "Application": "App", "ObjectType": "button", "ParentObjectLocator": "#login", "ChildObjectLocator1": "button"},
+        {"ObjectName": "LoginButton", "Application": "App", "ObjectType": "button", "ParentObjectLocator": "#other"},
+    ],
+    "Login": [
+        {"AutomationTestID": "TC1", "RunMode": "Yes"},
+        {"AutomationTestID": "TC2", "RunMode": "Yes"},
+        {"AutomationTestID": "TC3", "RunMode": "No"},
+    ],
+    "Login - Scripts": [
+        {"ScriptId": "TC1", "StepName": "LaunchApplication", "StepDescription": "Open the app"},
+        {"ScriptId": None, "StepName": "SetInputInTextField", "StepDescription": "Enter the user", "ObjectName": "UserName", "TestData": "user1"},
+        {"ScriptId": None, "StepName": "ClickElement", "StepDescription": "Log in", "ObjectName": "LoginButton"},
+        {"ScriptId": "TC3", "StepName": "TimeDelay", "StepDescription": "Wait", "TestData": "1"},
+        {"ScriptId": "TC9", "StepName": "ClickElement", "StepDescription": "Orphan step", "ObjectName": "LoginButton"},
+    ],
+}
+
+def write_workbook(path, sheets):
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet_name, rows in sheets.items():
+            pd.DataFrame(rows).to_excel(writer, sheet_name=sheet_name, index=False)
+
+@pytest.fixture
+def plan_dir(tmp_path, monkeypatch):
+    """Empty working directory with a Testware/ folder; DataLoader and the caches resolve their paths from the cwd."""
+    (tmp_path / "Testware").mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+@pytest.fixture
+def plan_workbook(plan_dir):
+    """File name (under Testware/) of an .xlsx written from PLAN_SHEETS."""
+    write_workbook(plan_dir / "Testware" / PLAN_FILE_NAME, PLAN_SHEETS)
+    return PLAN_FILE_NAME
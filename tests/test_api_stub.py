@@ -0,0 +1,105 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from utils.api_client import ApiClient, ApiSettings
+from utils.api_stub import ExchangeRecorder, StubServer, StubSettings
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """The real API: echoes the method, path and body as JSON."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else None
+        content = json.dumps({"method": self.command, "path": self.path, "body": body}).encode("utf-8")
+        self.send_response(201 if self.command == "POST" else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_POST = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def api_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ApiHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def client():
+    client = ApiClient(ApiSettings(retries=0))
+    yield client
+    client.close()
+
+@pytest.fixture
+def stub_dir(tmp_path):
+    return str(tmp_path / "api_stub")
+
+def record_exchanges(client, api_url, stub_dir):
+    client.recorder = ExchangeRecorder(stub_dir)
+    client.request("GET", f"{api_url}/items?page=2")
+    client.request("POST", f"{api_url}/items", json={"name": "a"})
+    client.recorder = None
+
+@pytest.fixture
+def stub(stub_dir):
+    servers = []
+
+    def start(**settings):
+        server = StubServer(StubSettings(mode="replay", directory=stub_dir, **settings)).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+def test_replay_answers_recorded_requests_without_the_api(client, api_url, stub_dir, stub):
+    record_exchanges(client, api_url, stub_dir)
+    assert len(os.listdir(stub_dir)) == 2
+    server = stub()
+    client.route_to(server.url)
+
+    response = client.request("GET", f"{api_url}/items?page=2")
+    assert response.status_code == 200
+    assert response.json()["path"] == "/items?page=2"
+    response = client.request("POST", f"{api_url}/items", json={"name": "a"})
+    assert response.status_code == 201
+    assert response.json()["body"] == '{"name": "a"}'
+
+    response = client.request("POST", f"{api_url}/items", json={"name": "other"})
+    assert response.status_code == 201  # Same method and target, different body: the recorded exchange of that target
+    response = client.request("GET", f"{api_url}/missing")
+    assert response.status_code == 404
+    assert response.headers["X-Stub-Miss"] == "1"
+    assert (server.served, server.misses) == (4, 1)
+
+def test_requests_are_matched_by_origin(client, api_url, stub_dir, stub):
+    record_exchanges(client, api_url, stub_dir)
+    client.route_to(stub().url)
+    assert client.request("GET", "http://other.test/items?page=2").status_code == 404
+
+def test_injected_errors_and_latency_are_repeatable(client, api_url, stub_dir, stub):
+    record_exchanges(client, api_url, stub_dir)
+
+    def statuses(seed):
+        client.route_to(stub(error_rate=0.5, seed=seed, latency_jitter_ms=1).url)
+        return [client.request("GET", f"{api_url}/items?page=2").status_code for _ in range(20)]
+
+    first = statuses(7)
+    assert first == statuses(7)
+    assert set(first) == {200, 500}
+
+    client.route_to(stub(error_rate=1).url)
+    response = client.request("GET", f"{api_url}/items?page=2")
+    assert response.status_code == 500
+    assert response.json() == {"error": "injected by the API stub"}
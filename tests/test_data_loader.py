@@ -0,0 +1,63 @@
+import pandas as pd
+from conftest import PLAN_FILE_NAME, PLAN_SHEETS, write_workbook
+from utils.data_loader import DataLoader
+from utils.workbook_stream import TEST_STEP_COLUMNS
+
+def test_workbook_is_parsed_once_for_all_lookups(plan_workbook):
+    loader = DataLoader(plan_workbook, use_cache=False)
+    assert loader.parse_count == 1
+    for _ in range(3):
+        loader.get_test_packs()
+        loader.get_test_cases("Login")
+        loader.get_test_steps("Login", "TC1")
+        loader.get_object_record("UserName")
+    assert loader.parse_count == 1
+
+def test_lazy_loader_parses_only_what_is_used(plan_workbook):
+    loader = DataLoader(plan_workbook, use_cache=False, preload=False)
+    assert loader.parse_count == 0
+    assert list(loader.get_test_packs()["TestPackName"]) == ["Login"]
+    assert "Login - Scripts" not in loader.sheets
+    assert list(loader.get_test_cases("Login")["AutomationTestID"]) == ["TC1", "TC2"]
+
+def test_steps_are_grouped_by_forward_filled_script_id(plan_workbook):
+    loader = DataLoader(plan_workbook, use_cache=False)
+    steps = loader.get_test_steps("Login", " tc1 ")
+    assert [step["StepName"] for step in steps] == ["LaunchApplication", "SetInputInTextField", "ClickElement"]
+    assert {step["ScriptId"] for step in steps} == {"tc1"}
+    assert loader.get_test_steps("Login", "TC2") == []
+
+def test_step_index_flags_orphan_steps_and_test_cases_without_steps(plan_workbook, caplog):
+    loader = DataLoader(plan_workbook, use_cache=False)
+    assert loader.step_index_issues["Login"] == {"orphan_script_ids": ["tc9"], "cases_without_steps": ["tc2"]}
+    assert "ScriptId 'tc9' matches no test case" in caplog.text
+    assert "Test case 'tc2' in 'Login' has no steps" in caplog.text
+
+def comparable_steps(steps):
+    """Step rows with the columns the runner reads, blank cells as None (the in-memory loader keeps NaN)."""
+    return [{column: (None if pd.isna(step.get(column)) else step.get(column)) for column in TEST_STEP_COLUMNS} for step in steps]
+
+def test_streaming_loader_matches_the_in_memory_loader(plan_workbook):
+    in_memory = DataLoader(plan_workbook, use_cache=False)
+    streaming = DataLoader(plan_workbook, streaming=True)
+    assert list(streaming.get_test_packs()["TestPackName"]) == list(in_memory.get_test_packs()["TestPackName"])
+    test_case_ids = list(in_memory.get_test_cases("Login")["AutomationTestID"])
+    assert list(streaming.get_test_cases("Login")["AutomationTestID"]) == test_case_ids
+    expected = [(test_case_id, comparable_steps(steps)) for test_case_id, steps in in_memory.iter_test_steps("Login", test_case_ids)]
+    streamed = [(test_case_id, comparable_steps(steps)) for test_case_id, steps in streaming.iter_test_steps("Login", test_case_ids)]
+    assert streamed == expected
+    assert comparable_steps(streaming.get_test_steps("Login", "TC3")) == comparable_steps(in_memory.get_test_steps("Login", "TC3"))
+    assert streaming.get_object_record("LoginButton").selector == in_memory.get_object_record("LoginButton").selector
+    assert streaming.duplicate_objects == in_memory.duplicate_objects
+
+def test_streaming_keeps_test_case_order_when_steps_come_out_of_order(plan_dir):
+    sheets = dict(PLAN_SHEETS)
+    sheets["Login - Scripts"] = [
+        {"ScriptId": "TC2", "StepName": "ClickElement", "ObjectName": "LoginButton"},
+        {"ScriptId": "TC1", "StepName": "LaunchApplication"},
+        {"ScriptId": None, "StepName": "ClickElement", "ObjectName": "LoginButton"},
+    ]
+    write_workbook(plan_dir / "Testware" / PLAN_FILE_NAME, sheets)
+    streaming = DataLoader(PLAN_FILE_NAME, streaming=True)
+    order = [(test_case_id, len(steps)) for test_case_id, steps in streaming.iter_test_steps("Login", ["TC1", "TC2"])]
+    assert order == [("TC1", 2), ("TC2", 1)]
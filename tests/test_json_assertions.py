@@ -0,0 +1,63 @@
+import pytest
+from utils.json_assertions import check_assertions, compile_assertions, parse_path
+
+DOCUMENT = {
+    "data": {"items": [{"id": 1, "price": 12.5, "tags": ["new"]}, {"id": 2, "price": 30, "tags": []}]},
+    "meta": {"id": "page-1", "total": 2},
+    "status": "ok",
+}
+
+def results(*expected_responses):
+    return [passed for passed, _ in check_assertions(DOCUMENT, compile_assertions(list(expected_responses)))]
+
+def test_path_tokens():
+    assert parse_path("status") == (("descend", "status"),)
+    assert parse_path("$.data.items[0].id") == (("key", "data"), ("key", "items"), ("index", 0), ("key", "id"))
+    assert parse_path("$.items[*]..id") == (("key", "items"), ("wildcard",), ("descend", "id"))
+    assert parse_path("$['odd key'][-1]") == (("key", "odd key"), ("index", -1))
+    with pytest.raises(ValueError):
+        parse_path("$.items[?(@.id)]")
+
+def test_paths_select_the_documented_values():
+    assert results(
+        {"path": "$.data.items[0].id", "value": 1},
+        {"path": "$.data.items[-1].price", "value": 30},
+        {"path": "$.data.items[*].price", "value": 10, "operand": "gt", "match": "all"},
+        {"path": "$..id", "value": "page-1"},
+        {"key": "total", "value": 2},
+        {"path": "$", "value": {"type": "object", "required": ["data", "status"]}, "operand": "schema"},
+    ) == [True] * 6
+
+def test_match_all_and_missing_paths_fail():
+    assert results(
+        {"path": "$.data.items[*].price", "value": 20, "operand": "gt", "match": "all"},
+        {"path": "$.data.missing", "operand": "exists"},
+        {"key": "missing", "value": None},
+    ) == [False, False, False]
+
+@pytest.mark.parametrize("expected_response, passed", [
+    ({"path": "$.status", "value": "ok", "operand": "notequals"}, False),
+    ({"path": "$.status", "value": "o", "operand": "contains"}, True),
+    ({"path": "$.meta.id", "value": "^page-\\d+$", "operand": "regex"}, True),
+    ({"path": "$.meta.total", "value": 2, "operand": "gte"}, True),
+    ({"path": "$.meta.total", "value": 2, "operand": "lt"}, False),
+    ({"path": "$.data.items", "value": 2, "operand": "length"}, True),
+    ({"path": "$.data.items[0]", "value": {"type": "object", "required": ["id", "price"]}, "operand": "schema"}, True),
+    ({"path": "$.data.items[0].tags", "value": {"type": "array", "items": {"type": "integer"}}, "operand": "schema"}, False),
+])
+def test_operands(expected_response, passed):
+    assert results(expected_response) == [passed]
+
+def test_failures_explain_what_was_expected():
+    (passed, message), = check_assertions(DOCUMENT, compile_assertions([{"path": "$.data.missing", "value": 1}]))
+    assert not passed
+    assert message.strip() == "Validation failed: $.data.missing does not equal 1 (not found)"
+
+@pytest.mark.parametrize("expected_response", [
+    {"value": 1},
+    {"path": "$.status", "operand": "near"},
+    {"path": "$.items[", "value": 1},
+])
+def test_bad_assertions_are_rejected_when_compiled(expected_response):
+    with pytest.raises(ValueError):
+        compile_assertions([expected_response])
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import pytest
+from utils.json_assertions import compile_assertions
+from utils.json_stream import BodyOptions, body_options, check_streamable, parity_errors, read_body, stream_results
+
+BODY = json.dumps({
+    "items": [{"id": index, "name": f"item \"{index}\" é", "price": index * 1.5, "tags": ["a", {"id": -index}]} for index in range(5)],
+    "page": {"id": "p1", "next": None, "empty": {}, "flags": [True, False]},
+    "id": 0,
+})
+
+ASSERTIONS = compile_assertions([
+    {"key": "id", "value": 3},
+    {"path": "$.items[2].name", "value": 'item "2" é'},
+    {"path": "$.items[*].price", "value": 0, "operand": "gte", "match": "all"},
+    {"path": "$..id", "value": -4},
+    {"path": "$.items[1].tags", "value": 2, "operand": "length"},
+    {"path": "$.page", "value": {"type": "object", "required": ["id", "next"]}, "operand": "schema"},
+    {"path": "$.page.empty", "operand": "exists"},
+    {"path": "$.page.flags[1]", "value": False},
+    {"path": "$.page.missing", "value": 1},
+])
+
+class ChunkedResponse:
+    """The parts of a requests response that read_body uses."""
+
+    def __init__(self, text):
+        self.content = text.encode("utf-8")
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def json(self):
+        return json.loads(self.content)
+
+def test_streamed_results_match_the_in_memory_check_for_any_chunk_size():
+    assert parity_errors(BODY, ASSERTIONS, chunk_sizes=(1, 2, 3, 7, 64, len(BODY))) == []
+    assert [passed for passed, _ in stream_results(BODY, ASSERTIONS, 5)] == [True] * 8 + [False]
+
+def test_read_body_streams_bytes_split_inside_characters():
+    streamed = read_body(ChunkedResponse(BODY), ASSERTIONS, BodyOptions(stream=True, hash="sha256"), chunk_size=3)
+    in_memory = read_body(ChunkedResponse(BODY), ASSERTIONS, BodyOptions(hash="sha256"))
+    assert streamed == in_memory
+    assert streamed[1] == len(BODY.encode("utf-8"))
+    assert streamed[2] == hashlib.sha256(BODY.encode("utf-8")).hexdigest()
+
+def test_max_bytes_fails_the_body_in_both_modes():
+    for stream in (True, False):
+        with pytest.raises(ValueError, match="max_bytes"):
+            read_body(ChunkedResponse(BODY), ASSERTIONS, BodyOptions(stream=stream, max_bytes=100), chunk_size=16)
+
+def test_negative_indices_are_rejected_for_streaming():
+    check_streamable(compile_assertions([{"path": "$.items[1]", "value": 1}]))
+    with pytest.raises(ValueError, match="negative index"):
+        check_streamable(compile_assertions([{"path": "$.items[-1]", "value": 1}]))
+
+def test_body_options():
+    assert body_options({}) == BodyOptions()
+    assert body_options({"stream": True, "max_bytes": "1024", "expected_hash": "ABC"}) == BodyOptions(True, 1024, "sha256", "abc")
+    with pytest.raises(ValueError, match="Unsupported body hash"):
+        body_options({"hash": "crc32"})
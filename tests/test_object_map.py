@@ -0,0 +1,32 @@
+from utils.data_loader import DataLoader
+from utils.object_map import build_object_index
+
+def test_index_resolves_chained_selectors_and_kinds():
+    index, duplicates = build_object_index([
+        {"ObjectName": " UserName ", "ParentObjectLocator": "//input[@id='user']"},
+        {"ObjectName": "Menu", "ParentObjectLocator": "#menu", "ChildObjectLocator1": "li", "ChildObjectLocator3": "a"},
+        {"ObjectName": None, "ParentObjectLocator": "#ignored"},
+    ])
+    assert duplicates == []
+    assert sorted(index) == ["Menu", "UserName"]
+    assert index["UserName"].selector == "//input[@id='user']"
+    assert index["UserName"].kind == "xpath"
+    assert index["Menu"].selector == "#menu >> li"  # ChildObjectLocator3 is skipped without ChildObjectLocator2
+    assert index["Menu"].kind == "css"
+    assert index["Menu"].get("child_locator2", "NA") == "NA"
+
+def test_duplicate_object_names_are_reported_and_the_first_wins(caplog):
+    index, duplicates = build_object_index([
+        {"ObjectName": "Button", "ParentObjectLocator": "#first"},
+        {"ObjectName": "Button", "ParentObjectLocator": "#second"},
+        {"ObjectName": "Button", "ParentObjectLocator": "#third"},
+    ], sheet_name="ObjectMap")
+    assert duplicates == ["Button"]
+    assert index["Button"].locator == "#first"
+    assert "Duplicate ObjectName 'Button' found 3 times" in caplog.text
+
+def test_loader_looks_up_objects_through_the_index(plan_workbook):
+    loader = DataLoader(plan_workbook, use_cache=False)
+    assert loader.duplicate_objects == ["LoginButton"]
+    assert loader.get_object_record("LoginButton").selector == "#login >> button"
+    assert loader.get_object_record("Missing") is None
@@ -0,0 +1,46 @@
+import os
+import pandas as pd
+from utils import plan_cache
+from utils.data_loader import DataLoader
+from utils.plan_cache import PlanCache
+
+def write_plan(path, content):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+def test_store_then_load_hits_and_a_new_workbook_misses(plan_dir):
+    path = os.path.join("Testware", "plan.json")
+    write_plan(path, "{}")
+    cache = PlanCache(path, "cache")
+    assert cache.load("ObjectMap") is None
+    cache.store("ObjectMap", {"rows": 1})
+    assert PlanCache(path, "cache").load("ObjectMap") == {"rows": 1}
+
+    write_plan(path, '{"TestPacks": []}')
+    assert PlanCache(path, "cache").load("ObjectMap") is None
+
+def test_loader_version_bump_invalidates_the_cache(plan_dir, monkeypatch):
+    path = os.path.join("Testware", "plan.json")
+    write_plan(path, "{}")
+    PlanCache(path, "cache").store("TestPacks", ["Login"])
+    monkeypatch.setattr(plan_cache, "LOADER_VERSION", "next")
+    assert PlanCache(path, "cache").load("TestPacks") is None
+
+def test_new_entries_keep_only_the_most_recently_used(plan_dir):
+    path = os.path.join("Testware", "plan.json")
+    keys = []
+    for version in range(plan_cache.KEPT_ENTRIES + 2):
+        write_plan(path, str(version))
+        cache = PlanCache(path, "cache")
+        cache.store("TestPacks", version)
+        os.utime(cache.entry_dir, (version, version))  # Older versions were used longer ago
+        keys.append(cache.key)
+    assert sorted(os.listdir(cache.workbook_dir)) == sorted(keys[-plan_cache.KEPT_ENTRIES:])
+
+def test_loader_reuses_the_cached_plan(plan_workbook):
+    first = DataLoader(plan_workbook)
+    assert first.parse_count == 1
+    second = DataLoader(plan_workbook)
+    assert second.parse_count == 0
+    assert pd.DataFrame(second.get_test_steps("Login", "TC1")).equals(pd.DataFrame(first.get_test_steps("Login", "TC1")))
+    assert second.get_object_record("UserName").selector == "//input[@id='user']"
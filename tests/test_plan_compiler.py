@@ -0,0 +1,70 @@
+import json
+import pytest
+from utils.data_loader import DataLoader
+
+# The compiler binds handlers from actions.base_actions, which imports the GenAI evaluator's dependencies
+plan_compiler = pytest.importorskip("utils.plan_compiler", reason="needs the utils.ai_evaluator dependencies")
+
+BASE_URL = "http://app.test/"
+
+@pytest.fixture
+def test_data(plan_workbook):
+    return DataLoader(plan_workbook, use_cache=False)
+
+def compile_row(test_data, **row):
+    return plan_compiler.compile_step(test_data, "Login", 1, row, BASE_URL)
+
+def test_steps_compile_to_bound_handlers_and_typed_inputs(test_data):
+    step, error = compile_row(test_data, StepName="SetInputInTextField", ObjectName="UserName", TestData="user1")
+    assert error is None
+    assert step.action == "setinputintextfield"
+    assert step.selector.selector == "//input[@id='user']"
+    assert step.handler is not None
+
+    step, error = compile_row(test_data, StepName="LaunchApplication")
+    assert error is None and step.selector == BASE_URL
+
+    step, error = compile_row(test_data, StepName="TimeDelay", TestData="2.5")
+    assert error is None and step.input_value == 2.5
+
+def test_selector_like_object_names_fall_back_to_raw_locators(test_data):
+    for object_name in ("css=button.primary", "//div[@id='x']", "#login", "div.menu > a", "text=Sign in"):
+        step, error = compile_row(test_data, StepName="ClickElement", ObjectName=object_name)
+        assert error is None, object_name
+        assert step.selector == {"locator": object_name}
+
+@pytest.mark.parametrize("row, message", [
+    ({"StepName": None}, "StepName is empty"),
+    ({"StepName": "Teleport"}, "Unsupported action: Teleport"),
+    ({"StepName": "ClickElement", "ObjectName": "LogniButton"}, "Unknown ObjectName 'LogniButton'"),
+    ({"StepName": "TimeDelay", "TestData": "soon"}, "timedelay needs a numeric TestData value"),
+    ({"StepName": "ValidateAPIResponse", "TestData": "{not json"}, "Invalid JSON input for API validation"),
+    ({"StepName": "ValidateAPIResponse", "TestData": '{"method": "GET"}'}, "must be a JSON object with a 'url'"),
+    ({"StepName": "ValidateAPIResponse", "TestData": '{"url": "http://api.test", "method": "TRACE"}'}, "Unsupported HTTP method: TRACE"),
+    ({"StepName": "ValidateAPIResponse", "TestData": '{"url": "http://api.test", "expected_response": [{"path": "$.a", "operand": "near"}]}'},
+     "Unsupported response validation operator"),
+    ({"StepName": "ValidateAPIResponse", "TestData": '{"url": "http://api.test", "stream": true, "expected_response": [{"path": "$.items[-1]"}]}'},
+     "negative index"),
+])
+def test_compile_errors(test_data, row, message):
+    step, error = compile_row(test_data, **row)
+    assert step is None
+    assert message in error
+
+def test_batch_requests_are_checked_like_single_api_steps(test_data):
+    with open("batch.jsonl", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"url": "http://api.test/a"}) + "\n")
+        f.write(json.dumps({"url": "http://api.test/b", "method": "HEAD"}) + "\n")
+    step, error = compile_row(test_data, StepName="ValidateAPIBatch", TestData="batch.jsonl")
+    assert step is None
+    assert "batch.jsonl request 2: Unsupported HTTP method: HEAD" in error
+
+def test_validate_plan_reports_every_error(test_data):
+    assert plan_compiler.validate_plan(test_data, ["Login"], BASE_URL) == []
+
+    test_data.step_index["Login"]["tc1"][1]["StepName"] = "Teleport"
+    test_data.step_index["Login"]["tc1"][2]["ObjectName"] = "Nowhere"
+    errors = plan_compiler.validate_plan(test_data, ["Login", "Missing"], BASE_URL)
+    assert [(error.test_pack_name, error.test_case_id, error.step_no) for error in errors] == [
+        ("Login", "TC1", 2), ("Login", "TC1", 3), ("Missing", "-", None)]
+    assert str(errors[0]) == "Login / TC1 / step 2: Unsupported action: Teleport"
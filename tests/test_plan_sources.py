@@ -0,0 +1,55 @@
+import json
+import pandas as pd
+import pytest
+from conftest import PLAN_FILE_NAME, PLAN_SHEETS
+from utils.data_loader import DataLoader
+from utils.plan_sources import detect_plan_format, export_plan, open_plan_source
+
+def plan_summary(loader):
+    """What the runner reads from a plan, with blank cells as None so every format compares equal."""
+    def cell(value):
+        return None if pd.isna(value) else str(value)
+    test_case_ids = list(loader.get_test_cases("Login")["AutomationTestID"])
+    return {
+        "test_packs": list(loader.get_test_packs()["TestPackName"]),
+        "test_cases": test_case_ids,
+        "steps": {test_case_id: [(cell(step["StepName"]), cell(step.get("ObjectName")), cell(step.get("TestData")))
+                                 for step in loader.get_test_steps("Login", test_case_id)]
+                  for test_case_id in test_case_ids + ["TC3"]},
+        "objects": {name: loader.get_object_record(name).selector for name in ("UserName", "LoginButton")},
+    }
+
+@pytest.mark.parametrize("plan_format, destination", [
+    ("json", "plan.json"),
+    ("yaml", "plan.yaml"),
+    ("csv", "plan_csv"),
+    ("parquet", "plan_parquet"),
+])
+def test_exported_plan_loads_like_the_workbook(plan_workbook, plan_format, destination):
+    if plan_format == "parquet":
+        pytest.importorskip("pyarrow")
+    export_plan(f"Testware/{plan_workbook}", f"Testware/{destination}", plan_format)
+    exported = DataLoader(destination, use_cache=False)
+    assert exported.source.format_name == plan_format
+    assert plan_summary(exported) == plan_summary(DataLoader(plan_workbook, use_cache=False))
+
+def test_json_plan_written_by_hand(plan_dir):
+    with open("Testware/plan.json", "w", encoding="utf-8") as f:
+        json.dump(PLAN_SHEETS, f)
+    loader = DataLoader("plan.json", use_cache=False)
+    assert [step["StepName"] for step in loader.get_test_steps("Login", "TC1")] == ["LaunchApplication", "SetInputInTextField", "ClickElement"]
+
+def test_format_detection(plan_dir):
+    (plan_dir / "Testware" / "csv_plan").mkdir()
+    (plan_dir / "Testware" / "csv_plan" / "TestPacks.csv").write_text("TestPackName,RunMode\n")
+    assert detect_plan_format("Testware/csv_plan") == "csv"
+    assert detect_plan_format(f"Testware/{PLAN_FILE_NAME}") == "xlsx"
+    assert detect_plan_format("plan.YML") == "yaml"
+    with pytest.raises(ValueError, match="Unsupported test plan file"):
+        detect_plan_format("plan.txt")
+    with pytest.raises(ValueError, match="Unsupported planFormat"):
+        open_plan_source("plan.json", "toml")
+
+def test_export_rejects_unknown_formats(plan_workbook):
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        export_plan(f"Testware/{plan_workbook}", "Testware/plan.toml", "toml")
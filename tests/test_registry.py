@@ -0,0 +1,70 @@
+import configparser
+import pytest
+from actions import registry
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    """Register into fresh tables so the tests never change the real actions."""
+    monkeypatch.setattr(registry, "ACTIONS", {})
+    monkeypatch.setattr(registry, "ASYNC_ACTIONS", {})
+
+def test_decorator_registers_case_insensitively():
+    @registry.action("ClickSave", expected="Should click {selector}", report=False)
+    def click_save(base, call):
+        return "clicked"
+
+    spec = registry.get_action("clicksave")
+    assert spec.handler is click_save
+    assert spec.expected == "Should click {selector}"
+    assert spec.report is False
+    assert registry.get_action("CLICKSAVE") is spec
+    assert registry.get_action("unknown") is None
+
+def test_later_registrations_override_with_a_warning(caplog):
+    registry.register_action("clicksave", lambda base, call: "first")
+    second = registry.register_action("clicksave", lambda base, call: "second")
+    assert registry.get_action("clicksave").handler is second
+    assert "registered more than once" in caplog.text
+
+def test_async_actions_default_to_the_sync_expected_template():
+    registry.register_action("clicksave", lambda base, call: None, expected="Should click {selector}")
+
+    @registry.async_action("ClickSave")
+    async def click_save(base, call):
+        return "clicked"
+
+    assert registry.get_async_action("clicksave").handler is click_save
+    assert registry.get_async_action("clicksave").expected == "Should click {selector}"
+
+def test_configured_plugin_modules_register_on_import(tmp_path, monkeypatch):
+    (tmp_path / "shop_actions.py").write_text(
+        "from actions.registry import action\n"
+        "@action('addtobasket')\n"
+        "def add_to_basket(base, call):\n"
+        "    return 'added'\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(registry, "entry_points", lambda: {})
+    config = configparser.ConfigParser()
+    config.read_dict({"playwright": {"actionPlugins": " shop_actions , "}})
+    registry.load_configured_action_plugins(config)
+    assert registry.get_action("AddToBasket").handler(None, None) == "added"
+
+def test_installed_entry_point_plugins_are_loaded(monkeypatch):
+    loaded = []
+
+    class EntryPoint:
+        name = "shop"
+        value = "shop_actions"
+
+        def load(self):
+            loaded.append(self.name)
+            registry.register_action("addtobasket", lambda base, call: "added")
+
+    class EntryPoints:
+        def select(self, group):
+            return [EntryPoint()] if group == registry.PLUGIN_ENTRY_POINT_GROUP else []
+
+    monkeypatch.setattr(registry, "entry_points", EntryPoints)
+    registry.load_action_plugins()
+    assert loaded == ["shop"]
+    assert registry.get_action("addtobasket") is not None
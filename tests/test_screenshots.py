@@ -0,0 +1,52 @@
+import hashlib
+import os
+import pytest
+from utils.screenshots import ScreenshotPolicy, ScreenshotStore, ScreenshotWriter, Screenshotter
+
+@pytest.fixture
+def writer():
+    writer = ScreenshotWriter()
+    yield writer
+    writer.close()
+
+def stored_files(directory):
+    return sorted(name for name in os.listdir(directory) if name != "manifest.json")
+
+def test_identical_frames_are_stored_once(tmp_path, writer):
+    store = ScreenshotStore(str(tmp_path), writer)
+    first = store.put("Login/TC1/1", b"frame", "png")
+    second = store.put("Login/TC1/2", b"frame", "png")
+    third = store.put("Login/TC2/1", b"other", "png")
+    writer.flush()
+    assert first == second == f"{hashlib.sha256(b'frame').hexdigest()}.png"
+    assert third != first
+    assert stored_files(tmp_path) == sorted([first, third])
+    assert (tmp_path / first).read_bytes() == b"frame"
+    assert store.resolve("Login/TC1/2") == store.file_path(first)
+    assert store.resolve("Login/TC1/3") is None
+
+def test_screenshotter_keys_captures_by_pack_test_case_and_step(tmp_path, writer):
+    screenshotter = Screenshotter(ScreenshotPolicy(mode="on_failure", image_type="jpeg"), ScreenshotStore(str(tmp_path), writer))
+    screenshotter.begin_test_case("Login", "TC1")
+    assert screenshotter.record(3, b"frame") == "Login/TC1/3"
+    assert screenshotter.store.manifest["Login/TC1/3"].endswith(".jpg")
+    assert screenshotter.policy.should_capture(3, 0) is False
+    assert screenshotter.policy.should_capture(3, 1) is True
+
+def test_each_run_starts_a_new_manifest_and_prunes_unreferenced_files(tmp_path, writer):
+    store = ScreenshotStore(str(tmp_path), writer)
+    old = store.put("Login/TC1/1", b"old frame", "png")
+    kept = store.put("Login/TC1/2", b"kept frame", "png")
+    writer.flush()
+    store.save_manifest()
+    (tmp_path / "legacy_name.png").write_bytes(b"not from the store")
+
+    next_run = ScreenshotStore(str(tmp_path), writer)
+    assert next_run.manifest == {}
+    next_run.put("Login/TC1/1", b"kept frame", "png")
+    writer.flush()
+    assert next_run.prune() == 1
+    assert stored_files(tmp_path) == sorted([kept, "legacy_name.png"])
+
+    next_run.begin_run()
+    assert next_run.manifest == {}
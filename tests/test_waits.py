@@ -0,0 +1,36 @@
+import pytest
+from utils.waits import MIN_SAMPLES, LatencyHistory, WaitStrategy
+
+@pytest.fixture
+def history(tmp_path):
+    return LatencyHistory(str(tmp_path / "action_latency.json"))
+
+def record(history, action, seconds, count=MIN_SAMPLES):
+    for _ in range(count):
+        history.record(action, seconds)
+
+def test_default_timeout_until_enough_samples(history):
+    waits = WaitStrategy(adaptive=True, margin=3.0, min_timeout=2000, history=history)
+    record(history, "clickelement", 1.0, MIN_SAMPLES - 1)
+    assert waits.timeout("clickelement", 30000) == 30000
+    history.record("clickelement", 1.0)
+    assert waits.timeout("clickelement", 30000) == 3000  # p99 1 s x margin 3
+
+def test_adaptive_timeout_is_capped_at_the_default_and_floored_at_the_minimum(history):
+    waits = WaitStrategy(adaptive=True, margin=3.0, min_timeout=2000, history=history)
+    record(history, "slow", 20.0)
+    record(history, "fast", 0.05)
+    assert waits.timeout("slow", 30000) == 30000
+    assert waits.timeout("fast", 30000) == 2000
+
+def test_fixed_timeouts_ignore_the_history(history):
+    record(history, "clickelement", 1.0)
+    assert WaitStrategy(adaptive=False, history=history).timeout("clickelement", 30000) == 30000
+
+def test_history_is_merged_into_the_file_on_save(history):
+    record(history, "clickelement", 0.5)
+    history.save()
+    other_process = LatencyHistory(history.path)
+    record(other_process, "clickelement", 0.7, 1)
+    other_process.save()
+    assert LatencyHistory.read(history.path)["clickelement"] == [0.5] * MIN_SAMPLES + [0.7]
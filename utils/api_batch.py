@@ -0,0 +1,90 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Requests in flight per batch, unless the step's TestData sets "concurrency"
+DEFAULT_BATCH_CONCURRENCY = 32
+# Sheet cells holding JSON rather than text
+JSON_COLUMNS = ("headers", "payload", "expected_response")
+
+def parse_batch_input(input_value):
+    """TestData of a ValidateAPIBatch step: a file path, or {"file", "sheet", "concurrency", "perHost"}."""
+    if isinstance(input_value, dict):
+        batch = dict(input_value)
+    else:
+        text = str(input_value).strip() if input_value is not None else ""
+        batch = json.loads(text) if text.startswith("{") else {"file": text}
+    if not batch.get("file"):
+        raise ValueError("API batch input must name a 'file' (.jsonl of request specs, or a workbook with a 'sheet')")
+    if not os.path.exists(batch["file"]):
+        raise ValueError(f"API batch file not found: {batch['file']}")
+    return batch
+
+def spec_from_row(row):
+    """Request spec (the validateapiresponse JSON shape) from a sheet row; JSON cells are parsed."""
+    spec = {}
+    for column, value in row.items():
+        if value is None or (not isinstance(value, str) and pd.isna(value)) or str(value).strip() == "":
+            continue
+        key = str(column).strip()
+        spec[key] = json.loads(value) if key in JSON_COLUMNS and isinstance(value, str) else value
+    if "expected_status" in spec:
+        spec["expected_status"] = int(float(spec["expected_status"]))
+    return spec
+
+def load_api_specs(file_path, sheet=None):
+    """Request specs of a batch: one JSON object per line of a .jsonl file, or one row per request of a workbook sheet."""
+    if file_path.lower().endswith((".xlsx", ".xlsm", ".xls")):
+        frame = pd.read_excel(file_path, sheet_name=sheet or 0, dtype=object)
+        return [spec_from_row(row) for row in frame.to_dict(orient="records")]
+    specs = []
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                specs.append(json.loads(line))
+            except ValueError as e:
+                raise ValueError(f"{file_path} line {line_no}: invalid JSON ({str(e)})")
+    return specs
+
+def origin(url):
+    parts = urlsplit(url or "")
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+def run_api_batch(validate, specs, concurrency=DEFAULT_BATCH_CONCURRENCY, per_host=10, cookies_by_origin=None):
+    """Run validate(spec, cookies) -> (isOK, actual_result) for every spec on a bounded thread pool,
+    at most per_host at a time per host; returns one sub-step dict per spec, in spec order."""
+    cookies_by_origin = cookies_by_origin or {}
+    host_slots = {host: threading.BoundedSemaphore(per_host) for host in {origin(spec.get("url")) for spec in specs}}
+
+    def run_one(index, spec):
+        name = spec.get("name") or f"{spec.get('method', 'GET').upper()} {spec.get('url')}"
+        host = origin(spec.get("url"))
+        with host_slots[host]:
+            start_time = time.time()
+            try:
+                isOK, actual_result = validate(spec, cookies_by_origin.get(host))
+            except Exception as e:
+                isOK, actual_result = 1, f"Error: {str(e)}"
+            elapsed = round(time.time() - start_time, 3)
+        return {"sub_step_no": index, "name": name, "actual_result": actual_result,
+                "status": "Pass" if isOK == 0 else "Fail", "elapsed_time": elapsed}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(specs) or 1)), thread_name_prefix="api-batch") as pool:
+        futures = [pool.submit(run_one, index, spec) for index, spec in enumerate(specs, start=1)]
+        return [future.result() for future in futures]
+
+def batch_summary(sub_steps, elapsed):
+    """(isOK, actual result) of a whole batch."""
+    failed = sum(1 for sub_step in sub_steps if sub_step["status"] != "Pass")
+    message = f"{len(sub_steps)} API calls in {elapsed:.2f}s: {len(sub_steps) - failed} passed, {failed} failed"
+    return (1 if failed else 0), message
@@ -0,0 +1,111 @@
+import atexit
+import configparser
+import logging
+import threading
+from typing import NamedTuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.api_stub import ORIGIN_HEADER, request_target
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# HTTP methods of API steps
+API_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+class ApiSettings(NamedTuple):
+    connect_timeout: float = 5.0  # Seconds
+    read_timeout: float = 30.0  # Seconds
+    retries: int = 2  # Failed connections, and retry_statuses on idempotent methods
+    retry_backoff: float = 0.5  # Seconds, doubled on each retry
+    retry_statuses: tuple = (502, 503, 504)
+    pool_size: int = 10  # Connections kept open per host
+    share_browser_cookies: bool = False  # Send the browser context's cookies, so API steps reuse the UI's login
+
+def load_api_settings(config):
+    """Read the [api] section of config.ini."""
+    statuses = config.get("api", "retryStatuses", fallback="502, 503, 504")
+    return ApiSettings(
+        connect_timeout=config.getfloat("api", "connectTimeout", fallback=5.0),
+        read_timeout=config.getfloat("api", "readTimeout", fallback=30.0),
+        retries=max(0, config.getint("api", "retries", fallback=2)),
+        retry_backoff=config.getfloat("api", "retryBackoff", fallback=0.5),
+        retry_statuses=tuple(int(status) for status in statuses.split(",") if status.strip()),
+        pool_size=max(1, config.getint("api", "poolSize", fallback=10)),
+        share_browser_cookies=config.getboolean("api", "shareBrowserCookies", fallback=False),
+    )
+
+class ApiClient:
+    """One keep-alive session per host for the whole run, with timeouts and retries from ApiSettings."""
+
+    def __init__(self, settings=None):
+        self.settings = settings or ApiSettings()
+        self.sessions = {}  # scheme://host:port -> requests.Session
+        self.lock = threading.Lock()
+        self.stub_url = None  # Local stub server answering every request (API stub replay mode)
+        self.recorder = None  # Saves every response as a recorded exchange (API stub record mode)
+
+    def route_to(self, stub_url):
+        """Send requests to the stub server at stub_url (None: back to their own hosts)."""
+        self.stub_url = stub_url.rstrip("/") if stub_url else None
+
+    def new_session(self):
+        retry = Retry(
+            total=self.settings.retries,
+            backoff_factor=self.settings.retry_backoff,
+            status_forcelist=self.settings.retry_statuses,
+            raise_on_status=False,  # Hand the last response to the step, which reports its status
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.settings.pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def session_for(self, url):
+        parts = urlsplit(url)
+        if not parts.scheme or not parts.netloc:
+            raise ValueError(f"Invalid API URL: {url}")
+        host = f"{parts.scheme}://{parts.netloc}".lower()
+        with self.lock:
+            if host not in self.sessions:
+                self.sessions[host] = self.new_session()
+            return self.sessions[host]
+
+    def request(self, method, url, **kwargs):
+        """Send a request on the host's pooled session; cookies are passed per request, never stored in the session."""
+        kwargs.setdefault("timeout", (self.settings.connect_timeout, self.settings.read_timeout))
+        if self.stub_url:
+            parts = urlsplit(url)
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), ORIGIN_HEADER: f"{parts.scheme}://{parts.netloc}"}
+            url = self.stub_url + request_target(url)
+        response = self.session_for(url).request(method.upper(), url, **kwargs)
+        if self.recorder is not None:
+            self.recorder.record(response)
+        return response
+
+    def close(self):
+        with self.lock:
+            sessions, self.sessions = self.sessions, {}
+        for session in sessions.values():
+            session.close()
+
+def browser_cookies(cookies):
+    """requests cookies from Playwright's context.cookies(url) result."""
+    return {cookie["name"]: cookie["value"] for cookie in cookies}
+
+# API client from config.ini, one per process and closed at exit
+_client = None
+_client_lock = threading.Lock()
+
+def get_api_client(config_path="config/config.ini"):
+    global _client
+    with _client_lock:
+        if _client is None:
+            config = configparser.ConfigParser()
+            config.read(config_path)
+            _client = ApiClient(load_api_settings(config))
+            atexit.register(_client.close)
+        return _client
@@ -0,0 +1,76 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.waits import percentile
+
+# Upper bounds (ms) of the latency histogram buckets shown in the report; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# Budget keys of a step's "latency" object and the profile value each one limits
+BUDGET_KEYS = {"max_ms": "max_ms", "p50_ms": "p50_ms", "p95_ms": "p95_ms", "p99_ms": "p99_ms"}
+
+def load_options(input_data):
+    """Latency budget and load spec of a validateapiresponse input: "latency", "repeat" and "concurrency"."""
+    latency = input_data.get("latency") or {}
+    unknown = set(latency) - set(BUDGET_KEYS)
+    if unknown:
+        raise ValueError(f"Unsupported latency budget keys: {', '.join(sorted(unknown))}. Supported: {', '.join(BUDGET_KEYS)}")
+    repeat = int(input_data.get("repeat", 1))
+    concurrency = int(input_data.get("concurrency", 1))
+    if repeat < 1 or concurrency < 1:
+        raise ValueError("API load 'repeat' and 'concurrency' must be at least 1")
+    return {"latency": {key: float(value) for key, value in latency.items()}, "repeat": repeat, "concurrency": concurrency}
+
+def run_load(call, repeat, concurrency):
+    """Call call() -> (isOK, actual_result) repeat times, concurrency at a time; returns ([(seconds, isOK, result)], wall seconds)."""
+    def timed():
+        start_time = time.perf_counter()
+        try:
+            isOK, actual_result = call()
+        except Exception as e:
+            isOK, actual_result = 1, f"Error: {str(e)}"
+        return time.perf_counter() - start_time, isOK, actual_result
+
+    start_time = time.perf_counter()
+    if repeat == 1:
+        samples = [timed()]
+    else:
+        with ThreadPoolExecutor(max_workers=min(concurrency, repeat), thread_name_prefix="api-load") as pool:
+            samples = list(pool.map(lambda _: timed(), range(repeat)))
+    return samples, time.perf_counter() - start_time
+
+def histogram(latencies_ms):
+    """[(bucket label, count)] over HISTOGRAM_BUCKETS_MS, without empty buckets at either end."""
+    counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for latency in latencies_ms:
+        counts[next((i for i, bound in enumerate(HISTOGRAM_BUCKETS_MS) if latency <= bound), len(HISTOGRAM_BUCKETS_MS))] += 1
+    labels = [f"<= {bound} ms" for bound in HISTOGRAM_BUCKETS_MS] + [f"> {HISTOGRAM_BUCKETS_MS[-1]} ms"]
+    used = [i for i, count in enumerate(counts) if count]
+    return [(labels[i], counts[i]) for i in range(used[0], used[-1] + 1)] if used else []
+
+def latency_profile(samples, wall_seconds, budget):
+    """Latency statistics, throughput and budget violations of a load run (for the step result and the report)."""
+    latencies_ms = [seconds * 1000 for seconds, _, _ in samples]
+    profile = {
+        "requests": len(samples),
+        "failed": sum(1 for _, isOK, _ in samples if isOK != 0),
+        "min_ms": round(min(latencies_ms), 1),
+        "p50_ms": round(percentile(latencies_ms, 0.50), 1),
+        "p95_ms": round(percentile(latencies_ms, 0.95), 1),
+        "p99_ms": round(percentile(latencies_ms, 0.99), 1),
+        "max_ms": round(max(latencies_ms), 1),
+        "throughput_rps": round(len(samples) / wall_seconds, 1) if wall_seconds > 0 else None,
+        "histogram": histogram(latencies_ms),
+        "budget": dict(budget),
+    }
+    profile["violations"] = [f"{key} {profile[stat]} > {budget[key]:g}" for key, stat in BUDGET_KEYS.items()
+                             if key in budget and profile[stat] > budget[key]]
+    return profile
+
+def profile_summary(profile):
+    """One line for the step's actual result."""
+    summary = (f"{profile['requests']} requests, {profile['failed']} failed; latency min {profile['min_ms']} / p50 {profile['p50_ms']} / "
+               f"p95 {profile['p95_ms']} / p99 {profile['p99_ms']} / max {profile['max_ms']} ms")
+    if profile["throughput_rps"] is not None and profile["requests"] > 1:
+        summary += f"; {profile['throughput_rps']} req/s"
+    if profile["violations"]:
+        summary += f"; latency budget exceeded: {', '.join(profile['violations'])}"
+    return summary
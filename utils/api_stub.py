@@ -0,0 +1,227 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STUB_MODES = ("off", "record", "replay")
+DEFAULT_STUB_DIR = "Testware/api_stub"
+# Request header carrying the original scheme://host of a request routed to the stub server
+ORIGIN_HEADER = "X-Stub-Origin"
+# Response headers not replayed: requests already decoded the body, and the stub server sets its own length
+SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive", "date", "server"}
+
+class StubSettings(NamedTuple):
+    mode: str = "off"  # off, record or replay
+    directory: str = DEFAULT_STUB_DIR
+    port: int = 0  # 0 = any free port
+    latency_ms: float = 0.0  # Added to every stubbed response
+    latency_jitter_ms: float = 0.0  # Plus up to this much at random
+    error_rate: float = 0.0  # Share of stubbed responses replaced by error_status
+    error_status: int = 500  # Not in the default [api] retryStatuses, so every injected error reaches the step
+    seed: int = 1  # Makes jitter and injected errors repeatable
+
+def load_stub_settings(config):
+    """Read the [api_stub] section of config.ini."""
+    mode = config.get("api_stub", "mode", fallback="off").strip().lower() or "off"
+    if mode not in STUB_MODES:
+        raise ValueError(f"Unsupported API stub mode '{mode}'. Supported: {', '.join(STUB_MODES)}")
+    error_rate = config.getfloat("api_stub", "errorRate", fallback=0.0)
+    if not 0 <= error_rate <= 1:
+        raise ValueError(f"API stub errorRate must be between 0 and 1, got {error_rate}")
+    return StubSettings(
+        mode=mode,
+        directory=config.get("api_stub", "directory", fallback="").strip() or DEFAULT_STUB_DIR,
+        port=config.getint("api_stub", "port", fallback=0),
+        latency_ms=max(0.0, config.getfloat("api_stub", "latencyMs", fallback=0.0)),
+        latency_jitter_ms=max(0.0, config.getfloat("api_stub", "latencyJitterMs", fallback=0.0)),
+        error_rate=error_rate,
+        error_status=config.getint("api_stub", "errorStatus", fallback=500),
+        seed=config.getint("api_stub", "seed", fallback=1),
+    )
+
+def exchange_key(method, origin, target, body):
+    """Digest identifying a request: method, scheme://host, path with query, and body bytes."""
+    digest = hashlib.sha256(f"{method.upper()} {origin.lower()}{target}\n".encode("utf-8"))
+    digest.update(body or b"")
+    return digest.hexdigest()
+
+def request_target(url):
+    """Path and query of a URL, as sent on the request line."""
+    parts = urlsplit(url)
+    return (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+def exchange_file_name(method, target, key):
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", target.split("?")[0]).strip("_")[:60] or "root"
+    return f"{method.upper()}_{slug}_{key[:12]}.json"
+
+class ExchangeRecorder:
+    """Saves each API response as a recorded exchange (record mode), one JSON file per distinct request."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def record(self, response):
+        """Save the exchange of a requests response; the body is read in full, so record runs do not stream."""
+        request = response.request
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        parts = urlsplit(request.url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        target = request_target(request.url)
+        key = exchange_key(request.method, origin, target, body)
+        content = response.content
+        exchange = {
+            "request": {"method": request.method, "origin": origin, "target": target,
+                        "body": body.decode("utf-8", errors="replace") if body else None},
+            "response": {"status": response.status_code,
+                         "headers": {name: value for name, value in response.headers.items() if name.lower() not in SKIPPED_HEADERS}},
+        }
+        try:
+            exchange["response"]["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            exchange["response"]["body_base64"] = base64.b64encode(content).decode("ascii")
+        path = os.path.join(self.directory, exchange_file_name(request.method, target, key))
+        with self.lock:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(exchange, f, indent=2)
+        logger.info(f"Recorded API exchange {request.method} {request.url} to {path}")
+
+def load_exchanges(directory):
+    """Recorded exchanges by exchange key, plus (method, origin, target) -> exchange for requests whose body differs."""
+    exact, by_target = {}, {}
+    if not os.path.isdir(directory):
+        logger.warning(f"API stub directory not found: {directory}")
+        return exact, by_target
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, file_name), "r", encoding="utf-8") as f:
+            exchange = json.load(f)
+        request = exchange["request"]
+        body = request["body"].encode("utf-8") if request.get("body") else None
+        exact[exchange_key(request["method"], request["origin"], request["target"], body)] = exchange
+        by_target.setdefault((request["method"].upper(), request["origin"].lower(), request["target"]), exchange)
+    return exact, by_target
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every method from the server's recorded exchanges."""
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API behind the pooled sessions
+    disable_nagle_algorithm = True  # Headers and body are separate writes; Nagle would hold the body for the client's delayed ACK
+
+    def do_GET(self):
+        self.server.stub.respond(self)
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = do_GET
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+class StubServer:
+    """Local HTTP server replaying recorded exchanges, with injected latency and errors from StubSettings."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.exact, self.by_target = load_exchanges(settings.directory)
+        self.random = random.Random(settings.seed)
+        self.lock = threading.Lock()
+        self.served = 0
+        self.misses = 0
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", settings.port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="api-stub", daemon=True)
+        self.thread.start()
+        logger.info(f"API stub server serving {len(self.exact)} recorded exchanges from {self.settings.directory} at {self.url}")
+        return self
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        logger.info(f"API stub server stopped after {self.served} responses ({self.misses} without a recorded exchange)")
+
+    def find(self, method, origin, target, body):
+        exchange = self.exact.get(exchange_key(method, origin, target, body))
+        return exchange or self.by_target.get((method.upper(), origin.lower(), target))
+
+    def injected(self):
+        """(delay in seconds, inject an error) for the next response; drawn under the lock so a seed gives the same sequence."""
+        with self.lock:
+            self.served += 1
+            jitter = self.random.uniform(0, self.settings.latency_jitter_ms) if self.settings.latency_jitter_ms else 0.0
+            error = self.settings.error_rate > 0 and self.random.random() < self.settings.error_rate
+        return (self.settings.latency_ms + jitter) / 1000, error
+
+    def respond(self, handler):
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else None
+        origin = handler.headers.get(ORIGIN_HEADER, "")
+        exchange = self.find(handler.command, origin, handler.path, body)
+        delay, error = self.injected()
+        if delay:
+            time.sleep(delay)
+        if error:
+            status, headers, content = self.settings.error_status, {"Content-Type": "application/json"}, b'{"error": "injected by the API stub"}'
+        elif exchange is None:
+            with self.lock:
+                self.misses += 1
+            logger.warning(f"API stub has no recorded exchange for {handler.command} {origin}{handler.path}")
+            status, headers = 404, {"Content-Type": "application/json", "X-Stub-Miss": "1"}
+            content = json.dumps({"error": f"no recorded exchange for {handler.command} {origin}{handler.path}"}).encode("utf-8")
+        else:
+            response = exchange["response"]
+            status, headers = response["status"], response.get("headers", {})
+            if "body_base64" in response:
+                content = base64.b64decode(response["body_base64"])
+            else:
+                content = (response.get("body") or "").encode("utf-8")
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(content)))
+        handler.end_headers()
+        if handler.command != "HEAD":
+            handler.wfile.write(content)
+
+@contextmanager
+def open_stub_server(config):
+    """Run the API steps of the block against a local stub server in replay mode, and record their responses in record mode."""
+    from utils.api_client import get_api_client
+    settings = load_stub_settings(config)
+    client = get_api_client()
+    if settings.mode == "record":
+        client.recorder = ExchangeRecorder(settings.directory)
+        try:
+            yield None
+        finally:
+            client.recorder = None
+        return
+    if settings.mode != "replay":
+        yield None
+        return
+    server = StubServer(settings).start()
+    client.route_to(server.url)
+    try:
+        yield server
+    finally:
+        client.route_to(None)
+        server.close()
@@ -0,0 +1,143 @@
+import json
+import logging
+import os
+import time
+from collections import deque
+from utils.tracing import get_tracer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORAGE_STATE_PATH = ".auth/storage_state.json"
+
+class ContextPool:
+    """Browser contexts seeded from a saved login (storage_state), kept warm and recycled after max_uses."""
+
+    def __init__(self, browser, storage_state=None, size=2, max_uses=10):
+        self.browser = browser
+        self.storage_state = storage_state  # Path of the storage_state snapshot, or None for anonymous contexts
+        self.size = max(0, size)
+        self.max_uses = max(1, max_uses)
+        self.snapshot_cookies = []
+        if storage_state is not None:
+            with open(storage_state, "r", encoding="utf-8") as f:
+                self.snapshot_cookies = json.load(f).get("cookies", [])
+        self.idle = deque()  # Ready contexts, oldest first
+        self.uses = {}  # Context -> number of tests it has served
+        self.created_count = 0
+        self.fill_seconds = 0.0  # Time spent creating contexts, reported when the pool closes
+
+    def new_context(self):
+        context = self.browser.new_context(storage_state=self.storage_state)
+        self.uses[context] = 0
+        self.created_count += 1
+        return context
+
+    def fill(self):
+        """Create contexts until `size` are ready, in a span of its own so refills never count toward a test case.
+        The sync Playwright API can only create contexts on the thread that owns it, so this runs on the test
+        thread, between test cases, rather than in the background."""
+        if len(self.idle) >= self.size:
+            return
+        start_time = time.perf_counter()
+        with get_tracer().span("context_pool.fill", **{"pool.missing": self.size - len(self.idle)}):
+            while len(self.idle) < self.size:
+                self.idle.append(self.new_context())
+        self.fill_seconds += time.perf_counter() - start_time
+
+    def acquire(self):
+        """Refill the pool, then hand out a ready context; runs before the test case's own timing starts."""
+        self.fill()
+        context = self.idle.popleft() if self.idle else self.new_context()
+        self.uses[context] += 1
+        return context
+
+    def release(self, context):
+        """Take a context back: reset it for the next test or close it after max_uses; the next acquire() refills the pool."""
+        try:
+            for page in list(context.pages):
+                page.close()
+            if self.uses[context] >= self.max_uses:
+                self.discard(context)
+            else:
+                # Back to the logged-in snapshot. Web storage is only re-seeded for new contexts;
+                # set contextMaxUses = 1 if tests must not share localStorage.
+                context.clear_cookies()
+                if self.snapshot_cookies:
+                    context.add_cookies(self.snapshot_cookies)
+                self.idle.append(context)
+        except Exception as e:
+            logger.warning(f"Dropping a browser context that could not be reset: {str(e)}")
+            self.discard(context)
+
+    def discard(self, context):
+        self.uses.pop(context, None)
+        try:
+            context.close()
+        except Exception:
+            pass
+
+    def close(self):
+        while self.idle:
+            self.discard(self.idle.popleft())
+        for context in list(self.uses):
+            self.discard(context)
+        logger.info(f"Context pool closed after creating {self.created_count} contexts in {self.fill_seconds:.2f}s of refills")
+
+def pool_settings(config):
+    """Return the context pool keys of the [playwright] section as a dict."""
+    return {
+        "enabled": config.getboolean("playwright", "contextPool", fallback=False),
+        "size": config.getint("playwright", "contextPoolSize", fallback=2),
+        "max_uses": config.getint("playwright", "contextMaxUses", fallback=10),
+        "login_test_case": config.get("playwright", "loginTestCase", fallback="").strip(),
+        "storage_state_path": config.get("playwright", "storageStatePath", fallback="").strip() or DEFAULT_STORAGE_STATE_PATH,
+        "storage_state_max_age": config.getint("playwright", "storageStateMaxAge", fallback=3600),
+    }
+
+def storage_state_is_fresh(path, max_age):
+    return os.path.exists(path) and time.time() - os.path.getmtime(path) < max_age
+
+def create_storage_state(browser, test_data, login_test_case, base_url, path):
+    """Run the login test case ('<TestPackName>/<AutomationTestID>') once and save the context's storage_state."""
+    from utils.screenshots import Screenshotter
+    from actions.base_actions import BaseActions
+    from utils.test_executor import run_test_case
+
+    test_pack_name, _, automation_test_id = login_test_case.partition("/")
+    if not automation_test_id:
+        raise ValueError(f"loginTestCase must be <TestPackName>/<AutomationTestID>, got '{login_test_case}'")
+    test_steps = test_data.get_test_steps(test_pack_name, automation_test_id)
+    context = browser.new_context()
+    try:
+        page = context.new_page()
+        page.set_default_timeout(60000)  # 60 seconds
+        base = BaseActions(page, [], Screenshotter.from_config())
+        test_case_result, isOK = run_test_case(page, base, test_data, test_pack_name, automation_test_id, test_steps, base_url)
+        if isOK == 1:
+            raise RuntimeError(f"Login test case {login_test_case} failed; no storage state saved")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(context.storage_state(), f)
+        os.replace(temp_path, path)  # Parallel workers may log in at the same time
+        logger.info(f"Saved login storage state to {path}")
+    finally:
+        context.close()
+    return path
+
+def open_context_pool(browser, config, test_data, base_url):
+    """Create the context pool from config.ini, logging in first unless a fresh snapshot exists; None if disabled."""
+    settings = pool_settings(config)
+    if not settings["enabled"]:
+        return None
+    storage_state = None
+    if settings["login_test_case"]:
+        storage_state = settings["storage_state_path"]
+        if not storage_state_is_fresh(storage_state, settings["storage_state_max_age"]):
+            create_storage_state(browser, test_data, settings["login_test_case"], base_url, storage_state)
+        else:
+            logger.info(f"Reusing login storage state {storage_state}")
+    pool = ContextPool(browser, storage_state, settings["size"], settings["max_uses"])
+    pool.fill()
+    return pool
@@ -1,20 +1,189 @@
 import pandas as pd
 import os
 import logging
+from utils.object_map import build_object_index
+from utils.plan_cache import PlanCache, DEFAULT_CACHE_DIR
+from utils.plan_sources import open_plan_source
+from utils.workbook_stream import StreamingWorkbook, TEST_PACK_COLUMNS, TEST_CASE_COLUMNS, OBJECT_MAP_COLUMNS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class DataLoader:
-    def __init__(self, file_name):
+    def __init__(self, file_name, use_cache=True, cache_dir=DEFAULT_CACHE_DIR, preload=True, streaming=False, plan_format=None):
         self.file_path = os.path.join("Testware", file_name)
-        self.sheet_names = pd.ExcelFile(self.file_path).sheet_names  # Get all sheet names
+        self.source = open_plan_source(self.file_path, plan_format)  # Backend chosen by extension or planFormat
+        if streaming and self.source.format_name != "xlsx":
+            logger.warning(f"streamingLoader only supports Excel workbooks; loading {self.file_path} ({self.source.format_name}) in memory")
+            streaming = False
+        # Streaming mode reads rows on demand and never holds a whole scripts sheet, so it bypasses the plan cache
+        self.stream = StreamingWorkbook(self.file_path) if streaming else None
+        self.plan_cache = PlanCache(self.file_path, cache_dir) if use_cache and not streaming else None
+        self.parse_count = 0  # Number of times the workbook has been parsed
+        self.sheet_names = None  # All sheet names in the workbook
+        self.sheets = {}  # In-memory workbook model: sheet name -> DataFrame
+        self.loaded_parts = set()  # Plan parts ("TestPacks", "ObjectMap" or a pack name) held in memory
+        self.part_values = {}  # Plan part -> the value it was loaded from (re-stored when the cache key changes)
+        self.sheet_fingerprints = None  # Sheet name -> content fingerprint, set by track_changes()
+        self.cache_dir = cache_dir
+        self.object_index = {}  # ObjectName -> ObjectRecord with precomputed selector
+        self.duplicate_objects = []  # ObjectNames defined more than once in ObjectMap
+        self.step_index = {}  # Pack name -> {ScriptId -> ordered list of step records}
+        self.step_index_issues = {}  # Pack name -> orphan ScriptIds and test cases without steps
+        if streaming:
+            self.sheet_names = self.stream.sheet_names
+        elif preload:
+            self.load_workbook()
+
+    def load_workbook(self):
+        """Load every part of the plan, parsing all uncached sheets in one pass."""
+        self.load_parts(["TestPacks"], parse_missing=False)  # Cached sheet names avoid opening the workbook
+        if self.sheet_names is None:
+            self.sheet_names = self.source.sheet_names()
+        object_map = ["ObjectMap"] if "ObjectMap" in self.sheet_names else []
+        self.load_parts(["TestPacks"] + object_map + self.pack_sheet_names())
+
+    def load_parts(self, parts, parse_missing=True):
+        """Load plan parts from the compiled plan cache, parsing the missing ones from the workbook in one pass."""
+        missing = [part for part in parts if part not in self.loaded_parts]
+        if self.stream is not None:
+            for part in missing:
+                self.apply_part(part, self.stream_part(part))
+            return
+        if self.plan_cache is not None:
+            for part in list(missing):
+                cached = self.plan_cache.load(part)
+                if cached is not None:
+                    self.apply_part(part, cached)
+                    missing.remove(part)
+                    logger.info(f"Loaded '{part}' for {self.file_path} from plan cache ({self.plan_cache.key})")
+        if not missing or not parse_missing:
+            return
+
+        sheet_names = [sheet_name for part in missing for sheet_name in self.part_sheet_names(part)]
+        self.parse_sheets(sheet_names)
+        for part in missing:
+            value = self.build_part(part)
+            self.apply_part(part, value)
+            if self.plan_cache is not None:
+                self.plan_cache.store(part, value)
+
+    def part_sheet_names(self, part):
+        """Return the sheets a plan part is built from."""
+        if part in ("TestPacks", "ObjectMap"):
+            return [part]
+        return [part, f"{part} - Scripts"]
+
+    def part_for_sheet(self, sheet_name):
+        """Return the plan part a sheet belongs to."""
+        if sheet_name.endswith(" - Scripts"):
+            return sheet_name[:-len(" - Scripts")]
+        return sheet_name
+
+    def build_part(self, part):
+        """Build a cacheable plan part from sheets that were just parsed."""
+        value = {"sheets": {name: self.sheets[name] for name in self.part_sheet_names(part)}}
+        if part == "TestPacks":
+            value["sheet_names"] = self.sheet_names
+        elif part == "ObjectMap":
+            value["object_index"], value["duplicate_objects"] = build_object_index(self.sheets["ObjectMap"].to_dict("records"))
+        else:
+            value["step_index"] = self.index_test_steps(part)
+            value["step_index_issues"] = self.step_index_issues[part]
+        return value
+
+    def stream_part(self, part):
+        """Build a plan part from streamed rows; steps are left unindexed and read per test case."""
+        if part == "TestPacks":
+            test_packs = pd.DataFrame(self.stream.iter_records("TestPacks", TEST_PACK_COLUMNS, key_column="TestPackName"))
+            return {"sheets": {"TestPacks": test_packs}, "sheet_names": self.sheet_names}
+        if part == "ObjectMap":
+            object_index, duplicate_objects = build_object_index(self.stream.iter_records("ObjectMap", OBJECT_MAP_COLUMNS))
+            return {"sheets": {}, "object_index": object_index, "duplicate_objects": duplicate_objects}
+        test_cases = pd.DataFrame(self.stream.iter_records(part, TEST_CASE_COLUMNS, key_column="AutomationTestID"))
+        return {"sheets": {part: test_cases}, "step_index": None, "step_index_issues": {}}
+
+    def apply_part(self, part, value):
+        """Add a plan part to the in-memory workbook model."""
+        self.sheets.update(value["sheets"])
+        if part == "TestPacks":
+            self.sheet_names = value["sheet_names"]
+        elif part == "ObjectMap":
+            self.object_index = value["object_index"]
+            self.duplicate_objects = value["duplicate_objects"]
+        else:
+            self.step_index[part] = value["step_index"]
+            self.step_index_issues[part] = value["step_index_issues"]
+        self.loaded_parts.add(part)
+        self.part_values[part] = value
+
+    def track_changes(self):
+        """Record the current sheet fingerprints so reload_changed_sheets() can detect edits."""
+        self.sheet_fingerprints = self.source.sheet_fingerprints()
+
+    def reload_changed_sheets(self):
+        """Re-parse only the loaded plan parts whose sheets changed on disk; returns the reloaded parts."""
+        if self.sheet_fingerprints is None:
+            self.track_changes()
+            return []
+        fingerprints = self.source.sheet_fingerprints()
+        changed_sheets = {name for name in set(fingerprints) | set(self.sheet_fingerprints)
+                          if fingerprints.get(name) != self.sheet_fingerprints.get(name)}
+        self.sheet_fingerprints = fingerprints
+        if not changed_sheets:
+            return []
+
+        changed_parts = {self.part_for_sheet(name) for name in changed_sheets}
+        if set(fingerprints) != set(self.sheet_names or []):
+            changed_parts.add("TestPacks")  # Sheets were added or removed; refresh the cached sheet names
+        reload_parts = [part for part in self.loaded_parts if part in changed_parts]
+        for part in reload_parts:
+            for sheet_name in self.part_sheet_names(part):
+                self.sheets.pop(sheet_name, None)
+            self.loaded_parts.discard(part)
+            self.part_values.pop(part, None)
+            self.step_index.pop(part, None)
+            self.step_index_issues.pop(part, None)
+        if "ObjectMap" in reload_parts:
+            self.object_index, self.duplicate_objects = {}, []
+
+        self.source.reset()
+        self.sheet_names = list(fingerprints)
+        if self.plan_cache is not None:
+            # The workbook hash changed: carry unchanged parts over to the new cache entry
+            self.plan_cache = PlanCache(self.file_path, self.cache_dir)
+            for part, value in self.part_values.items():
+                self.plan_cache.store(part, value)
+        self.load_parts([part for part in reload_parts if part == "TestPacks" or part in self.sheet_names])
+        logger.info(f"Sheets changed in {self.file_path}: {sorted(changed_sheets)}; reloaded parts: {sorted(reload_parts)}")
+        return reload_parts
+
+    def parse_sheets(self, sheet_names):
+        """Parse the given sheets in one pass and add them to the in-memory workbook model."""
+        if self.sheet_names is None:
+            self.sheet_names = self.source.sheet_names()  # Get all sheet names
+        for sheet_name in sheet_names:
+            if sheet_name not in self.sheet_names:
+                raise ValueError(f"Sheet '{sheet_name}' not found in {self.file_path}. Available sheets: {self.sheet_names}")
+        self.sheets.update(self.source.read_sheets(sheet_names))
+        self.parse_count += 1
+        logger.info(f"Parsed {len(sheet_names)} sheets from {self.file_path} (parse count: {self.parse_count})")
+
+    def pack_sheet_names(self):
+        """Return the test pack sheets, i.e. sheets that have a matching scripts sheet."""
+        return [name for name in self.sheet_names if f"{name} - Scripts" in self.sheet_names]
+
+    def get_sheet(self, sheet_name):
+        """Return a sheet from the in-memory workbook model, loading its plan part on first use."""
+        if sheet_name not in self.sheets:
+            self.load_parts([self.part_for_sheet(sheet_name)])
+        if sheet_name not in self.sheets:
+            raise ValueError(f"Sheet '{sheet_name}' is not held in memory when streaming {self.file_path}")
+        return self.sheets[sheet_name]
 
     def load_test_packs(self):
         """Load test packs from the Excel file."""
-        if "TestPacks" not in self.sheet_names:
-            raise ValueError(f"Sheet 'TestPacks' not found in {self.file_path}. Available sheets: {self.sheet_names}")
-        df = pd.read_excel(self.file_path, sheet_name="TestPacks")
+        df = self.get_sheet("TestPacks")
         valid_rows = []
         for index, row in df.iterrows():
             if pd.isna(row["TestPackName"]) or row["TestPackName"] == "":
@@ -24,9 +193,7 @@ class DataLoader:
 
     def load_test_cases(self, test_pack_name):
         """Load test cases from the specified test pack sheet."""
-        if test_pack_name not in self.sheet_names:
-            raise ValueError(f"Sheet '{test_pack_name}' not found in {self.file_path}. Available sheets: {self.sheet_names}")
-        df = pd.read_excel(self.file_path, sheet_name=test_pack_name)
+        df = self.get_sheet(test_pack_name)
         valid_rows = []
         for index, row in df.iterrows():
             if pd.isna(row["AutomationTestID"]) or row["AutomationTestID"] == "":
@@ -37,11 +204,7 @@ class DataLoader:
     def load_test_steps(self, test_pack_name):
         """Load test steps from the specified test pack scripts sheet, handling merged cells for ScriptId."""
         script_sheet_name = f"{test_pack_name} - Scripts"
-        if script_sheet_name not in self.sheet_names:
-            raise ValueError(f"Sheet '{script_sheet_name}' not found in {self.file_path}. Available sheets: {self.sheet_names}")
-
-        # Load the test pack scripts sheet into a DataFrame
-        df = pd.read_excel(self.file_path, sheet_name=script_sheet_name)
+        df = self.get_sheet(script_sheet_name).copy()
 
         # Ensure the ScriptId column exists
         if "ScriptId" not in df.columns:
@@ -54,12 +217,36 @@ class DataLoader:
         df["ScriptId"] = df["ScriptId"].astype(str).str.strip().str.lower()
 
         return df
+
+    def index_test_steps(self, test_pack_name):
+        """Group the pack's steps by ScriptId in one pass and flag orphan steps and test cases without steps."""
+        test_steps = self.load_test_steps(test_pack_name)
+        step_index = {
+            script_id: group.to_dict("records")
+            for script_id, group in test_steps.groupby("ScriptId", sort=False)
+        }
+
+        test_case_ids = [str(test_case_id).strip().lower() for test_case_id in self.load_test_cases(test_pack_name)["AutomationTestID"]]
+        known_ids = set(test_case_ids)
+        orphan_script_ids = [script_id for script_id in step_index if script_id not in known_ids]
+        cases_without_steps = [test_case_id for test_case_id in test_case_ids if test_case_id not in step_index]
+        for script_id in orphan_script_ids:
+            logger.warning(f"Orphan steps in '{test_pack_name} - Scripts': ScriptId '{script_id}' matches no test case ({len(step_index[script_id])} steps)")
+        for test_case_id in cases_without_steps:
+            logger.warning(f"Test case '{test_case_id}' in '{test_pack_name}' has no steps")
+
+        self.step_index[test_pack_name] = step_index
+        self.step_index_issues[test_pack_name] = {
+            "orphan_script_ids": orphan_script_ids,
+            "cases_without_steps": cases_without_steps,
+        }
+        return step_index
+
     def load_object_map(self):
         """Load the object map from the Excel file."""
-        if "ObjectMap" not in self.sheet_names:
-            raise ValueError(f"Sheet 'ObjectMap' not found in {self.file_path}. Available sheets: {self.sheet_names}")
-        df = pd.read_excel(self.file_path, sheet_name="ObjectMap")
-        return df
+        if self.stream is not None:
+            return pd.DataFrame(self.stream.iter_records("ObjectMap", OBJECT_MAP_COLUMNS))
+        return self.get_sheet("ObjectMap")
 
     def get_test_packs(self):
         """Retrieve test packs with RunMode set to 'Yes'."""
@@ -73,28 +260,60 @@ class DataLoader:
         return test_cases[test_cases["RunMode"].str.lower() == "yes"]
 
     def get_test_steps(self, test_pack_name, automation_test_id):
-        """Retrieve test steps for a specific AutomationTestID in a specific test pack."""
-        test_steps = self.load_test_steps(test_pack_name)
-        
-        # Normalize automation_test_id
+        """Retrieve the ordered test steps for a specific AutomationTestID in a specific test pack."""
+        self.load_parts([test_pack_name])
+        step_index = self.step_index[test_pack_name]
+
+        # Normalize automation_test_id the same way as the ScriptId column
         automation_test_id = str(automation_test_id).strip().lower()
-        
-        # Debug: Print the automation_test_id being searched for
-        print(f"Searching for AutomationTestID: '{automation_test_id}'")
-        
-        # Debug: Print unique ScriptId values in the test_steps DataFrame
-        print("Unique ScriptId values in test_steps:")
-        print(test_steps["ScriptId"].unique())
-        
-        # Filter test steps based on ScriptId
-        filtered_steps = test_steps[test_steps["ScriptId"] == automation_test_id]
-        
-        # Debug: Print the number of rows found
-        print(f"Number of rows found for '{automation_test_id}': {len(filtered_steps)}")
-        
-        return filtered_steps
+        if step_index is None:
+            # Streaming: scan the scripts sheet for this one test case (prefer iter_test_steps for a whole pack)
+            return next((steps for script_id, steps in self.stream.iter_step_groups(test_pack_name) if script_id == automation_test_id), [])
+        return step_index.get(automation_test_id, [])
+
+    def iter_test_steps(self, test_pack_name, automation_test_ids):
+        """Yield (AutomationTestID, steps) for the given test cases, in the given order.
+
+        In streaming mode the scripts sheet is read once; a test case is yielded as soon as it is next in
+        order, so only test cases whose steps come earlier in the sheet than their turn are held in memory.
+        """
+        self.load_parts([test_pack_name])
+        if self.step_index[test_pack_name] is not None:
+            for automation_test_id in automation_test_ids:
+                yield automation_test_id, self.get_test_steps(test_pack_name, automation_test_id)
+            return
+
+        order = [(str(automation_test_id).strip().lower(), automation_test_id) for automation_test_id in automation_test_ids]
+        wanted = {script_id for script_id, _ in order}
+        buffered = {}  # ScriptId -> steps read ahead of the test case's turn
+        yielded = set()
+        position = 0
+        for script_id, steps in self.stream.iter_step_groups(test_pack_name):
+            if script_id not in wanted:
+                continue
+            if script_id in yielded:
+                logger.warning(f"Steps for ScriptId '{script_id}' in '{test_pack_name} - Scripts' come after the test case ran; skipping them")
+                continue
+            buffered.setdefault(script_id, []).extend(steps)  # Blocks of one ScriptId are joined, like the in-memory index
+            # Yield while the next test case has its steps; a later block of it would be skipped with the warning above
+            while position < len(order) and order[position][0] in buffered:
+                next_id, automation_test_id = order[position]
+                yielded.add(next_id)
+                position += 1
+                yield automation_test_id, buffered.pop(next_id)
+        for next_id, automation_test_id in order[position:]:
+            steps = buffered.pop(next_id, [])
+            if not steps and next_id not in yielded:
+                logger.warning(f"Test case '{automation_test_id}' in '{test_pack_name}' has no steps")
+            yielded.add(next_id)
+            yield automation_test_id, steps
 
     def get_object_details(self, object_name):
         """Retrieve object details from the object map."""
         object_map = self.load_object_map()
         return object_map[object_map["ObjectName"] == object_name]
+
+    def get_object_record(self, object_name):
+        """Retrieve the indexed ObjectRecord for an ObjectName, or None if it is not mapped."""
+        self.load_parts(["ObjectMap"])
+        return self.object_index.get(object_name)
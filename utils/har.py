@@ -0,0 +1,97 @@
+import configparser
+import logging
+import os
+import re
+from contextlib import contextmanager
+from typing import NamedTuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HAR_MODES = ("off", "record", "replay")
+DEFAULT_HAR_DIR = "Testware/har"
+
+class HarSettings(NamedTuple):
+    mode: str = "off"  # off, record or replay
+    directory: str = DEFAULT_HAR_DIR
+    strict: bool = False  # Replay: abort requests missing from the HAR instead of going to the network
+
+def load_har_settings(config):
+    """Read the [har] section of config.ini."""
+    mode = config.get("har", "mode", fallback="off").strip().lower() or "off"
+    if mode not in HAR_MODES:
+        raise ValueError(f"Unsupported HAR mode '{mode}'. Supported: {', '.join(HAR_MODES)}")
+    on_miss = config.get("har", "replayMiss", fallback="fallback").strip().lower() or "fallback"
+    if on_miss not in ("strict", "fallback"):
+        raise ValueError(f"Unsupported replayMiss '{on_miss}'. Supported: strict, fallback")
+    directory = config.get("har", "directory", fallback="").strip() or DEFAULT_HAR_DIR
+    return HarSettings(mode, directory, on_miss == "strict")
+
+# HAR settings from config.ini, read once per process
+_settings = None
+
+def har_settings(config_path="config/config.ini"):
+    global _settings
+    if _settings is None:
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        _settings = load_har_settings(config)
+    return _settings
+
+def har_path(settings, test_pack_name, test_case_id):
+    """One HAR archive per test case; .zip keeps response bodies as separate entries."""
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{test_pack_name}__{test_case_id}")
+    return os.path.join(settings.directory, f"{name}.zip")
+
+def har_context_options(settings, path, storage_state=None):
+    """Keyword arguments for browser.new_context in record mode (and the login state to carry over)."""
+    options = {"storage_state": storage_state}
+    if settings.mode == "record":
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        options.update(record_har_path=path, record_har_mode="minimal")  # Minimal is all replay needs
+    return options
+
+def replay_route_options(settings, path):
+    """Keyword arguments for context.route_from_har in replay mode, or None to use the network."""
+    if settings.mode != "replay":
+        return None
+    if not os.path.exists(path):
+        if settings.strict:
+            raise FileNotFoundError(f"No recorded HAR for this test case: {path} (run with [har] mode = record first)")
+        logger.warning(f"No recorded HAR at {path}; using the network")
+        return None
+    return {"not_found": "abort" if settings.strict else "fallback"}
+
+def open_har_context(browser, settings, test_pack_name, test_case_id, storage_state=None):
+    """New context that records the test case's traffic to, or replays it from, its HAR file."""
+    path = har_path(settings, test_pack_name, test_case_id)
+    context = browser.new_context(**har_context_options(settings, path, storage_state))
+    route_options = replay_route_options(settings, path)
+    if route_options is not None:
+        context.route_from_har(path, **route_options)
+    return context
+
+async def open_har_context_async(browser, settings, test_pack_name, test_case_id, storage_state=None):
+    """open_har_context for playwright.async_api."""
+    path = har_path(settings, test_pack_name, test_case_id)
+    context = await browser.new_context(**har_context_options(settings, path, storage_state))
+    route_options = replay_route_options(settings, path)
+    if route_options is not None:
+        await context.route_from_har(path, **route_options)
+    return context
+
+@contextmanager
+def har_test_case_page(page, base, settings, test_pack_name, test_case_id):
+    """Run one test case on a page of its own HAR context (seeded with the current login); base is pointed at it meanwhile."""
+    context = open_har_context(page.context.browser, settings, test_pack_name, test_case_id, page.context.storage_state())
+    har_page = context.new_page()
+    har_page.set_default_timeout(60000)  # 60 seconds
+    previous_page, previous_main_page = base.page, base.main_page
+    base.page = base.main_page = har_page
+    try:
+        yield har_page
+    finally:
+        base.page, base.main_page = previous_page, previous_main_page
+        context.close()  # Writes the HAR in record mode
+        if settings.mode == "record":
+            logger.info(f"Recorded {har_path(settings, test_pack_name, test_case_id)}")
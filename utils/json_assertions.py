@@ -0,0 +1,204 @@
+import json
+import re
+from typing import Any, Callable, NamedTuple
+
+# $.a.b[0], $.items[*].id, $..id and bracketed names such as $['odd key']
+PATH_TOKEN = re.compile(r"""\.\.(\*|[^.\[\]]+)|\.(\*|[^.\[\]]+)|\[(\*|-?\d+)\]|\[['"](.+?)['"]\]""")
+OPERANDS = ("equals", "notequals", "contains", "regex", "gt", "gte", "lt", "lte", "length", "exists", "schema")
+FORMAT_HINT = ('{"url": "<URL>", "method": "<GET|POST|PUT|PATCH|DELETE>", "headers": {<optional>}, "payload": {<optional>}, "expected_status": "<code>", '
+               '"expected_response": [{"key": "<key>" or "path": "$.a.b[0]", "value": "<value>", '
+               '"operand": "<' + "|".join(OPERANDS) + '>", "match": "<any|all>"}]}')
+JSON_TYPES = {"object": dict, "array": list, "string": str, "boolean": bool, "null": type(None)}
+
+class Assertion(NamedTuple):
+    label: str  # Key or path as written in the step
+    tokens: tuple  # ("key", name), ("index", i), ("wildcard",) or ("descend", name)
+    operand: str
+    value: Any
+    test: Callable  # test(found value) -> bool
+    match_all: bool  # Every match must pass (default: any match)
+
+def parse_path(path):
+    """Tokens of a JSONPath-style expression; a bare key means that key at any depth (the original behaviour)."""
+    path = str(path).strip()
+    if not path.startswith("$"):
+        return (("descend", path),)
+    tokens = []
+    position = 1
+    while position < len(path):
+        match = PATH_TOKEN.match(path, position)
+        if match is None:
+            raise ValueError(f"Invalid JSON path '{path}' at position {position}")
+        descend, member, index, quoted = match.groups()
+        if descend is not None:
+            tokens.append(("descend", descend))
+        elif member == "*" or index == "*":
+            tokens.append(("wildcard",))
+        elif member is not None:
+            tokens.append(("key", member))
+        elif index is not None:
+            tokens.append(("index", int(index)))
+        else:
+            tokens.append(("key", quoted))
+        position = match.end()
+    return tuple(tokens)
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def matches_type(value, json_type):
+    if json_type == "number":
+        return is_number(value)
+    if json_type == "integer":
+        return is_number(value) and float(value).is_integer()
+    return isinstance(value, JSON_TYPES.get(json_type, ()))
+
+def schema_errors(value, schema, where="$"):
+    """Errors of value against a JSON Schema subset: type, required, properties, items, enum."""
+    errors = []
+    expected_type = schema.get("type")
+    if expected_type is not None:
+        types = expected_type if isinstance(expected_type, list) else [expected_type]
+        if not any(matches_type(value, json_type) for json_type in types):
+            return [f"{where} is not {expected_type}"]
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{where} is not one of {schema['enum']}")
+    if isinstance(value, dict):
+        errors += [f"{where}.{key} is missing" for key in schema.get("required", []) if key not in value]
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in value:
+                errors += schema_errors(value[key], sub_schema, f"{where}.{key}")
+    if isinstance(value, list) and "items" in schema:
+        for index, item in enumerate(value):
+            errors += schema_errors(item, schema["items"], f"{where}[{index}]")
+    return errors
+
+def number_test(compare, expected):
+    expected = float(expected)
+
+    def test(found):
+        try:
+            return not isinstance(found, bool) and compare(float(found), expected)  # Numeric strings count
+        except (TypeError, ValueError):
+            return False
+    return test
+
+def operand_test(operand, value):
+    """The check of one operand, prepared once (regexes compiled, numbers converted)."""
+    if operand == "equals":
+        return lambda found: found == value
+    if operand == "notequals":
+        return lambda found: found != value
+    if operand == "contains":
+        return lambda found: str(value) in str(found)
+    if operand == "regex":
+        pattern = re.compile(str(value))
+        return lambda found: pattern.search(str(found)) is not None
+    if operand in ("gt", "gte", "lt", "lte"):
+        compare = {"gt": float.__gt__, "gte": float.__ge__, "lt": float.__lt__, "lte": float.__le__}[operand]
+        return number_test(compare, value)
+    if operand == "length":
+        length = int(value)
+        return lambda found: hasattr(found, "__len__") and len(found) == length
+    if operand == "exists":
+        return lambda found: True
+    if operand == "schema":
+        schema = json.loads(value) if isinstance(value, str) else value
+        return lambda found: not schema_errors(found, schema)
+    raise ValueError(f"Unsupported response validation operator in expected_response: {operand}. Expected format: {FORMAT_HINT}")
+
+def compile_assertions(expected_responses):
+    """Compile expected_response entries once; raises ValueError on a bad path or operand."""
+    assertions = []
+    for expected_response in expected_responses or []:
+        label = expected_response.get("path") or expected_response.get("key")
+        if not label:
+            raise ValueError(f"Each expected_response needs a 'key' or 'path'. Expected format: {FORMAT_HINT}")
+        operand = str(expected_response.get("operand", "equals")).strip().lower()
+        value = expected_response.get("value")
+        match_all = str(expected_response.get("match", "any")).strip().lower() == "all"
+        assertions.append(Assertion(str(label), parse_path(label), operand, value, operand_test(operand, value), match_all))
+    return assertions
+
+def advance(states, tokens, key, size=None):
+    """Matcher states that continue into the child `key` (a member name, or an index of a list of `size`)."""
+    next_states = []
+    for index, position in states:
+        if position == len(tokens[index]):
+            continue
+        token = tokens[index][position]
+        kind = token[0]
+        if kind == "descend":
+            next_states.append((index, position))  # Keep looking deeper
+            if token[1] == "*" or key == token[1]:
+                next_states.append((index, position + 1))
+        elif kind == "wildcard":
+            next_states.append((index, position + 1))
+        elif kind == "key" and key == token[1]:
+            next_states.append((index, position + 1))
+        elif kind == "index" and isinstance(key, int) and key == (token[1] if token[1] >= 0 or size is None else size + token[1]):
+            next_states.append((index, position + 1))
+    return list(dict.fromkeys(next_states)) if len(next_states) > 1 else next_states  # Consecutive descends can repeat a state
+
+def initial_states(tokens):
+    """({key: [assertion index]} for bare keys, matcher states of the other paths at the document root).
+    Bare keys (the common case) are a dict lookup per member instead of a matcher state each."""
+    anywhere = {}
+    states = []
+    for index, path in enumerate(tokens):
+        if len(path) == 1 and path[0][0] == "descend" and path[0][1] != "*":
+            anywhere.setdefault(path[0][1], []).append(index)
+        else:
+            states.append((index, 0))
+    return anywhere, states
+
+def find_matches(data, assertions):
+    """Values each assertion's path selects, collected in one traversal of the document."""
+    tokens = [assertion.tokens for assertion in assertions]
+    matches = [[] for _ in assertions]
+    anywhere, states = initial_states(tokens)
+    stack = [(data, states)]
+    while stack:
+        node, states = stack.pop()
+        for index, position in states:
+            if position == len(tokens[index]):
+                matches[index].append(node)
+        if isinstance(node, dict):
+            children = []
+            for key, value in node.items():
+                for index in anywhere.get(key, ()):
+                    matches[index].append(value)
+                children.append((value, advance(states, tokens, key) if states else states))
+        elif isinstance(node, list):
+            if any(position < len(tokens[index]) and tokens[index][position][0] == "index" for index, position in states):
+                children = [(value, advance(states, tokens, position, len(node))) for position, value in enumerate(node)]
+            else:
+                item_states = advance(states, tokens, None) if states else states  # Same for every item
+                children = [(value, item_states) for value in node]
+        else:
+            continue
+        stack.extend((child, child_states) for child, child_states in reversed(children)
+                     if child_states or (anywhere and isinstance(child, (dict, list))))
+    return matches
+
+def describe(assertion, passed):
+    if assertion.operand == "equals":
+        return f"{assertion.label} equals {assertion.value}" if passed else f"{assertion.label} does not equal {assertion.value}"
+    if assertion.operand == "contains":
+        return f"{assertion.label} contains {assertion.value}" if passed else f"{assertion.label} does not contain {assertion.value}"
+    if assertion.operand == "exists":
+        return f"{assertion.label} exists" if passed else f"{assertion.label} does not exist"
+    return f"{assertion.label} {assertion.operand} {assertion.value}" if passed else f"{assertion.label} fails {assertion.operand} {assertion.value}"
+
+def assertion_result(assertion, found, passed_count):
+    """(passed, message) of an assertion from how many values its path selected and how many of them passed."""
+    passed = found > 0 and (passed_count == found if assertion.match_all else passed_count > 0)
+    if passed:
+        return True, f"Validation passed: {describe(assertion, True)}"
+    detail = " (not found)" if not found else ""
+    return False, f"\nValidation failed: {describe(assertion, False)}{detail}"
+
+def check_assertions(data, assertions):
+    """[(passed, message)] for compiled assertions against a parsed JSON document."""
+    return [assertion_result(assertion, len(found), sum(1 for value in found if assertion.test(value)))
+            for assertion, found in zip(assertions, find_matches(data, assertions))]
@@ -0,0 +1,283 @@
+import argparse
+import codecs
+import hashlib
+import json
+import re
+import sys
+from typing import NamedTuple, Optional
+from utils.json_assertions import advance, assertion_result, check_assertions, compile_assertions, initial_states
+
+# Bytes read from the socket at a time in streaming mode
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+# One JSON token after optional whitespace: punctuation, a complete string, or a number/literal
+TOKEN = re.compile(r'[ \t\n\r]*(?:([{}\[\],:])|("[^"\\]*(?:\\.[^"\\]*)*")|([^\s,:\[\]{}"]+))', re.S)
+NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][+-]?[0-9]+)?")
+LITERALS = {"true": True, "false": False, "null": None}
+
+class BodyOptions(NamedTuple):
+    stream: bool = False  # Read the body in chunks and check assertions as their paths go by
+    max_bytes: Optional[int] = None  # Fail the step when the body is larger
+    hash: Optional[str] = None  # hashlib algorithm of the body digest, e.g. sha256
+    expected_hash: Optional[str] = None  # Hex digest the body must have
+
+def body_options(input_data):
+    """Body handling of a validateapiresponse input: "stream", "max_bytes", "hash" and "expected_hash"."""
+    hash_name = input_data.get("hash")
+    expected_hash = input_data.get("expected_hash")
+    if expected_hash and not hash_name:
+        hash_name = "sha256"
+    if hash_name and hash_name.lower() not in hashlib.algorithms_available:
+        raise ValueError(f"Unsupported body hash '{hash_name}'. Supported: {', '.join(sorted(hashlib.algorithms_guaranteed))}")
+    max_bytes = input_data.get("max_bytes")
+    return BodyOptions(bool(input_data.get("stream", False)), int(max_bytes) if max_bytes else None,
+                       hash_name.lower() if hash_name else None, str(expected_hash).lower() if expected_hash else None)
+
+class JsonEventParser:
+    """Incremental JSON tokenizer: feed it text as it arrives, get (event, value) pairs back.
+    Events: start_map, map_key, end_map, start_array, end_array and value."""
+
+    def __init__(self):
+        self.buffer = ""
+        self.containers = []  # "map" or "array" per open container
+        self.expect_key = False
+
+    def feed(self, text, final=False):
+        buffer = self.buffer + text if self.buffer else text
+        events = []
+        append = events.append
+        containers = self.containers
+        expect_key = self.expect_key
+        match_token = TOKEN.match
+        position = 0
+        size = len(buffer)
+        while position < size:
+            match = match_token(buffer, position)
+            if match is None:
+                rest = buffer[position:].lstrip()
+                if rest and (final or not rest.startswith('"')):
+                    raise ValueError(f"Unexpected {rest[:20]!r} in JSON body")
+                break  # Whitespace, or a string that continues in the next chunk
+            group = match.lastindex
+            token = match.group(group)
+            if group == 1:
+                if token == ",":
+                    expect_key = containers[-1] == "map" if containers else False
+                elif token == ":":
+                    pass
+                elif token == "{":
+                    append(("start_map", None))
+                    containers.append("map")
+                    expect_key = True
+                elif token == "[":
+                    append(("start_array", None))
+                    containers.append("array")
+                    expect_key = False
+                else:
+                    if not containers:
+                        raise ValueError(f"Unexpected '{token}' in JSON body")
+                    append(("end_map" if containers.pop() == "map" else "end_array", None))
+                    expect_key = False
+            elif group == 2:
+                value = token[1:-1] if "\\" not in token else json.loads(token)
+                append(("map_key" if expect_key else "value", value))
+                expect_key = False
+            else:
+                if match.end() == size and not final:
+                    break  # The number or literal may continue in the next chunk
+                append(("value", LITERALS[token] if token in LITERALS else parse_number(token)))
+            position = match.end()
+        self.buffer = buffer[position:]
+        self.expect_key = expect_key
+        if final and (self.buffer.strip() or containers):
+            raise ValueError("Truncated JSON body")
+        return events
+
+def parse_number(token):
+    """A JSON number token as int or float."""
+    match = NUMBER.fullmatch(token)
+    if match is None:
+        raise ValueError(f"Invalid JSON value {token!r}")
+    return float(token) if match.group(1) or match.group(2) else int(token)
+
+class ValueBuilder:
+    """Builds the value of one matched container from the events inside it."""
+
+    def __init__(self, indices):
+        self.indices = indices  # Assertions the value belongs to
+        self.stack = []
+        self.key = None
+        self.value = None
+
+    def event(self, kind, value):
+        """Apply an event; returns True once the value is complete."""
+        if kind == "start_map" or kind == "start_array":
+            container = {} if kind == "start_map" else []
+            self.add(container)
+            self.stack.append(container)
+        elif kind == "end_map" or kind == "end_array":
+            self.stack.pop()
+            return not self.stack
+        elif kind == "map_key":
+            self.key = value
+        else:
+            self.add(value)
+        return False
+
+    def add(self, value):
+        if not self.stack:
+            self.value = value
+        elif isinstance(self.stack[-1], dict):
+            self.stack[-1][self.key] = value
+        else:
+            self.stack[-1].append(value)
+
+def check_streamable(assertions):
+    """Raise ValueError for paths streaming mode cannot match: a negative index needs the array's length, known only at its end."""
+    for assertion in assertions:
+        if any(token[0] == "index" and token[1] < 0 for token in assertion.tokens):
+            raise ValueError(f"Path '{assertion.label}' uses a negative index, which streaming mode does not support; "
+                             'use a non-negative index or "stream": false')
+
+class StreamingMatcher:
+    """Checks compiled assertions against parser events; only matched values are ever built in memory."""
+
+    def __init__(self, assertions):
+        check_streamable(assertions)
+        self.assertions = assertions
+        self.tokens = [assertion.tokens for assertion in assertions]
+        self.anywhere, self.root_states = initial_states(self.tokens)
+        self.found = [0] * len(assertions)
+        self.passed = [0] * len(assertions)
+        self.frames = []  # [kind, matcher states, next array index, pending map key] per open container
+        self.builders = []
+
+    def record(self, indices, value):
+        for index in indices:
+            self.found[index] += 1
+            if self.assertions[index].test(value):
+                self.passed[index] += 1
+
+    def feed(self, events):
+        frames = self.frames
+        tokens = self.tokens
+        anywhere = self.anywhere
+        for kind, value in events:
+            if kind == "map_key":
+                frames[-1][3] = value
+            elif kind == "end_map" or kind == "end_array":
+                frames.pop()
+            else:
+                # Matcher states of the value starting here, and the assertions it completes
+                if not frames:
+                    states = self.root_states
+                    hits = [index for index, position in states if position == len(tokens[index])]  # The "$" path
+                else:
+                    frame = frames[-1]
+                    if frame[0] == "map":
+                        key = frame[3]
+                        hits = list(anywhere[key]) if key in anywhere else []
+                    else:
+                        key = frame[2]
+                        frame[2] += 1
+                        hits = []
+                    states = advance(frame[1], tokens, key) if frame[1] else frame[1]
+                    for index, position in states:
+                        if position == len(tokens[index]):
+                            hits.append(index)
+                if kind == "value":
+                    if self.builders:
+                        self.feed_builders(kind, value)
+                    if hits:
+                        self.record(hits, value)
+                    continue
+                if self.builders:
+                    self.feed_builders(kind, value)
+                if hits:
+                    builder = ValueBuilder(hits)
+                    builder.event(kind, value)
+                    self.builders.append(builder)
+                frames.append(["map" if kind == "start_map" else "array", states, 0, None])
+                continue
+            if self.builders:
+                self.feed_builders(kind, value)
+
+    def feed_builders(self, kind, value):
+        done = [builder for builder in self.builders if builder.event(kind, value)]
+        for builder in done:
+            self.builders.remove(builder)
+            self.record(builder.indices, builder.value)
+
+    def results(self):
+        return [assertion_result(assertion, found, passed) for assertion, found, passed in zip(self.assertions, self.found, self.passed)]
+
+def read_body(response, assertions, options=None, chunk_size=CHUNK_SIZE):
+    """Check the response body: ([(passed, message)], size in bytes, hex digest or None).
+    Streaming mode reads it in chunks (the request must use stream=True) and keeps only matched values."""
+    options = options or BodyOptions()
+    digest = hashlib.new(options.hash) if options.hash else None
+    if not options.stream:
+        content = response.content
+        if options.max_bytes and len(content) > options.max_bytes:
+            raise ValueError(f"Response body of {len(content)} bytes exceeds max_bytes {options.max_bytes}")
+        if digest is not None:
+            digest.update(content)
+        results = check_assertions(response.json(), assertions) if assertions else []
+        return results, len(content), digest.hexdigest() if digest is not None else None
+
+    decoder = codecs.getincrementaldecoder("utf-8")()  # JSON bodies are UTF-8
+    parser = JsonEventParser()
+    matcher = StreamingMatcher(assertions) if assertions else None
+    size = 0
+    for chunk in response.iter_content(chunk_size):
+        size += len(chunk)
+        if options.max_bytes and size > options.max_bytes:
+            raise ValueError(f"Response body exceeds max_bytes {options.max_bytes}")
+        if digest is not None:
+            digest.update(chunk)
+        if matcher is not None:
+            matcher.feed(parser.feed(decoder.decode(chunk)))
+    if matcher is not None:
+        matcher.feed(parser.feed(decoder.decode(b"", final=True), final=True))
+    return matcher.results() if matcher is not None else [], size, digest.hexdigest() if digest is not None else None
+
+def stream_results(text, assertions, chunk_size):
+    """Assertion results of a JSON text fed to the streaming matcher chunk_size characters at a time."""
+    parser = JsonEventParser()
+    matcher = StreamingMatcher(assertions)
+    for start in range(0, len(text), chunk_size):
+        matcher.feed(parser.feed(text[start:start + chunk_size]))
+    matcher.feed(parser.feed("", final=True))
+    return matcher.results()
+
+def parity_errors(text, assertions, chunk_sizes=(1, 7, CHUNK_SIZE)):
+    """Differences between the in-memory check and streaming mode on one body, per chunk size (empty when they agree)."""
+    expected = check_assertions(json.loads(text), assertions)
+    errors = []
+    for chunk_size in chunk_sizes:
+        for assertion, wanted, got in zip(assertions, expected, stream_results(text, assertions, chunk_size)):
+            if wanted != got:
+                errors.append(f"{assertion.label} (chunks of {chunk_size}): in memory {wanted[1].strip()!r}, streamed {got[1].strip()!r}")
+    return errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that streaming mode gives the same assertion results as the in-memory check.")
+    parser.add_argument("body", help="JSON response body, e.g. the body of a recorded API stub exchange saved to a file")
+    parser.add_argument("step", help="ValidateAPIResponse TestData JSON (file or text) whose expected_response is checked")
+    args = parser.parse_args()
+
+    with open(args.body, "r", encoding="utf-8") as f:
+        text = f.read()
+    step = args.step
+    if not step.lstrip().startswith("{"):
+        with open(step, "r", encoding="utf-8") as f:
+            step = f.read()
+    assertions = compile_assertions(json.loads(step).get("expected_response"))
+    errors = parity_errors(text, assertions)
+    for error in errors:
+        print(error)
+    print(f"{len(assertions)} assertions: {'streaming and in-memory results differ' if errors else 'streaming matches the in-memory check'}")
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import configparser
+import fnmatch
+import logging
+import threading
+import weakref
+from typing import NamedTuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Resource types whose responses may be cached across contexts when cacheStaticAssets is on
+STATIC_RESOURCE_TYPES = frozenset({"stylesheet", "script", "font", "image"})
+# Upper bound of the in-memory static asset cache
+STATIC_CACHE_LIMIT = 200 * 1024 * 1024  # 200 MB
+
+class NetworkPolicy(NamedTuple):
+    block_resource_types: frozenset = frozenset()  # e.g. font, image, media: aborted
+    block_url_patterns: tuple = ()  # Glob patterns of URLs to abort (analytics, third parties)
+    stub_url_patterns: tuple = ()  # Glob patterns of URLs answered with an empty 200
+    cache_static_assets: bool = False
+
+    @property
+    def enabled(self):
+        return bool(self.block_resource_types or self.block_url_patterns or self.stub_url_patterns or self.cache_static_assets)
+
+    def decide(self, resource_type, url):
+        """Return 'block', 'stub', 'cache' or 'pass' for a request."""
+        if resource_type in self.block_resource_types or any(fnmatch.fnmatchcase(url, pattern) for pattern in self.block_url_patterns):
+            return "block"
+        if any(fnmatch.fnmatchcase(url, pattern) for pattern in self.stub_url_patterns):
+            return "stub"
+        if self.cache_static_assets and resource_type in STATIC_RESOURCE_TYPES:
+            return "cache"
+        return "pass"
+
+def split_list(value):
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+def read_network_policy(config, section, base=None):
+    """Read the network keys of a config section, falling back to `base` for keys it does not set."""
+    base = base or NetworkPolicy()
+    block_types = config.get(section, "blockResourceTypes", fallback=None)
+    block_urls = config.get(section, "blockUrlPatterns", fallback=None)
+    stub_urls = config.get(section, "stubUrlPatterns", fallback=None)
+    return NetworkPolicy(
+        block_resource_types=frozenset(t.lower() for t in split_list(block_types)) if block_types is not None else base.block_resource_types,
+        block_url_patterns=split_list(block_urls) if block_urls is not None else base.block_url_patterns,
+        stub_url_patterns=split_list(stub_urls) if stub_urls is not None else base.stub_url_patterns,
+        cache_static_assets=config.getboolean(section, "cacheStaticAssets", fallback=base.cache_static_assets),
+    )
+
+def load_network_policies(config):
+    """Return (default policy, {pack name: policy}) from [network] and the optional [network:<TestPackName>] sections."""
+    default = read_network_policy(config, "network") if config.has_section("network") else NetworkPolicy()
+    pack_policies = {
+        section.split(":", 1)[1].strip(): read_network_policy(config, section, default)
+        for section in config.sections() if section.startswith("network:")
+    }
+    return default, pack_policies
+
+class StaticAssetCache:
+    """Process-wide cache of static responses, shared by every context of the run."""
+
+    def __init__(self, limit=STATIC_CACHE_LIMIT):
+        self.limit = limit
+        self.size = 0
+        self.entries = {}  # URL -> (status, headers, body)
+        self.lock = threading.Lock()
+
+    def get(self, url):
+        return self.entries.get(url)
+
+    def put(self, url, status, headers, body):
+        with self.lock:
+            if url in self.entries or self.size + len(body) > self.limit:
+                return
+            self.entries[url] = (status, headers, body)
+            self.size += len(body)
+
+_static_cache = StaticAssetCache()
+
+class NetworkRouter:
+    """Routes every request of one page through the policy of the running test pack and counts what it saved."""
+
+    def __init__(self, default_policy, pack_policies):
+        self.default_policy = default_policy
+        self.pack_policies = pack_policies
+        self.policy = default_policy
+        self.stats = {}
+        self.installed = False  # page.route is registered once per page
+
+    def begin_test_case(self, test_pack_name):
+        self.policy = self.pack_policies.get(test_pack_name, self.default_policy)
+        self.stats = {"blocked": 0, "stubbed": 0, "cache_hits": 0, "bytes_from_cache": 0, "blocked_bytes_estimate": 0}
+
+    def summary(self):
+        return dict(self.stats)
+
+    def count_block(self, url):
+        self.stats["blocked"] += 1
+        cached = _static_cache.get(url)
+        if cached is not None:
+            self.stats["blocked_bytes_estimate"] += len(cached[2])  # Size known from an earlier unblocked run
+
+    def handle(self, route):
+        """page.route handler for playwright.sync_api."""
+        request = route.request
+        decision = self.policy.decide(request.resource_type, request.url)
+        if decision == "block":
+            self.count_block(request.url)
+            route.abort()
+        elif decision == "stub":
+            self.stats["stubbed"] += 1
+            route.fulfill(status=200, body="")
+        elif decision == "cache" and request.method == "GET":
+            cached = _static_cache.get(request.url)
+            if cached is not None:
+                status, headers, body = cached
+                self.stats["cache_hits"] += 1
+                self.stats["bytes_from_cache"] += len(body)
+                route.fulfill(status=status, headers=headers, body=body)
+                return
+            response = route.fetch()
+            body = response.body()
+            if response.ok:
+                _static_cache.put(request.url, response.status, response.headers, body)
+            route.fulfill(response=response, body=body)
+        else:
+            route.fallback()  # Leave it to other routes (e.g. HAR replay) or the network
+
+    async def handle_async(self, route):
+        """page.route handler for playwright.async_api."""
+        request = route.request
+        decision = self.policy.decide(request.resource_type, request.url)
+        if decision == "block":
+            self.count_block(request.url)
+            await route.abort()
+        elif decision == "stub":
+            self.stats["stubbed"] += 1
+            await route.fulfill(status=200, body="")
+        elif decision == "cache" and request.method == "GET":
+            cached = _static_cache.get(request.url)
+            if cached is not None:
+                status, headers, body = cached
+                self.stats["cache_hits"] += 1
+                self.stats["bytes_from_cache"] += len(body)
+                await route.fulfill(status=status, headers=headers, body=body)
+                return
+            response = await route.fetch()
+            body = await response.body()
+            if response.ok:
+                _static_cache.put(request.url, response.status, response.headers, body)
+            await route.fulfill(response=response, body=body)
+        else:
+            await route.fallback()
+
+# Network policies from config.ini, read once per process
+_policies = None
+# Page -> NetworkRouter, so a page reused by several test cases is routed once
+_routers = weakref.WeakKeyDictionary()
+
+def network_policies(config_path="config/config.ini"):
+    global _policies
+    if _policies is None:
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        _policies = load_network_policies(config)
+    return _policies
+
+def router_for(page):
+    """Return the page's router, creating it (without installing the route); None when no policy is configured."""
+    if page in _routers:
+        return _routers[page]
+    default_policy, pack_policies = network_policies()
+    if not default_policy.enabled and not any(policy.enabled for policy in pack_policies.values()):
+        return None
+    router = _routers[page] = NetworkRouter(default_policy, pack_policies)
+    return router
+
+def attach_network_policy(page, test_pack_name):
+    """Route the page through the network policy of a test pack (sync API); returns the router or None."""
+    router = router_for(page)
+    if router is None:
+        return None
+    if not router.installed:
+        page.route("**/*", router.handle)
+        router.installed = True
+    router.begin_test_case(test_pack_name)
+    return router
+
+async def attach_network_policy_async(page, test_pack_name):
+    """attach_network_policy for a playwright.async_api page."""
+    router = router_for(page)
+    if router is None:
+        return None
+    if not router.installed:
+        await page.route("**/*", router.handle_async)
+        router.installed = True
+    router.begin_test_case(test_pack_name)
+    return router
@@ -0,0 +1,81 @@
+import pandas as pd
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ObjectRecord:
+    """Compact ObjectMap entry with its chained selector resolved at load time."""
+    __slots__ = ("object_name", "application", "object_type", "parent_locator",
+                 "child_locator1", "child_locator2", "child_locator3", "locator", "selector", "kind")
+
+    def __init__(self, object_name, application=None, object_type=None, parent_locator=None,
+                 child_locator1=None, child_locator2=None, child_locator3=None):
+        self.object_name = object_name
+        self.application = application
+        self.object_type = object_type
+        self.parent_locator = parent_locator
+        self.child_locator1 = child_locator1
+        self.child_locator2 = child_locator2
+        self.child_locator3 = child_locator3
+        self.locator = parent_locator
+        self.selector = chain_selector(parent_locator, [child_locator1, child_locator2, child_locator3])
+        self.kind = selector_kind(self.selector)
+
+    def get(self, key, default=None):
+        """Dict-style access so handlers can keep using selector.get('parent_locator')."""
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def __repr__(self):
+        return f"ObjectRecord({self.object_name!r}, selector={self.selector!r}, kind={self.kind!r})"
+
+def clean_cell(value):
+    """Convert empty or NaN cells to None and strip strings."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    value = str(value).strip()
+    return value or None
+
+def chain_selector(parent_locator, child_locators):
+    """Build the '>>' chained selector; each child is only used if the previous locator exists."""
+    if parent_locator is None:
+        return ""
+    final_selector = parent_locator
+    for child_locator in child_locators:
+        if child_locator is None:
+            break
+        final_selector += " >> " + child_locator
+    return final_selector
+
+def selector_kind(selector):
+    """Detect whether the selector is XPath or CSS"""
+    selector = selector.strip()
+    if selector.startswith("//") or selector.startswith("("):
+        return "xpath"
+    return "css"
+
+def build_object_index(object_rows, sheet_name="ObjectMap"):
+    """Build an ObjectName -> ObjectRecord index from ObjectMap rows, reporting duplicate ObjectNames."""
+    index = {}
+    duplicates = {}
+    for row in object_rows:
+        object_name = clean_cell(row.get("ObjectName"))
+        if object_name is None:
+            continue
+        record = ObjectRecord(
+            object_name,
+            application=clean_cell(row.get("Application")),
+            object_type=clean_cell(row.get("ObjectType")),
+            parent_locator=clean_cell(row.get("ParentObjectLocator")),
+            child_locator1=clean_cell(row.get("ChildObjectLocator1")),
+            child_locator2=clean_cell(row.get("ChildObjectLocator2")),
+            child_locator3=clean_cell(row.get("ChildObjectLocator3")),
+        )
+        if object_name in index:
+            duplicates[object_name] = duplicates.get(object_name, 1) + 1
+            continue  # The first definition wins, matching the previous .iloc[0] lookup
+        index[object_name] = record
+    for object_name, count in duplicates.items():
+        logger.warning(f"Duplicate ObjectName '{object_name}' found {count} times in sheet '{sheet_name}'; using the first definition")
+    return index, sorted(duplicates)
@@ -0,0 +1,107 @@
+import hashlib
+import logging
+import os
+import pickle
+import re
+import shutil
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of the cached plan changes so old caches are ignored
+LOADER_VERSION = "3"
+DEFAULT_CACHE_DIR = ".plan_cache"
+# Entries of a workbook kept when a new one is written, most recently used first (switching branches reuses them)
+KEPT_ENTRIES = 3
+
+def workbook_digest(file_path, chunk_size=1024 * 1024):
+    """Return the SHA-256 of the workbook content (every sheet file for directory-based plans)."""
+    digest = hashlib.sha256()
+    if os.path.isdir(file_path):
+        paths = sorted(os.path.join(file_path, name) for name in os.listdir(file_path))
+    else:
+        paths = [file_path]
+    for path in paths:
+        if os.path.isdir(path):
+            continue
+        digest.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def entry_mtime(path):
+    """Last use of a cache entry; 0 when another process removed it meanwhile."""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0
+
+def clear_plan_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """Delete every compiled plan so the next load re-parses the workbook."""
+    if os.path.isdir(cache_dir):
+        shutil.rmtree(cache_dir)
+        logger.info(f"Cleared compiled plan cache in {cache_dir}")
+
+class PlanCache:
+    """On-disk cache of the parsed test plan, keyed by workbook content hash and loader version."""
+
+    def __init__(self, file_path, cache_dir=DEFAULT_CACHE_DIR):
+        self.file_path = file_path
+        self.cache_dir = cache_dir
+        self.key = f"v{LOADER_VERSION}-{workbook_digest(file_path)[:24]}"
+        self.workbook_dir = os.path.join(cache_dir, re.sub(r"[^\w.-]", "_", os.path.basename(file_path)))
+        self.entry_dir = os.path.join(self.workbook_dir, self.key)
+        self.touched = False  # Entry mtime refreshed by this process, so pruning sees it as recently used
+
+    def part_path(self, part):
+        """Return the file used to store one part of the plan."""
+        safe_name = re.sub(r"[^\w.-]", "_", part)
+        part_hash = hashlib.sha1(part.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.entry_dir, f"{safe_name}-{part_hash}.pkl")
+
+    def load(self, part):
+        """Return a cached part of the plan, or None when it is missing or unreadable."""
+        path = self.part_path(part)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable plan cache file {path}: {str(e)}")
+            return None
+        self.touch()
+        return value
+
+    def touch(self):
+        """Mark this entry as used, once per process."""
+        if not self.touched:
+            self.touched = True
+            try:
+                os.utime(self.entry_dir)
+            except OSError:
+                pass
+
+    def store(self, part, value):
+        """Write a part of the plan; the first write of a new entry prunes old entries of the workbook."""
+        try:
+            if not os.path.isdir(self.entry_dir):
+                os.makedirs(self.entry_dir, exist_ok=True)
+                self.prune_stale_entries()
+            path = self.part_path(part)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)  # Atomic so concurrent readers never see a partial file
+        except Exception as e:
+            logger.warning(f"Could not write plan cache for {self.file_path}: {str(e)}")
+
+    def prune_stale_entries(self, keep=KEPT_ENTRIES):
+        """Remove entries of this workbook built from other content or loader versions, except the `keep` most recently used."""
+        if not os.path.isdir(self.workbook_dir):
+            return
+        entries = [entry for entry in os.listdir(self.workbook_dir) if entry != self.key]
+        entries.sort(key=lambda entry: entry_mtime(os.path.join(self.workbook_dir, entry)), reverse=True)
+        for entry in entries[max(0, keep - 1):]:  # The current entry is one of the kept ones
+            shutil.rmtree(os.path.join(self.workbook_dir, entry), ignore_errors=True)
@@ -0,0 +1,167 @@
+import json
+import logging
+import re
+from typing import Any, Callable, NamedTuple, Optional
+import pandas as pd
+from actions.base_actions import BaseActions
+from actions.registry import get_action
+from utils.api_batch import load_api_specs, parse_batch_input
+from utils.api_client import API_METHODS
+from utils.api_load import load_options
+from utils.json_assertions import compile_assertions
+from utils.json_stream import body_options, check_streamable
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Test packs whose steps are evaluator rows rather than browser actions
+EVALUATION_PACKS = ("GenAIEvaluation",)
+# Actions that never touch an element, so their ObjectName is not resolved
+OBJECTLESS_ACTIONS = ("timedelay", "switchtomainframe", "validateapiresponse", "validateapibatch")
+# An ObjectName missing from the ObjectMap is used as a raw locator only when it looks like one:
+# xpath (//, (), an engine prefix (css=, text=, xpath=), or CSS syntax (#id, .class, [attr], combinators, pseudo-classes)
+SELECTOR_LIKE = re.compile(r"^(//|\(|[a-z-]+=)|[\s\[\]>:=#.]")
+
+class CompiledStep(NamedTuple):
+    """Immutable, fully resolved test step ready to run without touching the plan again."""
+    step_no: int
+    step_name: str
+    action: str
+    step_desc: Any
+    object_name: str
+    selector: Any  # ObjectRecord, {"locator": ...} fallback, or a URL for LaunchApplication
+    input_value: Any  # Typed: float for TimeDelay, dict for ValidateAPIResponse, ...
+    optional_data: Any
+    property_name: Any
+    handler: Optional[Callable]  # Called as handler(base_actions, step) -> (isOK, actual_result, expected_result)
+    row: dict  # Original step record (evaluation packs read their own columns)
+
+class PlanError(NamedTuple):
+    test_pack_name: str
+    test_case_id: Any
+    step_no: Optional[int]
+    message: str
+
+    def __str__(self):
+        location = f"{self.test_pack_name} / {self.test_case_id}"
+        if self.step_no is not None:
+            location += f" / step {self.step_no}"
+        return f"{location}: {self.message}"
+
+def blank_to_none(value):
+    """Convert empty or NaN cells to None."""
+    if value is None or (not isinstance(value, (str, dict, list)) and pd.isna(value)):
+        return None
+    if isinstance(value, str) and value.strip() == "":
+        return None
+    return value
+
+def bind_handler(action):
+    """Return the handler that runs an action, or None if no registered action supports it."""
+    if action == "launchapplication":
+        return BaseActions.launch_application
+    if get_action(action) is not None:
+        return BaseActions.run_step
+    return None
+
+def parse_input(action, input_value):
+    """Convert the TestData cell to the type the action expects; raises ValueError on bad input."""
+    if action in ("timedelay", "waitforelementexist"):
+        try:
+            number = float(input_value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{action} needs a numeric TestData value, got {input_value!r}")
+        return number if action == "timedelay" else int(number)
+    if action == "validateapiresponse":
+        if isinstance(input_value, dict):
+            return check_api_input(input_value)
+        try:
+            input_data = json.loads(input_value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid JSON input for API validation: {input_value} ({str(e)})")
+        return check_api_input(input_data)
+    if action == "validateapibatch":
+        batch = parse_batch_input(input_value)
+        for request_no, spec in enumerate(load_api_specs(batch["file"], batch.get("sheet")), start=1):
+            try:
+                check_api_input(spec)
+            except ValueError as e:
+                raise ValueError(f"{batch['file']} request {request_no}: {str(e)}")
+        return batch
+    return input_value
+
+def check_api_input(input_data):
+    """Check one API request spec (a ValidateAPIResponse input or a batch request) like the step will use it."""
+    if not isinstance(input_data, dict) or not input_data.get("url"):
+        raise ValueError("API validation input must be a JSON object with a 'url'")
+    method = str(input_data.get("method", "GET")).upper()
+    if method not in API_METHODS:
+        raise ValueError(f"Unsupported HTTP method: {method}. Supported: {', '.join(API_METHODS)}")
+    assertions = compile_assertions(input_data.get("expected_response"))  # Bad paths and operands are plan errors
+    load_options(input_data)
+    if body_options(input_data).stream:
+        check_streamable(assertions)
+    return input_data
+
+def compile_step(test_data, test_pack_name, step_no, step, base_url):
+    """Compile one step row; returns (CompiledStep or None, error message or None)."""
+    input_value = blank_to_none(step.get("TestData", None))
+    if test_pack_name in EVALUATION_PACKS:
+        return CompiledStep(step_no, "", "", step.get("StepDescription"), "NA", None, input_value,
+                            None, None, None, dict(step)), None
+
+    step_name = blank_to_none(step.get("StepName"))
+    if step_name is None:
+        return None, "StepName is empty"
+    action = str(step_name).strip().lower()
+    handler = bind_handler(action)
+    if handler is None:
+        return None, f"Unsupported action: {step_name}"
+
+    object_name = blank_to_none(step.get("ObjectName"))
+    object_name = "NA" if object_name is None else str(object_name).strip()
+    record = test_data.get_object_record(object_name)
+    if action == "launchapplication":
+        selector = base_url if object_name == "NA" else (record.locator if record is not None else object_name)
+    else:
+        if record is None and object_name != "NA" and action not in OBJECTLESS_ACTIONS and not SELECTOR_LIKE.search(object_name):
+            return None, (f"Unknown ObjectName '{object_name}': not in the ObjectMap and not a selector "
+                          "(prefix raw locators with css=, xpath= or text=)")
+        selector = record if record is not None else {"locator": object_name}
+
+    try:
+        input_value = parse_input(action, input_value)
+    except ValueError as e:
+        return None, str(e)
+
+    return CompiledStep(step_no, step_name, action, step.get("StepDescription"), object_name, selector, input_value,
+                        blank_to_none(step.get("OptionalData", None)), blank_to_none(step.get("PropertyName", None)),
+                        handler, dict(step)), None
+
+def compile_test_case(test_data, test_pack_name, automation_test_id, test_steps, base_url):
+    """Compile a test case's steps; returns (compiled steps, list of PlanError)."""
+    compiled_steps = []
+    errors = []
+    for step_no, step in enumerate(test_steps, start=1):
+        compiled_step, error = compile_step(test_data, test_pack_name, step_no, step, base_url)
+        if error is not None:
+            errors.append(PlanError(test_pack_name, automation_test_id, step_no, error))
+        else:
+            compiled_steps.append(compiled_step)
+    return tuple(compiled_steps), errors
+
+def validate_plan(test_data, test_pack_names, base_url):
+    """Compile every selected test case in one pass and return all errors; nothing is kept in memory."""
+    errors = []
+    compiled_count = 0
+    for test_pack_name in test_pack_names:
+        try:
+            test_cases = test_data.get_test_cases(test_pack_name)
+            for automation_test_id, test_steps in test_data.iter_test_steps(test_pack_name, test_cases["AutomationTestID"]):
+                compiled_steps, case_errors = compile_test_case(test_data, test_pack_name, automation_test_id, test_steps, base_url)
+                compiled_count += len(compiled_steps)
+                errors.extend(case_errors)
+        except Exception as e:
+            errors.append(PlanError(test_pack_name, "-", None, str(e)))
+    logger.info(f"Validated {compiled_count} steps in {len(test_pack_names)} test packs: {len(errors)} errors")
+    return errors
@@ -0,0 +1,99 @@
+import configparser
+import logging
+import pytest
+from utils.data_loader import DataLoader
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# One lazily created loader per process (controller or worker)
+_test_data = None
+
+def read_config():
+    """Read config/config.ini."""
+    config = configparser.ConfigParser()
+    config.read("config/config.ini")
+    return config
+
+def load_test_data():
+    """Create the process-wide DataLoader without parsing any pack; packs load on first use."""
+    global _test_data
+    if _test_data is None:
+        try:
+            config = read_config()
+            test_execution_sheet = config["playwright"]["testExecutionSheet"].strip()
+            streaming = config.getboolean("playwright", "streamingLoader", fallback=False)
+            plan_format = config.get("playwright", "planFormat", fallback="").strip() or None
+            _test_data = DataLoader(test_execution_sheet, preload=False, streaming=streaming, plan_format=plan_format)
+        except Exception as e:
+            logger.error(f"Error loading test data: {str(e)}")
+            pytest.fail(f"Test data error: {str(e)}")
+    return _test_data
+
+def selected_test_packs(session):
+    """Return the test packs of the collected items, in collection order."""
+    test_packs = []
+    for item in session.items:
+        callspec = getattr(item, "callspec", None)
+        if callspec is not None and "test_pack_name" in callspec.params and callspec.params["test_pack_name"] not in test_packs:
+            test_packs.append(callspec.params["test_pack_name"])
+    return test_packs
+
+def validate_selected_packs(session):
+    """Compile every step of the selected packs and return all plan errors."""
+    from utils.plan_compiler import validate_plan
+    base_url = read_config().get("playwright", "base_url", fallback="").strip()
+    return validate_plan(load_test_data(), selected_test_packs(session), base_url)
+
+def pytest_addoption(parser):
+    """Register the plan validation option."""
+    parser.addoption(
+        "--validate-plan",
+        action="store_true",
+        default=False,
+        help="Compile and validate the selected test packs without launching a browser.",
+    )
+
+def pytest_configure(config):
+    """Register the action plugins listed in config.ini before any plan is compiled."""
+    from actions.registry import load_configured_action_plugins
+    load_configured_action_plugins(read_config())
+
+def pytest_generate_tests(metafunc):
+    """Parametrize test_pack_name from the TestPacks sheet (or the compiled plan cache) only."""
+    if "test_pack_name" in metafunc.fixturenames:
+        test_packs = list(load_test_data().get_test_packs()["TestPackName"])
+        logger.info(f"Loaded test packs: {test_packs}")
+        metafunc.parametrize("test_pack_name", test_packs)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    """In --validate-plan mode, report every plan error and skip running the tests."""
+    if not session.config.getoption("--validate-plan"):
+        return None
+    errors = validate_selected_packs(session)
+    reporter = session.config.pluginmanager.get_plugin("terminalreporter")
+    for error in errors:
+        reporter.write_line(f"PLAN ERROR {error}", red=True)
+    reporter.write_line(f"Plan validation: {len(errors)} errors", red=bool(errors), green=not errors)
+    if errors:
+        session.testsfailed = len(errors)
+    return True
+
+@pytest.fixture(scope="session")
+def test_data():
+    """Session-wide DataLoader; each pack's cases and steps are parsed on the worker that runs it."""
+    return load_test_data()
+
+@pytest.fixture(scope="session")
+def validated_plan(request):
+    """Validate the selected packs once, before any browser is launched."""
+    errors = validate_selected_packs(request.session)
+    if errors:
+        pytest.fail(f"Test plan has {len(errors)} errors:\n" + "\n".join(str(error) for error in errors), pytrace=False)
+    return True
+
+def pytest_sessionfinish(session, exitstatus):
+    """Report how often the workbook was parsed in this process."""
+    if _test_data is not None:
+        logger.info(f"Workbook parse count for the session: {_test_data.parse_count}")
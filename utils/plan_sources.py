@@ -0,0 +1,252 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import zipfile
+from abc import ABC, abstractmethod
+import xml.etree.ElementTree as ET
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SPREADSHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+RELATIONSHIP_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+SHARED_STRING_CELL = re.compile(rb'<c\b[^>]*\bt="s"[^>]*>\s*<v>(\d+)</v>')
+
+def file_digest(path):
+    """Return the SHA-1 of a file's content."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ExcelPlanSource:
+    """Test plan stored as an Excel workbook, one sheet per plan sheet."""
+    format_name = "xlsx"
+
+    def __init__(self, path):
+        self.path = path
+        self.excel_file = None  # Opened once on first use
+
+    def open(self):
+        if self.excel_file is None:
+            self.excel_file = pd.ExcelFile(self.path)
+        return self.excel_file
+
+    def sheet_names(self):
+        return self.open().sheet_names
+
+    def read_sheets(self, sheet_names):
+        """Parse the given sheets in one pass."""
+        return pd.read_excel(self.open(), sheet_name=list(sheet_names))
+
+    def reset(self):
+        """Forget the opened workbook so the next read sees the file on disk."""
+        if self.excel_file is not None:
+            self.excel_file.close()
+        self.excel_file = None
+
+    def sheet_fingerprints(self):
+        """Fingerprint each sheet from the raw .xlsx parts without parsing cells.
+
+        A sheet's fingerprint covers its worksheet XML and the shared strings it references,
+        so editing a string used by one sheet only changes that sheet's fingerprint.
+        """
+        with zipfile.ZipFile(self.path) as archive:
+            workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+            relations = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+            targets = {relation.get("Id"): relation.get("Target") for relation in relations}
+            shared_strings = []
+            if "xl/sharedStrings.xml" in archive.namelist():
+                for item in ET.fromstring(archive.read("xl/sharedStrings.xml")).iter(f"{SPREADSHEET_NS}si"):
+                    shared_strings.append("".join(text.text or "" for text in item.iter(f"{SPREADSHEET_NS}t")))
+
+            fingerprints = {}
+            for sheet in workbook.iter(f"{SPREADSHEET_NS}sheet"):
+                target = targets[sheet.get(f"{RELATIONSHIP_NS}id")].lstrip("/")
+                member = target if target.startswith("xl/") else f"xl/{target}"
+                sheet_xml = archive.read(member)
+                digest = hashlib.sha1(sheet_xml)
+                for index in SHARED_STRING_CELL.findall(sheet_xml):
+                    digest.update(shared_strings[int(index)].encode("utf-8"))
+                    digest.update(b"\0")
+                fingerprints[sheet.get("name")] = digest.hexdigest()
+            return fingerprints
+
+class DirectoryPlanSource(ABC):
+    """Test plan stored as a directory with one file per sheet, named '<sheet name><extension>'; subclasses read one sheet file."""
+    format_name = None
+    extension = None
+
+    def __init__(self, path):
+        self.path = path
+
+    def sheet_names(self):
+        if not os.path.isdir(self.path):
+            raise ValueError(f"Test plan directory not found: {self.path}")
+        return sorted(name[:-len(self.extension)] for name in os.listdir(self.path) if name.endswith(self.extension))
+
+    def sheet_path(self, sheet_name):
+        return os.path.join(self.path, f"{sheet_name}{self.extension}")
+
+    def read_sheets(self, sheet_names):
+        return {sheet_name: self.read_sheet(self.sheet_path(sheet_name)) for sheet_name in sheet_names}
+
+    @abstractmethod
+    def read_sheet(self, path):
+        """One sheet file as a DataFrame."""
+
+    def reset(self):
+        pass
+
+    def sheet_fingerprints(self):
+        """Fingerprint each sheet file by content."""
+        return {sheet_name: file_digest(self.sheet_path(sheet_name)) for sheet_name in self.sheet_names()}
+
+class CsvPlanSource(DirectoryPlanSource):
+    format_name = "csv"
+    extension = ".csv"
+
+    def read_sheet(self, path):
+        return pd.read_csv(path)
+
+class ParquetPlanSource(DirectoryPlanSource):
+    format_name = "parquet"
+    extension = ".parquet"
+
+    def read_sheet(self, path):
+        return pd.read_parquet(path)  # Requires pyarrow or fastparquet
+
+class JsonPlanSource:
+    """Test plan stored as one JSON document: {"<sheet name>": [{"<column>": <value>, ...}, ...]}."""
+    format_name = "json"
+
+    def __init__(self, path):
+        self.path = path
+        self.document = None  # Loaded once on first use
+
+    def load_document(self, f):
+        return json.load(f)
+
+    def open(self):
+        if self.document is None:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.document = self.load_document(f)
+            if not isinstance(self.document, dict):
+                raise ValueError(f"Test plan {self.path} must map sheet names to lists of rows")
+        return self.document
+
+    def sheet_names(self):
+        return list(self.open().keys())
+
+    def read_sheets(self, sheet_names):
+        document = self.open()
+        return {sheet_name: pd.DataFrame(document[sheet_name]) for sheet_name in sheet_names}
+
+    def reset(self):
+        """Forget the loaded document so the next read sees the file on disk."""
+        self.document = None
+
+    def sheet_fingerprints(self):
+        """Fingerprint each sheet by its rows (the whole document has to be read)."""
+        self.reset()
+        return {
+            sheet_name: hashlib.sha1(json.dumps(rows, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            for sheet_name, rows in self.open().items()
+        }
+
+class YamlPlanSource(JsonPlanSource):
+    """Test plan stored as one YAML document with the same layout as the JSON source."""
+    format_name = "yaml"
+
+    def load_document(self, f):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML test plans require PyYAML: pip install pyyaml")
+        return yaml.safe_load(f)
+
+PLAN_SOURCES = {
+    "xlsx": ExcelPlanSource,
+    "csv": CsvPlanSource,
+    "json": JsonPlanSource,
+    "yaml": YamlPlanSource,
+    "parquet": ParquetPlanSource,
+}
+
+FILE_EXTENSIONS = {
+    ".xlsx": "xlsx",
+    ".xlsm": "xlsx",
+    ".json": "json",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+}
+
+def detect_plan_format(path):
+    """Pick the backend from the file extension, or from the sheet files inside a directory."""
+    if os.path.isdir(path):
+        names = os.listdir(path)
+        for plan_format, extension in (("csv", ".csv"), ("parquet", ".parquet")):
+            if any(name.endswith(extension) for name in names):
+                return plan_format
+        raise ValueError(f"Cannot detect the test plan format of directory {path}; set planFormat in config.ini")
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FILE_EXTENSIONS:
+        raise ValueError(f"Unsupported test plan file {path}. Supported: {', '.join(sorted(FILE_EXTENSIONS))}, or a directory of .csv/.parquet files")
+    return FILE_EXTENSIONS[extension]
+
+def open_plan_source(path, plan_format=None):
+    """Return the plan source for a path; plan_format ('xlsx', 'csv', 'json', 'yaml', 'parquet') overrides detection."""
+    plan_format = (plan_format or detect_plan_format(path)).lower()
+    if plan_format not in PLAN_SOURCES:
+        raise ValueError(f"Unsupported planFormat '{plan_format}'. Supported: {', '.join(PLAN_SOURCES)}")
+    return PLAN_SOURCES[plan_format](path)
+
+def json_ready(df):
+    """Convert a sheet to JSON-serialisable rows with empty cells as null."""
+    return df.astype(object).where(pd.notna(df), None).to_dict("records")
+
+def export_plan(source_path, destination, plan_format):
+    """Export every sheet of a test plan (usually the authoring .xlsx) to csv, json, yaml or parquet."""
+    source = open_plan_source(source_path)
+    sheets = source.read_sheets(source.sheet_names())
+
+    if plan_format in ("csv", "parquet"):
+        os.makedirs(destination, exist_ok=True)
+        for sheet_name, df in sheets.items():
+            path = os.path.join(destination, f"{sheet_name}.{plan_format}")
+            if plan_format == "csv":
+                df.to_csv(path, index=False)
+            else:
+                df.to_parquet(path, index=False)  # Requires pyarrow or fastparquet
+    elif plan_format in ("json", "yaml"):
+        document = {sheet_name: json_ready(df) for sheet_name, df in sheets.items()}
+        with open(destination, "w", encoding="utf-8") as f:
+            if plan_format == "json":
+                json.dump(document, f, indent=2, default=str)
+            else:
+                import yaml
+                yaml.safe_dump(json.loads(json.dumps(document, default=str)), f, sort_keys=False, allow_unicode=True)
+    else:
+        raise ValueError(f"Unsupported export format '{plan_format}'. Supported: csv, json, yaml, parquet")
+    logger.info(f"Exported {len(sheets)} sheets from {source_path} to {destination} ({plan_format})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the test plan workbook to a faster format for CI.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Export a test plan to csv, json, yaml or parquet")
+    export_parser.add_argument("source", help="Source test plan, e.g. Testware/TestDriver_VersionsEnquiries.xlsx")
+    export_parser.add_argument("destination", help="Output file (json/yaml) or directory (csv/parquet)")
+    export_parser.add_argument("--format", dest="plan_format", choices=["csv", "json", "yaml", "parquet"],
+                               help="Output format; defaults to the destination extension")
+    args = parser.parse_args()
+
+    plan_format = args.plan_format or os.path.splitext(args.destination)[1].lstrip(".").lower().replace("yml", "yaml")
+    export_plan(args.source, args.destination, plan_format)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import atexit
+import configparser
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+from typing import NamedTuple, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Screenshots are written under the report directory so the HTML report can link them relatively
+REPORT_DIR = "reports"
+SCREENSHOT_DIR = os.path.join(REPORT_DIR, "screenshots")
+# Maps "<pack>/<test case>/<step>" to the content-addressed screenshot file
+MANIFEST_NAME = "manifest.json"
+# Files the store writes: SHA-256 of the image bytes plus its extension
+STORED_FILE_NAME = re.compile(r"^[0-9a-f]{64}\.(png|jpg)$")
+
+SCREENSHOT_POLICIES = ("always", "on_failure", "every_n")
+IMAGE_TYPES = {"png": "png", "jpeg": "jpeg", "jpg": "jpeg"}
+
+class ScreenshotPolicy(NamedTuple):
+    mode: str = "always"  # always, on_failure or every_n
+    every_n: int = 5  # every_n mode: capture steps N, 2N, ... (and every failed step)
+    image_type: str = "png"  # png or jpeg
+    quality: Optional[int] = None  # JPEG quality 1-100
+    full_page: bool = False
+    clip_selector: Optional[str] = None  # Capture only this element instead of the viewport
+
+    def should_capture(self, step_no, isOK):
+        """Return True if this step gets a screenshot."""
+        if self.mode == "always":
+            return True
+        if isOK:
+            return True  # on_failure and every_n both keep the evidence of a failed step
+        return self.mode == "every_n" and step_no % self.every_n == 0
+
+    def screenshot_options(self):
+        """Keyword arguments for Page.screenshot / Locator.screenshot."""
+        options = {"type": self.image_type}
+        if self.image_type == "jpeg" and self.quality is not None:
+            options["quality"] = self.quality
+        if self.clip_selector is None:
+            options["full_page"] = self.full_page
+        return options
+
+def load_screenshot_policy(config):
+    """Build the screenshot policy from the screenshot* keys of the [playwright] section."""
+    mode = config.get("playwright", "screenshotPolicy", fallback="always").strip().lower() or "always"
+    if mode not in SCREENSHOT_POLICIES:
+        raise ValueError(f"Unsupported screenshotPolicy '{mode}'. Supported: {', '.join(SCREENSHOT_POLICIES)}")
+    image_type = config.get("playwright", "screenshotType", fallback="png").strip().lower() or "png"
+    if image_type not in IMAGE_TYPES:
+        raise ValueError(f"Unsupported screenshotType '{image_type}'. Supported: png, jpeg")
+    quality = config.get("playwright", "screenshotQuality", fallback="").strip()
+    clip_selector = config.get("playwright", "screenshotClip", fallback="").strip()
+    return ScreenshotPolicy(
+        mode=mode,
+        every_n=max(1, config.getint("playwright", "screenshotEveryN", fallback=5)),
+        image_type=IMAGE_TYPES[image_type],
+        quality=min(100, max(1, int(quality))) if quality else None,
+        full_page=config.getboolean("playwright", "screenshotFullPage", fallback=False),
+        clip_selector=clip_selector or None,
+    )
+
+class ScreenshotWriter:
+    """Writes captured screenshot bytes to disk on a background thread."""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.write_loop, name="screenshot-writer", daemon=True)
+        self.thread.start()
+
+    def write_loop(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                path, data = item
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{os.getpid()}.tmp"  # Worker processes may write the same frame
+                with open(temp_path, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, path)  # A file under its hash name is always complete
+            except Exception as e:
+                logger.error(f"Could not write screenshot: {str(e)}")
+            finally:
+                self.queue.task_done()
+
+    def submit(self, path, data):
+        """Queue the bytes for writing and return immediately."""
+        self.queue.put((path, data))
+
+    def flush(self):
+        """Block until every queued screenshot is on disk."""
+        self.queue.join()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+def manifest_key(test_pack_name, test_case_id, step_no):
+    return f"{test_pack_name}/{test_case_id}/{step_no}"
+
+class ScreenshotStore:
+    """Content-addressed screenshot directory: identical frames are stored once, under their SHA-256."""
+
+    def __init__(self, directory=SCREENSHOT_DIR, writer=None):
+        self.directory = directory
+        self.writer = writer or get_screenshot_writer()
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self.manifest = {}  # This run's captures only; saved over the previous run's manifest
+        self.stored = set()  # File names known to exist or already queued
+
+    @staticmethod
+    def read_manifest(manifest_path):
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable screenshot manifest {manifest_path}: {str(e)}")
+            return {}
+
+    def put(self, key, data, extension):
+        """Record the capture of one step and queue the file only if this content is new."""
+        file_name = f"{hashlib.sha256(data).hexdigest()}.{extension}"
+        if file_name not in self.stored:
+            self.stored.add(file_name)
+            path = self.file_path(file_name)
+            if not os.path.exists(path):
+                self.writer.submit(path, data)
+        self.manifest[key] = file_name
+        return file_name
+
+    def file_path(self, file_name):
+        return os.path.join(self.directory, file_name).replace(os.sep, "/")
+
+    def resolve(self, key):
+        """Return the screenshot path (under reports/) for a manifest key, or None."""
+        file_name = self.manifest.get(key)
+        return self.file_path(file_name) if file_name else None
+
+    def entries(self, keys):
+        """Return the manifest entries for some keys (worker processes send these to the controller)."""
+        return {key: self.manifest[key] for key in keys if key in self.manifest}
+
+    def begin_run(self):
+        """Start a new run's manifest in a long-lived process (the runner daemon)."""
+        self.manifest = {}
+
+    def prune(self):
+        """Delete stored files the manifest no longer references; returns how many were removed."""
+        if not os.path.isdir(self.directory):
+            return 0
+        referenced = set(self.manifest.values())
+        removed = 0
+        for file_name in os.listdir(self.directory):
+            if not STORED_FILE_NAME.match(file_name) or file_name in referenced:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, file_name))
+                self.stored.discard(file_name)
+                removed += 1
+            except OSError as e:
+                logger.warning(f"Could not remove unreferenced screenshot {file_name}: {str(e)}")
+        return removed
+
+    def save_manifest(self):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+
+# One writer thread and one store per process, created on first use
+_writer = None
+_store = None
+
+def get_screenshot_writer():
+    global _writer
+    if _writer is None:
+        _writer = ScreenshotWriter()
+        atexit.register(_writer.close)
+    return _writer
+
+def get_screenshot_store():
+    global _store
+    if _store is None:
+        _store = ScreenshotStore()
+    return _store
+
+def begin_screenshot_run():
+    """Start a new run in a long-lived process (the runner daemon), so its manifest covers only that run."""
+    get_screenshot_store().begin_run()
+
+def flush_screenshots():
+    """Wait for pending screenshot writes, save the manifest and remove files of earlier runs (call before publishing the report)."""
+    if _writer is not None:
+        _writer.flush()
+    if _store is not None:
+        _store.save_manifest()
+        removed = _store.prune()
+        if removed:
+            logger.info(f"Removed {removed} screenshots no longer referenced by the manifest")
+
+class Screenshotter:
+    """Applies the screenshot policy and hands captures to the content-addressed store."""
+
+    def __init__(self, policy=None, store=None):
+        self.policy = policy or ScreenshotPolicy()
+        self.store = store or get_screenshot_store()
+        self.test_pack_name = None
+        self.test_case_id = None
+
+    @classmethod
+    def from_config(cls, config_path="config/config.ini"):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        return cls(load_screenshot_policy(config))
+
+    def begin_test_case(self, test_pack_name, test_case_id):
+        """Set the pack and test case that the next captures belong to."""
+        self.test_pack_name = test_pack_name
+        self.test_case_id = test_case_id
+
+    def screenshot_target(self, page):
+        """The page, or the element the policy clips to."""
+        if self.policy.clip_selector is not None:
+            return page.locator(self.policy.clip_selector).first
+        return page
+
+    def record(self, step_no, data):
+        """Store the captured bytes of a step and return its manifest key."""
+        key = manifest_key(self.test_pack_name, self.test_case_id, step_no)
+        self.store.put(key, data, "jpg" if self.policy.image_type == "jpeg" else "png")
+        return key
+
+    def capture(self, page, step_no, isOK):
+        """Capture one step if the policy wants it; returns its manifest key or None."""
+        if not self.policy.should_capture(step_no, isOK):
+            return None
+        return self.record(step_no, self.screenshot_target(page).screenshot(**self.policy.screenshot_options()))
+
+    async def capture_async(self, page, step_no, isOK):
+        """capture() for a playwright.async_api page."""
+        if not self.policy.should_capture(step_no, isOK):
+            return None
+        return self.record(step_no, await self.screenshot_target(page).screenshot(**self.policy.screenshot_options()))
+
+def load_manifest(report_dir=REPORT_DIR):
+    """Read the screenshot manifest written next to the report."""
+    return ScreenshotStore.read_manifest(os.path.join(report_dir, "screenshots", MANIFEST_NAME))
@@ -0,0 +1,251 @@
+import asyncio
+from datetime import datetime
+import logging
+import pandas as pd
+from utils.ai_evaluator import perform_evaluation
+from actions.base_actions import BaseActions
+from utils.har import har_settings, har_test_case_page
+from utils.network_policy import attach_network_policy, attach_network_policy_async
+from utils.plan_compiler import blank_to_none, compile_test_case
+from utils.tracing import get_tracer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def evaluation_args(step):
+    """Arguments of perform_evaluation for a GenAIEvaluation step."""
+    script_id = step.row["ScriptId"]
+    evaluators = step.row["Evaluators"]
+    query = step.row["Query"]
+    context = step.row["Context"]
+    ground_truth = step.row["Ground_Truth"]
+    # Handle NaN values
+    query = query if pd.notna(query) else ""
+    context = context if pd.notna(context) else ""
+    ground_truth = ground_truth if pd.notna(ground_truth) else ""
+
+    logger.info(f"Evaluating response with query: {query}, context: {context}, ground_truth: {ground_truth}")
+    return script_id, step.step_no, step.step_desc, evaluators, query, context, ground_truth, step.input_value
+
+def step_span_attributes(step, page):
+    """Attributes of a step span; the run profile groups steps by action, object and page."""
+    return {
+        "step.no": step.step_no,
+        "step.action": step.action,
+        "step.object": step.object_name if step.object_name != "NA" else None,  # NA: the step has no object
+        "page.url": page.url.split("?")[0] if page is not None else None,
+    }
+
+def test_case_status(isOK):
+    """Report status of a test case from its isOK (0 = every step passed and the plan compiled)."""
+    return "Fail" if isOK else "Pass"
+
+def plan_error_result(test_case_result, plan_errors, test_steps):
+    """Fail a test case whose plan has errors without running it: one failed step row per error, in step order."""
+    steps = list(test_steps)
+    for plan_error in plan_errors:
+        logger.error(f"Plan error: {plan_error}")
+        step = steps[plan_error.step_no - 1] if plan_error.step_no else {}
+        test_case_result["steps"].append({
+            "step_no": plan_error.step_no,
+            "step_desc": blank_to_none(step.get("StepDescription")) or "",
+            "expected_result": "Step compiles (supported action, ObjectMap name or selector, valid TestData)",
+            "actual_result": f"Plan error: {plan_error.message}",
+            "status": "Fail",
+            "screenshot_key": None
+        })
+    test_case_result["elapsed_time"] = 0
+    test_case_result["status"] = test_case_status(1)
+    return test_case_result, 1
+
+def new_test_case_result(automation_test_id):
+    """Result of a test case before it runs; the executors fill in its steps, status and elapsed time."""
+    return {
+        "test_case_id": automation_test_id,
+        "status": "Pass",  # Default status
+        "steps": [],
+        "elapsed_time": None  # Placeholder for elapsed time
+    }
+
+def compile_steps(test_data, test_pack_name, automation_test_id, test_steps, base_url):
+    """Compile the steps in a plan.compile span: handlers, selectors and typed inputs are resolved before anything runs."""
+    with get_tracer().span("plan.compile", **{"plan.steps": len(test_steps)}):
+        return compile_test_case(test_data, test_pack_name, automation_test_id, test_steps, base_url)
+
+def evaluation_step_result(step, step_isOK, actual_result, expected_result, output_path):
+    return {
+        "step_no": step.step_no,
+        "step_desc": step.step_desc,
+        "expected_result": expected_result,
+        "actual_result": actual_result,
+        "status": "Pass" if step_isOK == 0 else "Fail",
+        "evaluator_path": output_path  # No screenshot for GenAIEvaluation steps
+    }
+
+def action_step_result(step, step_isOK, actual_result, expected_result, screenshot_key, step_extras):
+    step_result = {
+        "step_no": step.step_no,
+        "step_desc": step.step_desc,
+        "expected_result": expected_result,
+        "actual_result": actual_result,
+        "status": "Pass" if step_isOK == 0 else "Fail",
+        "screenshot_key": screenshot_key  # Resolved through the screenshot manifest by the report
+    }
+    step_result.update(step_extras)  # Batch sub-steps, API latency profile
+    return step_result
+
+def step_error_result(step, error, screenshot_key):
+    """Failed step row for an action that raised."""
+    actual_result = f"Error: {str(error)}"
+    logger.error(f"Step {step.step_no} failed: {actual_result}")
+    return {
+        "step_no": step.step_no,
+        "step_desc": step.step_desc,
+        "expected_result": "Action performed successfully",
+        "actual_result": actual_result,
+        "status": "Fail",
+        "screenshot_key": screenshot_key
+    }
+
+def add_step_result(test_case_result, step_span, step_result):
+    """Append a step row and fail its span if the step failed; returns the step's isOK."""
+    test_case_result["steps"].append(step_result)
+    if step_result["status"] == "Fail":
+        step_span.fail(step_result["actual_result"])
+        return 1
+    return 0
+
+def finish_test_case_result(test_case_result, isOK, start_time, network):
+    """Set the elapsed time, network savings and status once every step has run."""
+    test_case_result["elapsed_time"] = round((datetime.now() - start_time).total_seconds(), 2)
+    if network is not None:
+        test_case_result["network"] = network.summary()
+        logger.info(f"Network savings for {test_case_result['test_case_id']}: {test_case_result['network']}")
+    test_case_result["status"] = test_case_status(isOK)
+    return test_case_result, isOK
+
+def end_test_case_span(span, test_case_result):
+    span.set(**{"test.status": test_case_result["status"], "test.steps": len(test_case_result["steps"])})
+    if test_case_result["status"] != "Pass":
+        span.fail(f"Test case {test_case_result['test_case_id']} failed")
+
+def run_test_case(page, base, test_data, test_pack_name, automation_test_id, test_steps, base_url):
+    """Compile and run one test case; returns (test case result for the HTML report, isOK)."""
+    settings = har_settings()
+    with get_tracer().span("test_case", **{"test.pack": test_pack_name, "test.case_id": automation_test_id}) as span:
+        if settings.mode == "off":
+            test_case_result, isOK = execute_test_case(page, base, test_data, test_pack_name, automation_test_id, test_steps, base_url)
+        else:
+            # HAR record/replay: the test case gets a context of its own so its traffic maps to one HAR file
+            with har_test_case_page(page, base, settings, test_pack_name, automation_test_id) as har_page:
+                test_case_result, isOK = execute_test_case(har_page, base, test_data, test_pack_name, automation_test_id, test_steps, base_url)
+        end_test_case_span(span, test_case_result)
+    return test_case_result, isOK
+
+def execute_test_case(page, base, test_data, test_pack_name, automation_test_id, test_steps, base_url):
+    """Run one test case on the given page."""
+    test_case_result = new_test_case_result(automation_test_id)
+    isOK = 0  # 0 = Success, 1 = Failure (for the entire test case)
+    tracer = get_tracer()
+
+    compiled_steps, plan_errors = compile_steps(test_data, test_pack_name, automation_test_id, test_steps, base_url)
+    if plan_errors:
+        # The other steps would run against a page the failed step never prepared
+        return plan_error_result(test_case_result, plan_errors, test_steps)
+
+    base.screenshotter.begin_test_case(test_pack_name, automation_test_id)  # Screenshots are keyed by pack/test case/step
+    network = attach_network_policy(page, test_pack_name)  # Blocks/stubs/caches resources per [network] in config.ini
+    start_time = datetime.now()
+
+    for step in compiled_steps:
+        with tracer.span("step", **step_span_attributes(step, page)) as step_span:
+            if test_pack_name == "GenAIEvaluation":
+                step_result = evaluation_step_result(step, *perform_evaluation(*evaluation_args(step)))
+            else:
+                screenshot_key = None
+                try:
+                    # The compiler bound the handler (LaunchApplication or a registered action)
+                    base.captured_step = None
+                    base.step_extras = {}
+                    step_isOK, actual_result, expected_result = step.handler(base, step)
+                    # One capture per step: reuse the one perform_action took for the step log
+                    if base.captured_step != step.step_no:
+                        base.capture_screenshot(step.step_no, step_isOK)
+                    screenshot_key = base.step_screenshot
+                    step_result = action_step_result(step, step_isOK, actual_result, expected_result, screenshot_key, base.step_extras)
+                except Exception as e:
+                    step_result = step_error_result(step, e, screenshot_key)
+            if add_step_result(test_case_result, step_span, step_result) == 1:
+                isOK = 1  # Mark test case as failed if any step fails
+
+    return finish_test_case_result(test_case_result, isOK, start_time, network)
+
+def run_test_pack(browser, test_data, test_pack_name, base_url, screenshotter, test_case_ids=None, context_pool=None):
+    """Run a pack (optionally only some AutomationTestIDs) in a fresh context of a launched browser; yields each test case result."""
+    # Fresh state per pack, no browser launch; pooled contexts are already logged in
+    context = context_pool.acquire() if context_pool is not None else browser.new_context()
+    try:
+        page = context.new_page()
+        page.set_default_timeout(60000)  # 60 seconds
+        base = BaseActions(page, [], screenshotter)
+        all_test_case_ids = test_data.get_test_cases(test_pack_name)["AutomationTestID"]
+        if test_case_ids:
+            wanted_ids = {str(test_case_id).strip().lower() for test_case_id in test_case_ids}
+            all_test_case_ids = [test_case_id for test_case_id in all_test_case_ids if str(test_case_id).strip().lower() in wanted_ids]
+        for automation_test_id, test_steps in test_data.iter_test_steps(test_pack_name, all_test_case_ids):
+            logger.info(f"Running test case: {automation_test_id}")
+            test_case_result, isOK = run_test_case(page, base, test_data, test_pack_name, automation_test_id, test_steps, base_url)
+            yield test_case_result
+    finally:
+        if context_pool is not None:
+            context_pool.release(context)
+        else:
+            context.close()
+
+async def run_test_case_async(base, test_data, test_pack_name, automation_test_id, test_steps, base_url):
+    """run_test_case for the async engine (AsyncBaseActions); same result format, steps run in order."""
+    with get_tracer().span("test_case", **{"test.pack": test_pack_name, "test.case_id": automation_test_id}) as span:
+        test_case_result, isOK = await execute_test_case_async(base, test_data, test_pack_name, automation_test_id, test_steps, base_url)
+        end_test_case_span(span, test_case_result)
+    return test_case_result, isOK
+
+async def execute_test_case_async(base, test_data, test_pack_name, automation_test_id, test_steps, base_url):
+    """Run one test case on the base's page; execute_test_case with the actions awaited."""
+    test_case_result = new_test_case_result(automation_test_id)
+    isOK = 0  # 0 = Success, 1 = Failure (for the entire test case)
+    tracer = get_tracer()
+
+    compiled_steps, plan_errors = compile_steps(test_data, test_pack_name, automation_test_id, test_steps, base_url)
+    if plan_errors:
+        # The other steps would run against a page the failed step never prepared
+        return plan_error_result(test_case_result, plan_errors, test_steps)
+
+    base.screenshotter.begin_test_case(test_pack_name, automation_test_id)  # Screenshots are keyed by pack/test case/step
+    network = await attach_network_policy_async(base.main_page, test_pack_name)
+    start_time = datetime.now()
+
+    for step in compiled_steps:
+        with tracer.span("step", **step_span_attributes(step, base.main_page)) as step_span:
+            if test_pack_name == "GenAIEvaluation":
+                # The evaluators are blocking calls; run them off the event loop
+                step_result = evaluation_step_result(step, *await asyncio.to_thread(perform_evaluation, *evaluation_args(step)))
+            else:
+                screenshot_key = None
+                try:
+                    base.captured_step = None
+                    base.step_extras = {}
+                    if step.action == "launchapplication":
+                        step_isOK, actual_result, expected_result = await base.launch_application(step)
+                    else:
+                        step_isOK, actual_result, expected_result = await base.run_step(step)
+                    # One capture per step: reuse the one perform_action took for the step log
+                    if base.captured_step != step.step_no:
+                        await base.capture_screenshot(step.step_no, step_isOK)
+                    screenshot_key = base.step_screenshot
+                    step_result = action_step_result(step, step_isOK, actual_result, expected_result, screenshot_key, base.step_extras)
+                except Exception as e:
+                    step_result = step_error_result(step, e, screenshot_key)
+            if add_step_result(test_case_result, step_span, step_result) == 1:
+                isOK = 1  # Mark test case as failed if any step fails
+
+    return finish_test_case_result(test_case_result, isOK, start_time, network)
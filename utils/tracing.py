@@ -0,0 +1,242 @@
+import atexit
+import configparser
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_FILE = "reports/trace.jsonl"
+SERVICE_NAME = "playwright-e2e-suite"
+# Spans kept in memory before they are appended to the trace file
+FLUSH_EVERY = 500
+# Set by the controller so spawned workers write their spans under the same run
+RUN_ID_ENV = "E2E_TRACE_RUN_ID"
+# Step span attributes the profile groups by
+PROFILE_GROUPS = (("action", "step.action"), ("object", "step.object"), ("page", "page.url"))
+
+# Span of the running code; contextvars keep concurrent asyncio test cases apart
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+class Span:
+    """One timed operation; nested spans share the trace of the test case they run in."""
+
+    def __init__(self, name, trace_id, parent_id, attributes):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.error = None
+        self.start_ns = time.time_ns()
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def fail(self, message):
+        """Mark the span as failed (status ERROR) without an exception, e.g. for a failed step."""
+        self.error = str(message)
+
+class NoopSpan:
+    """Returned while tracing is off, so instrumented code needs no checks."""
+
+    def set(self, **attributes):
+        pass
+
+    def fail(self, message):
+        pass
+
+NOOP_SPAN = NoopSpan()
+
+def otlp_value(value):
+    """Attribute value in OTLP/JSON form."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def otlp_attributes(attributes):
+    return [{"key": key, "value": otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+class Tracer:
+    """Collects spans and appends them to a JSONL file, one OTLP/JSON ExportTraceServiceRequest per line."""
+
+    def __init__(self, path=DEFAULT_TRACE_FILE, enabled=False, run_id=None):
+        self.path = path
+        self.enabled = enabled
+        self.run_id = run_id or os.environ.get(RUN_ID_ENV) or uuid.uuid4().hex
+        self.finished = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Time the enclosed block as a child of the current span (a new trace when there is none)."""
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+        parent = _current_span.get()
+        span = Span(name, parent.trace_id if parent else uuid.uuid4().hex, parent.span_id if parent else "", attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {str(e)}"
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end(span)
+
+    def end(self, span):
+        record = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "parentSpanId": span.parent_id,
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(time.time_ns()),
+            "attributes": otlp_attributes(span.attributes),
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        with self.lock:
+            self.finished.append(record)
+            full = len(self.finished) >= FLUSH_EVERY
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Append the finished spans to the trace file."""
+        with self.lock:
+            spans, self.finished = self.finished, []
+        if not spans:
+            return
+        request = {"resourceSpans": [{
+            "resource": {"attributes": otlp_attributes({"service.name": SERVICE_NAME, "run.id": self.run_id, "process.pid": os.getpid()})},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+        }]}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(request) + "\n")  # One write per batch, so processes appending together do not interleave
+
+def load_tracer(config):
+    """Build the tracer from the [tracing] section of config.ini."""
+    return Tracer(
+        path=config.get("tracing", "file", fallback="").strip() or DEFAULT_TRACE_FILE,
+        enabled=config.getboolean("tracing", "enabled", fallback=False),
+    )
+
+# Tracer from config.ini, one per process and flushed at exit
+_tracer = None
+
+def get_tracer(config_path="config/config.ini"):
+    global _tracer
+    if _tracer is None:
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        _tracer = load_tracer(config)
+        atexit.register(_tracer.flush)
+    return _tracer
+
+def begin_trace_run():
+    """Start a new run in a long-lived process (the runner daemon), so its profile covers only that run."""
+    tracer = get_tracer()
+    tracer.flush()
+    tracer.run_id = uuid.uuid4().hex
+
+def share_run_id():
+    """Let worker processes started from now on trace under this process's run."""
+    os.environ[RUN_ID_ENV] = get_tracer().run_id
+
+def attribute_value(value):
+    return next(iter(value.values()), None)
+
+def read_spans(path, run_id=None):
+    """Spans of a trace file as flat dicts (name, duration_ms, attributes), optionally of one run only."""
+    spans = []
+    if not os.path.exists(path):
+        return spans
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            for resource_spans in json.loads(line).get("resourceSpans", []):
+                resource = {a["key"]: attribute_value(a["value"]) for a in resource_spans.get("resource", {}).get("attributes", [])}
+                if run_id is not None and resource.get("run.id") != run_id:
+                    continue
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    for span in scope_spans.get("spans", []):
+                        spans.append({
+                            "name": span["name"],
+                            "duration_ms": (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6,
+                            "attributes": {a["key"]: attribute_value(a["value"]) for a in span.get("attributes", [])},
+                            "failed": span.get("status", {}).get("code") == 2,
+                        })
+    return spans
+
+def timing_stats(durations):
+    from utils.waits import percentile  # utils.waits traces its waits, so import it lazily
+    return {
+        "count": len(durations),
+        "total_ms": round(sum(durations), 1),
+        "p50_ms": round(percentile(durations, 0.50), 1),
+        "p95_ms": round(percentile(durations, 0.95), 1),
+        "p99_ms": round(percentile(durations, 0.99), 1),
+        "max_ms": round(max(durations), 1),
+    }
+
+def profile_summary(spans, top=10):
+    """Time per span name (where the run went) and the slowest step actions, objects and pages by p95."""
+    by_name = {}
+    groups = {group: {} for group, _ in PROFILE_GROUPS}
+    for span in spans:
+        by_name.setdefault(span["name"], []).append(span["duration_ms"])
+        if span["name"] != "step":
+            continue
+        for group, attribute in PROFILE_GROUPS:
+            key = span["attributes"].get(attribute)
+            if key:
+                groups[group].setdefault(key, []).append(span["duration_ms"])
+    summary = {"spans": {name: timing_stats(durations) for name, durations in by_name.items()}}
+    for group, values in groups.items():
+        ranked = sorted(((key, timing_stats(durations)) for key, durations in values.items()), key=lambda item: item[1]["p95_ms"], reverse=True)
+        summary[group] = ranked[:top]
+    return summary
+
+def format_profile(summary):
+    """Plain-text table of a profile summary for the log and reports/."""
+    header = f"{'count':>7} {'total ms':>11} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+
+    def row(name, s):
+        return f"{s['count']:>7} {s['total_ms']:>11} {s['p50_ms']:>9} {s['p95_ms']:>9} {s['p99_ms']:>9} {s['max_ms']:>9}  {name}"
+
+    lines = ["Time by span", header]
+    lines += [row(name, stats) for name, stats in sorted(summary["spans"].items(), key=lambda item: item[1]["total_ms"], reverse=True)]
+    for group, _ in PROFILE_GROUPS:
+        lines += ["", f"Slowest steps by {group} (p95)", header]
+        lines += [row(key, stats) for key, stats in summary[group]]
+    return "\n".join(lines)
+
+def finish_trace_run(top=10):
+    """Flush this process's spans and write the profile of the run next to the trace file; returns the profile text."""
+    tracer = get_tracer()
+    if not tracer.enabled:
+        return None
+    tracer.flush()
+    spans = read_spans(tracer.path, tracer.run_id)
+    if not spans:
+        return None
+    profile = format_profile(profile_summary(spans, top))
+    profile_path = os.path.join(os.path.dirname(tracer.path) or ".", "profile.txt")
+    with open(profile_path, "w", encoding="utf-8") as f:
+        f.write(profile + "\n")
+    logger.info(f"Run profile ({len(spans)} spans, written to {profile_path}):\n{profile}")
+    return profile
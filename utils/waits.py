@@ -0,0 +1,192 @@
+import atexit
+import configparser
+import json
+import logging
+import math
+import os
+import threading
+import time
+from utils.tracing import get_tracer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = ".timing/action_latency.json"
+# Samples kept per action, and samples needed before its timeout adapts
+HISTORY_SIZE = 200
+MIN_SAMPLES = 20
+
+# Resolves once no DOM mutation happened for quietMs, or after maxMs (then returns false)
+DOM_STABLE_SCRIPT = """
+({quietMs, maxMs}) => new Promise(resolve => {
+    let quietTimer = null;
+    const observer = new MutationObserver(() => restart());
+    const finish = (stable) => { clearTimeout(quietTimer); clearTimeout(maxTimer); observer.disconnect(); resolve(stable); };
+    const restart = () => { clearTimeout(quietTimer); quietTimer = setTimeout(() => finish(true), quietMs); };
+    const maxTimer = setTimeout(() => finish(false), maxMs);
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    restart();
+})
+"""
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+class LatencyHistory:
+    """Recent successful durations (seconds) per action, shared by every run through a JSON file."""
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        self.samples = self.read(path)
+        self.new_samples = {}  # Recorded by this process, merged into the file on save
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def read(path):
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable latency history {path}: {str(e)}")
+            return {}
+
+    def record(self, action, seconds):
+        with self.lock:
+            self.samples.setdefault(action, []).append(round(seconds, 3))
+            del self.samples[action][:-HISTORY_SIZE]
+            self.new_samples.setdefault(action, []).append(round(seconds, 3))
+
+    def p99(self, action):
+        """p99 latency in seconds, or None until MIN_SAMPLES were recorded."""
+        samples = self.samples.get(action, [])
+        return percentile(samples, 0.99) if len(samples) >= MIN_SAMPLES else None
+
+    def save(self):
+        """Merge this process's samples into the file (other processes may have saved meanwhile)."""
+        with self.lock:
+            if not self.new_samples:
+                return
+            merged = self.read(self.path)
+            for action, samples in self.new_samples.items():
+                merged[action] = (merged.get(action, []) + samples)[-HISTORY_SIZE:]
+            self.new_samples = {}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(merged, f)
+        os.replace(temp_path, self.path)
+
+# One history per process, saved at exit
+_histories = {}
+
+def get_latency_history(path=DEFAULT_HISTORY_PATH):
+    if path not in _histories:
+        _histories[path] = LatencyHistory(path)
+        atexit.register(_histories[path].save)
+    return _histories[path]
+
+class WaitStrategy:
+    """Per-action timeouts (fixed or adapted from recorded latencies) and condition waits that replace sleeps."""
+
+    def __init__(self, adaptive=True, margin=3.0, min_timeout=2000, time_delay_mode="sleep", history=None):
+        self.adaptive = adaptive
+        self.margin = margin
+        self.min_timeout = min_timeout
+        self.time_delay_mode = time_delay_mode  # sleep or condition
+        self.history = history or get_latency_history()
+
+    @classmethod
+    def from_config(cls, config_path="config/config.ini"):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        return load_wait_strategy(config)
+
+    def timeout(self, action, default_ms):
+        """Timeout in ms for an action: p99 x margin once enough runs were recorded, never above the built-in default."""
+        if not self.adaptive:
+            return default_ms
+        p99 = self.history.p99(action)
+        if p99 is None:
+            return default_ms
+        return int(min(default_ms, max(self.min_timeout, p99 * 1000 * self.margin)))
+
+    def record(self, action, seconds):
+        self.history.record(action, seconds)
+
+    def wait_for_network_idle(self, page, timeout_ms):
+        """Wait until the page has had no network traffic for 500 ms; returns False on timeout."""
+        try:
+            page.wait_for_load_state("networkidle", timeout=timeout_ms)
+            return True
+        except Exception:
+            return False
+
+    def wait_for_dom_stable(self, page, timeout_ms, quiet_ms=500):
+        """Wait until the DOM has not changed for quiet_ms; returns False if it kept changing until timeout_ms."""
+        try:
+            return bool(page.evaluate(DOM_STABLE_SCRIPT, {"quietMs": quiet_ms, "maxMs": max(quiet_ms, timeout_ms)}))
+        except Exception:
+            return False
+
+    def wait_for_actionable(self, locator, timeout_ms):
+        """Wait until the element is visible and enabled (what a click or fill needs)."""
+        from playwright.sync_api import expect
+        with get_tracer().span("wait", **{"wait.kind": "actionable", "wait.timeout_ms": timeout_ms}):
+            locator.wait_for(state="visible", timeout=timeout_ms)
+            expect(locator).to_be_enabled(timeout=timeout_ms)
+        return locator
+
+    async def wait_for_actionable_async(self, locator, timeout_ms):
+        """wait_for_actionable for a playwright.async_api locator."""
+        from playwright.async_api import expect
+        with get_tracer().span("wait", **{"wait.kind": "actionable", "wait.timeout_ms": timeout_ms}):
+            await locator.wait_for(state="visible", timeout=timeout_ms)
+            await expect(locator).to_be_enabled(timeout=timeout_ms)
+        return locator
+
+    def wait_for_page_quiet(self, page, timeout_ms):
+        """Network idle, then a stable DOM, within one time budget; returns the seconds spent."""
+        start_time = time.time()
+        with get_tracer().span("wait", **{"wait.kind": "page_quiet", "wait.timeout_ms": timeout_ms}):
+            self.wait_for_network_idle(page, timeout_ms)
+            remaining = timeout_ms - int((time.time() - start_time) * 1000)
+            if remaining > 0:
+                self.wait_for_dom_stable(page, remaining)
+        return time.time() - start_time
+
+    async def wait_for_page_quiet_async(self, page, timeout_ms):
+        """wait_for_page_quiet for a playwright.async_api page."""
+        start_time = time.time()
+        with get_tracer().span("wait", **{"wait.kind": "page_quiet", "wait.timeout_ms": timeout_ms}):
+            try:
+                await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+            except Exception:
+                pass
+            remaining = timeout_ms - int((time.time() - start_time) * 1000)
+            if remaining > 0:
+                try:
+                    await page.evaluate(DOM_STABLE_SCRIPT, {"quietMs": min(500, remaining), "maxMs": remaining})
+                except Exception:
+                    pass
+        return time.time() - start_time
+
+def load_wait_strategy(config):
+    """Build the wait strategy from the wait* and timeDelayMode keys of the [playwright] section."""
+    mode = config.get("playwright", "waitTimeouts", fallback="fixed").strip().lower() or "fixed"
+    if mode not in ("fixed", "adaptive"):
+        raise ValueError(f"Unsupported waitTimeouts '{mode}'. Supported: fixed, adaptive")
+    time_delay_mode = config.get("playwright", "timeDelayMode", fallback="sleep").strip().lower() or "sleep"
+    if time_delay_mode not in ("sleep", "condition"):
+        raise ValueError(f"Unsupported timeDelayMode '{time_delay_mode}'. Supported: sleep, condition")
+    history_path = config.get("playwright", "waitHistoryPath", fallback="").strip() or DEFAULT_HISTORY_PATH
+    return WaitStrategy(
+        adaptive=mode == "adaptive",
+        margin=config.getfloat("playwright", "waitTimeoutMargin", fallback=3.0),
+        min_timeout=config.getint("playwright", "waitTimeoutMin", fallback=2000),
+        time_delay_mode=time_delay_mode,
+        history=get_latency_history(history_path),
+    )
@@ -0,0 +1,92 @@
+import logging
+from openpyxl import load_workbook
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Columns the runner reads from each kind of sheet; everything else is skipped
+TEST_PACK_COLUMNS = ("TestPackName", "RunMode")
+TEST_CASE_COLUMNS = ("AutomationTestID", "RunMode")
+TEST_STEP_COLUMNS = ("ScriptId", "StepName", "StepDescription", "ObjectName", "TestData", "OptionalData",
+                     "PropertyName", "Evaluators", "Query", "Context", "Ground_Truth")
+OBJECT_MAP_COLUMNS = ("ObjectName", "Application", "ObjectType", "ParentObjectLocator",
+                      "ChildObjectLocator1", "ChildObjectLocator2", "ChildObjectLocator3")
+
+def is_blank(value):
+    """Return True for empty cells."""
+    return value is None or (isinstance(value, str) and value.strip() == "")
+
+class StreamingWorkbook:
+    """Read-only, row-streaming access to the test workbook using openpyxl iter_rows."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.sheet_names = self.read_sheet_names()
+
+    def open(self):
+        """Open the workbook in read-only mode; rows are parsed only as they are iterated."""
+        return load_workbook(self.file_path, read_only=True, data_only=True, keep_links=False)
+
+    def read_sheet_names(self):
+        """Return the sheet names without reading any rows."""
+        workbook = self.open()
+        try:
+            return workbook.sheetnames
+        finally:
+            workbook.close()
+
+    def iter_records(self, sheet_name, columns, key_column=None, required_column=None):
+        """Yield one dict per row with only the requested columns.
+
+        With key_column the sheet ends at the first blank key cell. Without it the whole sheet is read and,
+        like the in-memory loader, blank rows are kept unless only blank rows follow them.
+        """
+        if sheet_name not in self.sheet_names:
+            raise ValueError(f"Sheet '{sheet_name}' not found in {self.file_path}. Available sheets: {self.sheet_names}")
+        workbook = self.open()
+        try:
+            worksheet = workbook[sheet_name]
+            header = next(worksheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+            positions = {name: index for index, name in enumerate(header) if name in columns}
+            for column in (key_column, required_column):
+                if column is not None and column not in positions:
+                    raise ValueError(f"Column '{column}' not found in sheet '{sheet_name}'.")
+            if not positions:
+                return
+            max_col = max(positions.values()) + 1  # Cells right of the last used column are never read
+
+            blank_rows = []  # Blank rows are only yielded once a filled row follows them
+            for row in worksheet.iter_rows(min_row=2, max_col=max_col, values_only=True):
+                record = {name: row[index] if index < len(row) else None for name, index in positions.items()}
+                if key_column is not None:
+                    if is_blank(record[key_column]):
+                        break
+                elif all(is_blank(value) for value in record.values()):
+                    blank_rows.append(record)
+                    continue
+                yield from blank_rows
+                blank_rows = []
+                yield record
+        finally:
+            workbook.close()
+
+    def iter_step_groups(self, test_pack_name):
+        """Yield (ScriptId, steps) per block of rows in sheet order, holding one block's steps at a time.
+
+        ScriptId is forward-filled (merged cells) and normalised like the in-memory index.
+        Like the in-memory loader, the whole sheet is read; blank rows inside it stay steps (and fail to compile).
+        """
+        script_sheet_name = f"{test_pack_name} - Scripts"
+        current_id = None
+        steps = []
+        for record in self.iter_records(script_sheet_name, TEST_STEP_COLUMNS, required_column="ScriptId"):
+            script_id = record.get("ScriptId")
+            script_id = current_id if is_blank(script_id) else str(script_id).strip().lower()
+            if script_id != current_id and steps:
+                yield current_id, steps
+                steps = []
+            current_id = script_id
+            record["ScriptId"] = script_id
+            steps.append(record)
+        if steps:
+            yield current_id, steps